@@ -0,0 +1,159 @@
+"""Пиковая память подготовки и транскрибации длинной записи.
+
+Генерирует синтетическую запись заданного размера (PCM, моно, 16 кГц), пропускает её потоком
+через FFmpegAudioProcessor.prepare_stream и ChunkedSTT.transcribe_stream с фиктивным STT
+и печатает пиковый RSS воркера и всего дерева процессов (пул и ffmpeg).
+Пиковая память не должна расти с размером записи:
+
+    python -m benchmarks.audio_memory --size-mb 100
+    python -m benchmarks.audio_memory --size-mb 1024
+"""
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+
+import numpy as np
+
+from src.dio_meetings.core.base import BaseSTT
+from src.dio_meetings.core.dto import Transcription
+from src.dio_meetings.core.enums import Emotion
+from src.dio_meetings.infrastructure.audio import FFmpegAudioProcessor
+from src.dio_meetings.infrastructure.stt.chunked import ChunkedSTT
+from src.dio_meetings.utils import iter_file, MB
+
+SAMPLE_RATE = 16000
+BLOCK_DURATION = 60  # Запись генерируется блоками, сек
+SAMPLING_INTERVAL = 0.2  # Период замера памяти, сек
+
+
+class FakeSTT(BaseSTT):
+    """Возвращает по фразе на фрагмент, не обращаясь к сервису"""
+    async def transcribe(self, audio_data: bytes, audio_format: str, speakers_count: int) -> list[Transcription]:
+        return [Transcription(text="...", speaker_id=0, emotion=Emotion.NEUTRAL, start=0.0, end=1.0)]
+
+
+def generate_recording(path: str, size: int, seed: int = 0) -> None:
+    """Речеподобные слоги с паузами, тоном и тишиной, записываются блоками"""
+    rng = np.random.default_rng(seed)
+    written = 0
+    with open(path, "wb") as file:
+        while written < size:
+            parts: list[np.ndarray] = []
+            while sum(len(part) for part in parts) < BLOCK_DURATION * SAMPLE_RATE:
+                kind = rng.uniform()
+                samples_count = int(rng.uniform(0.1, 3.0) * SAMPLE_RATE)
+                t = np.arange(samples_count) / SAMPLE_RATE
+                if kind < 0.15:
+                    parts.append(np.zeros(samples_count))
+                elif kind < 0.25:
+                    parts.append(0.3 * np.sin(2 * np.pi * 440 * t))
+                else:
+                    # Слоги с паузами между ними, плавающим тоном и сменой тембра от слога к слогу
+                    phase = 2 * np.pi * np.cumsum(rng.uniform(100, 300) * (1 + 0.3 * np.sin(2 * np.pi * 3 * t)))
+                    phase /= SAMPLE_RATE
+                    envelope = np.clip(np.sin(2 * np.pi * 3 * t), 0, None)
+                    overtone = np.repeat(rng.uniform(1.5, 4.0, samples_count // 2000 + 1), 2000)[:samples_count]
+                    parts.append(0.3 * envelope * (
+                        np.sin(phase)
+                        + 0.5 * np.sin(phase * overtone)
+                        + 0.2 * rng.standard_normal(samples_count)
+                    ))
+            block = (np.concatenate(parts) * 32767).astype(np.int16).tobytes()[:size - written]
+            file.write(block)
+            written += len(block)
+
+
+def get_rss(pid: int) -> int:
+    """RSS процесса в байтах по данным /proc, 0 - процесс уже завершился"""
+    try:
+        with open(f"/proc/{pid}/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, IndexError):
+        return 0
+
+
+def get_descendants(pid: int) -> list[int]:
+    children: dict[int, list[int]] = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as file:
+                stat = file.read()
+        except OSError:
+            continue
+        # Имя процесса в скобках может содержать пробелы, поэтому поля считаются после него
+        parent = int(stat[stat.rfind(")") + 2:].split()[1])
+        children.setdefault(parent, []).append(int(name))
+    descendants: list[int] = []
+    stack = [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            descendants.append(child)
+            stack.append(child)
+    return descendants
+
+
+class MemorySampler(threading.Thread):
+    """Периодически замеряет RSS воркера и суммарный RSS дерева его процессов"""
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self._stopped = threading.Event()
+        self.peak_worker_rss = 0
+        self.peak_total_rss = 0
+
+    def run(self) -> None:
+        pid = os.getpid()
+        while not self._stopped.wait(SAMPLING_INTERVAL):
+            worker_rss = get_rss(pid)
+            total_rss = worker_rss + sum(get_rss(child) for child in get_descendants(pid))
+            self.peak_worker_rss = max(self.peak_worker_rss, worker_rss)
+            self.peak_total_rss = max(self.peak_total_rss, total_rss)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+async def run(size: int, chunk_duration: float, max_concurrency: int) -> None:
+    audio_processor = FFmpegAudioProcessor(max_workers=max_concurrency)
+    stt = ChunkedSTT(FakeSTT(), audio_processor, chunk_duration=chunk_duration, max_concurrency=max_concurrency)
+    with tempfile.TemporaryDirectory() as directory:
+        recording_path = os.path.join(directory, "recording.pcm")
+        prepared_path = os.path.join(directory, "prepared.ogg")
+        generate_recording(recording_path, size)
+        sampler = MemorySampler()
+        sampler.start()
+        started_at = time.perf_counter()
+        async with audio_processor.prepare_stream(iter_file(recording_path), audio_format="pcm") as (stream, offset_map):
+            with open(prepared_path, "wb") as prepared_file:
+                async for chunk in stream:
+                    prepared_file.write(chunk)
+        prepared_at = time.perf_counter()
+        transcriptions = await stt.transcribe_stream(iter_file(prepared_path), "ogg", speakers_count=2)
+        finished_at = time.perf_counter()
+        sampler.stop()
+    audio_processor.close()
+    print(f"Recording:        {size / MB:.0f} MB, {size / 2 / SAMPLE_RATE / 3600:.1f} h")
+    print(f"Silence removed:  {offset_map.removed_duration / 3600:.1f} h")
+    print(f"Chunks:           {len(transcriptions)}")
+    print(f"Prepare:          {prepared_at - started_at:.1f} s")
+    print(f"Transcribe:       {finished_at - prepared_at:.1f} s")
+    print(f"Worker peak RSS:  {sampler.peak_worker_rss / MB:.0f} MB")
+    print(f"Total peak RSS:   {sampler.peak_total_rss / MB:.0f} MB (with process pool and ffmpeg)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=1024, help="Размер записи, МБ")
+    parser.add_argument("--chunk-duration", type=float, default=600, help="Длина фрагмента STT, сек")
+    parser.add_argument("--max-concurrency", type=int, default=4, help="Фрагментов одновременно")
+    args = parser.parse_args()
+    asyncio.run(run(args.size_mb * MB, args.chunk_duration, args.max_concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Процессорное время и пиковая память сборки DOCX из markdown протокола.
+
+Сравнивает однопроходный рендер по токенам markdown-it с прежней схемой
+markdown -> HTML -> BeautifulSoup -> python-docx. Для прежней схемы нужны пакеты
+markdown и beautifulsoup4, которых нет в зависимостях проекта, без них она пропускается.
+Затем замеряет пропускную способность MarkdownDocumentFactory: документов в секунду через
+пул процессов для типичного протокола и протокола из sections повторений (~50 страниц):
+
+    python -m benchmarks.document_rendering --sections 50 --repeat 20 --workers 4
+"""
+from typing import Optional
+from collections.abc import Callable
+from pathlib import Path
+
+import io
+import os
+import time
+import asyncio
+import argparse
+import tracemalloc
+
+from docx import Document as WordDocument
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+from src.dio_meetings.infrastructure.documents.rendering import render_docx, load_template
+from src.dio_meetings.infrastructure.documents.factory import MarkdownDocumentFactory
+from src.dio_meetings.infrastructure.documents.constants import PARAGRAPH_LINE, TABLE_STYLE
+
+PROTOCOL_PATH = Path(__file__).parent.parent / "tests" / "golden" / "protocol.md"
+
+
+def render_docx_legacy(text: str) -> bytes:
+    """Прежняя схема: markdown в HTML, разбор HTML и обход верхнеуровневых тегов"""
+    import markdown
+    from bs4 import BeautifulSoup
+
+    document = WordDocument()
+    soup = BeautifulSoup(markdown.markdown(text, extensions=["tables"]), "html.parser")
+    for element in soup.find_all(recursive=False):
+        if element.name in ("h1", "h2", "h3"):
+            document.add_heading(element.text, level=int(element.name[1]))
+        elif element.name == "p":
+            document.add_paragraph(element.text)
+        elif element.name in ("ul", "ol"):
+            style = "List Number" if element.name == "ol" else "List Bullet"
+            for item in element.find_all("li", recursive=False):
+                document.add_paragraph(item.text, style=style)
+        elif element.name == "blockquote":
+            document.add_paragraph().add_run(f'"{element.text}"').italic = True
+        elif element.name == "hr":
+            document.add_paragraph().add_run().add_break()
+            document.add_paragraph("―" * PARAGRAPH_LINE).alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+            document.add_paragraph().add_run().add_break()
+        elif element.name == "table":
+            rows = element.find_all("tr")
+            table = document.add_table(rows=len(rows), cols=max(len(row.find_all(["th", "td"])) for row in rows))
+            table.style = TABLE_STYLE
+            for row_idx, row in enumerate(rows):
+                for column_idx, cell in enumerate(row.find_all(["th", "td"])):
+                    table.cell(row_idx, column_idx).text = cell.get_text(strip=True)
+    file_buffer = io.BytesIO()
+    document.save(file_buffer)
+    return file_buffer.getvalue()
+
+
+def measure(render: Callable[[str], bytes], text: str, repeat: int) -> tuple[float, float]:
+    """Среднее процессорное время на документ, сек, и пиковая память Python на документ, МБ.
+    Память замеряется отдельным прогоном, так как tracemalloc сильно замедляет код.
+    """
+    render(text)  # Прогрев: импорты и загрузка шаблона не входят в замер
+    started_at = time.process_time()
+    for _ in range(repeat):
+        render(text)
+    cpu_time = (time.process_time() - started_at) / repeat
+    tracemalloc.start()
+    render(text)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_time, peak_memory / 1024 / 1024
+
+
+async def measure_throughput(text: str, documents: int, max_workers: Optional[int]) -> float:
+    """Документов DOCX в секунду, когда все запросы отправлены в фабрику одновременно"""
+    factory = MarkdownDocumentFactory(max_workers=max_workers)
+    try:
+        # Прогрев: запуск процессов пула и загрузка шаблона не входят в замер
+        await asyncio.gather(*[factory.create_document(text, "docx") for _ in range(max_workers or os.cpu_count())])
+        started_at = time.perf_counter()
+        await asyncio.gather(*[factory.create_document(text, "docx") for _ in range(documents)])
+        return documents / (time.perf_counter() - started_at)
+    finally:
+        factory.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sections", type=int, default=50, help="Сколько раз повторить эталонный протокол")
+    parser.add_argument("--repeat", type=int, default=20, help="Документов на замер")
+    parser.add_argument("--workers", type=int, default=None, help="Процессов в пуле фабрики, по умолчанию по числу CPU")
+    parser.add_argument("--documents", type=int, default=200, help="Типичных протоколов на замер пропускной способности")
+    args = parser.parse_args()
+    protocol = PROTOCOL_PATH.read_text(encoding="utf-8")
+    text = "\n\n".join([protocol] * args.sections)
+    load_template()
+    renderers: dict[str, Callable[[str], bytes]] = {"markdown-it tokens": render_docx}
+    try:
+        import markdown  # noqa: F401
+        import bs4  # noqa: F401
+        renderers["markdown + bs4"] = render_docx_legacy
+    except ImportError:
+        print("markdown or beautifulsoup4 is not installed, legacy pipeline skipped")
+    print(f"Protocol: {len(text) / 1024:.0f} KB, {args.repeat} documents per run")
+    for name, render in renderers.items():
+        cpu_time, peak_memory = measure(render, text, args.repeat)
+        print(f"{name:<20} cpu {cpu_time * 1000:8.1f} ms/doc   peak memory {peak_memory:6.1f} MB")
+    print(f"MarkdownDocumentFactory, process pool of {args.workers or os.cpu_count()}:")
+    for name, document_text, documents in (
+            ("typical protocol", protocol, args.documents),
+            (f"{args.sections} sections", text, max(args.documents // 10, args.workers or os.cpu_count()))
+    ):
+        throughput = asyncio.run(measure_throughput(document_text, documents, args.workers))
+        print(f"{name:<20} {throughput:8.1f} docs/s ({documents} documents)")
+
+
+if __name__ == "__main__":
+    main()
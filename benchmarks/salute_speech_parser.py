@@ -0,0 +1,116 @@
+"""Время и пиковая память разбора результата распознавания SaluteSpeech.
+
+Сравнивает инкрементальный разбор потока по частям с прежней схемой: весь ответ
+одной строкой, json.loads, pydantic модель на каждую фразу и повторная валидация
+в Transcription через model_dump:
+
+    python -m benchmarks.salute_speech_parser --utterances 20000 --repeat 5
+"""
+from typing import Any, Optional
+from collections.abc import AsyncIterator, Callable
+
+import json
+import time
+import asyncio
+import argparse
+import tracemalloc
+
+from pydantic import BaseModel
+
+from src.dio_meetings.core.dto import Transcription
+from src.dio_meetings.infrastructure.stt.salute_speech.parser import iter_json_array, to_transcription
+from src.dio_meetings.infrastructure.stt.salute_speech.constants import EMOTION, DOWNLOAD_CHUNK_SIZE
+
+WORDS = ["протокол", "встреча", "задача", "срок", "решение", "бюджет", "релиз", "команда", "клиент", "отчёт"]
+
+
+def make_recognition_result(utterances: int) -> bytes:
+    """Ответ SaluteSpeech в том виде, в каком его отдаёт data:download"""
+    results = []
+    for index in range(utterances):
+        start = index * 4.0
+        text = " ".join(WORDS[(index + shift) % len(WORDS)] for shift in range(index % 12 + 3))
+        results.append({
+            "results": [{
+                "text": text,
+                "normalized_text": text.capitalize() + ".",
+                "start": f"{start:.3f}s",
+                "end": f"{start + 3.5:.3f}s",
+                "word_alignments": [
+                    {"word": word, "start": f"{start:.3f}s", "end": f"{start + 0.3:.3f}s"}
+                    for word in text.split()
+                ]
+            }],
+            "eou": True,
+            "emotions_result": {"positive": 0.1, "neutral": 0.2 + (index % 5) * 0.2, "negative": 0.3},
+            "processed_audio_start": f"{start:.3f}s",
+            "processed_audio_end": f"{start + 3.5:.3f}s",
+            "speaker_info": {"speaker_id": index % 4, "main_speaker_confidence": 0.9}
+        })
+    return json.dumps(results, ensure_ascii=False).encode("utf-8")
+
+
+class LegacyRecognizedResult(BaseModel):
+    """Прежняя промежуточная модель фразы"""
+    text: str
+    speaker_id: Optional[int]
+    emotion: EMOTION
+    start: Optional[float] = None
+    end: Optional[float] = None
+
+    @classmethod
+    def from_response(cls, response: dict[str, Any]) -> "LegacyRecognizedResult":
+        result = response["results"][0]
+        return cls(
+            text=result["normalized_text"],
+            speaker_id=response["speaker_info"]["speaker_id"],
+            emotion=max(response["emotions_result"].items(), key=lambda x: x[1])[0],
+            start=float(result["start"].rstrip("s")) if result.get("start") else None,
+            end=float(result["end"].rstrip("s")) if result.get("end") else None
+        )
+
+
+async def iter_chunks(data: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    """Отдаёт ответ частями, как response.content.iter_chunked"""
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+
+async def parse_legacy(data: bytes, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> list[Transcription]:
+    text = b"".join([chunk async for chunk in iter_chunks(data, chunk_size)]).decode("utf-8")
+    recognized_results = [LegacyRecognizedResult.from_response(result) for result in json.loads(text)]
+    return [Transcription.model_validate(result.model_dump()) for result in recognized_results]
+
+
+async def parse_incremental(data: bytes, chunk_size: int = DOWNLOAD_CHUNK_SIZE) -> list[Transcription]:
+    return [to_transcription(result) async for result in iter_json_array(iter_chunks(data, chunk_size))]
+
+
+def measure(parse: Callable[[bytes], Any], data: bytes, repeat: int) -> tuple[float, float]:
+    """Среднее время разбора, сек, и пиковая память Python, МБ, отдельным прогоном под tracemalloc"""
+    asyncio.run(parse(data))
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        asyncio.run(parse(data))
+    elapsed = (time.perf_counter() - started_at) / repeat
+    tracemalloc.start()
+    asyncio.run(parse(data))
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak_memory / 1024 / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=20000, help="Фраз в результате распознавания")
+    parser.add_argument("--repeat", type=int, default=5, help="Разборов на замер")
+    args = parser.parse_args()
+    data = make_recognition_result(args.utterances)
+    print(f"Recognition result: {args.utterances} utterances, {len(data) / 1024 / 1024:.1f} MB")
+    for name, parse in (("incremental", parse_incremental), ("json.loads + pydantic", parse_legacy)):
+        elapsed, peak_memory = measure(parse, data, args.repeat)
+        print(f"{name:<22} {elapsed * 1000:8.1f} ms   peak memory {peak_memory:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""Объём аудио, отправляемого в SaluteSpeech, и время распознавания с подготовкой аудио и без неё.
+
+Генерирует запись совещания и кодирует её в MP3 44.1 кГц стерео 192 кбит/с, как
+convert_video_to_audio. Запись распознаётся настоящим клиентом SaluteSpeech через
+фиктивный сервер, который принимает загрузку с ограниченной пропускной способностью канала
+и распознаёт секунду аудио за realtime_factor секунд. Сравниваются: исходный MP3,
+Opus 16 кГц моно (FFmpegAudioProcessor без VAD) и Opus с вырезанной тишиной. Нужен ffmpeg:
+
+    python -m benchmarks.stt_upload --duration 60 --bandwidth 20
+"""
+from typing import Optional
+
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from uuid import uuid4
+from datetime import datetime
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from benchmarks.audio_memory import generate_recording, SAMPLE_RATE
+from src.dio_meetings.constants import STT_REALTIME_FACTOR, PREPARED_AUDIO_FORMAT, UPLOAD_CHUNK_SIZE
+from src.dio_meetings.infrastructure.http import HTTPClient
+from src.dio_meetings.infrastructure.audio import FFmpegAudioProcessor
+from src.dio_meetings.infrastructure.stt.salute_speech import api as salute_speech_api
+from src.dio_meetings.infrastructure.stt.salute_speech.stt import SaluteSpeech
+from src.dio_meetings.infrastructure.stt.salute_speech.polling import PollingStrategy
+from src.dio_meetings.utils import iter_file, MB
+
+SPEAKERS_COUNT = 4
+
+
+class FakeSaluteSpeech:
+    """API SaluteSpeech: загрузка идёт со скоростью канала, распознавание занимает
+    время, пропорциональное длительности записи
+    """
+    def __init__(self, bandwidth: float, recognition_time: float) -> None:
+        self._bandwidth = bandwidth
+        self._recognition_time = recognition_time
+        self._tasks: dict[str, float] = {}
+        self.uploaded_bytes = 0
+
+    def create_app(self) -> web.Application:
+        app = web.Application(client_max_size=0)
+        app.router.add_post("/api/v2/oauth", self.oauth)
+        app.router.add_post("/rest/v1/data:upload", self.upload)
+        app.router.add_post("/rest/v1/speech:async_recognize", self.recognize)
+        app.router.add_get("/rest/v1/task:get", self.get_task)
+        app.router.add_get("/rest/v1/data:download", self.download)
+        return app
+
+    async def oauth(self, request: web.Request) -> web.Response:
+        return web.json_response({"access_token": "token", "expires_at": int((time.time() + 1800) * 1000)})
+
+    async def upload(self, request: web.Request) -> web.Response:
+        async for chunk in request.content.iter_chunked(UPLOAD_CHUNK_SIZE):
+            self.uploaded_bytes += len(chunk)
+            await asyncio.sleep(len(chunk) * 8 / self._bandwidth)
+        return web.json_response({"status": 200, "result": {"request_file_id": str(uuid4())}})
+
+    async def recognize(self, request: web.Request) -> web.Response:
+        task_id = str(uuid4())
+        self._tasks[task_id] = time.monotonic() + self._recognition_time
+        return web.json_response({"status": 200, "result": self._task_result(task_id, "NEW")})
+
+    async def get_task(self, request: web.Request) -> web.Response:
+        task_id = request.query["id"]
+        if time.monotonic() < self._tasks[task_id]:
+            return web.json_response({"status": 200, "result": self._task_result(task_id, "RUNNING")})
+        result = self._task_result(task_id, "DONE", response_file_id=str(uuid4()))
+        return web.json_response({"status": 200, "result": result})
+
+    async def download(self, request: web.Request) -> web.Response:
+        return web.json_response([])
+
+    @staticmethod
+    def _task_result(task_id: str, status: str, **kwargs) -> dict:
+        now = datetime.now().isoformat()
+        return {"id": task_id, "created_at": now, "updated_at": now, "status": status, **kwargs}
+
+
+def encode_mp3(pcm_path: str, mp3_path: str) -> None:
+    """Кодирует запись так же, как convert_video_to_audio"""
+    subprocess.run(
+        [
+            "ffmpeg", "-loglevel", "error", "-y",
+            "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", pcm_path,
+            "-f", "mp3", "-ac", "2", "-ar", "44100", "-b:a", "192k", mp3_path
+        ],
+        check=True
+    )
+
+
+async def prepare(
+        audio_processor: Optional[FFmpegAudioProcessor],
+        mp3_path: str
+) -> tuple[bytes, str, float]:
+    """Аудио для отправки, его формат и сколько секунд тишины вырезано"""
+    if audio_processor is None:
+        return b"".join([chunk async for chunk in iter_file(mp3_path)]), "mp3", 0.0
+    async with audio_processor.prepare_stream(iter_file(mp3_path), audio_format="mp3") as (stream, offset_map):
+        audio_data = b"".join([chunk async for chunk in stream])
+    return audio_data, PREPARED_AUDIO_FORMAT, offset_map.removed_duration
+
+
+async def transcribe(audio_data: bytes, audio_format: str, bandwidth: float, recognition_time: float) -> int:
+    """Распознаёт аудио через фиктивный SaluteSpeech и возвращает число отправленных байт"""
+    server = FakeSaluteSpeech(bandwidth, recognition_time)
+    test_server = TestServer(server.create_app())
+    await test_server.start_server()
+    salute_speech_api.SBER_DEVICES_URL = str(test_server.make_url("/api/v2"))
+    salute_speech_api.SALUTE_SPEECH_URL = str(test_server.make_url("/rest/v1"))
+    http_client = HTTPClient()
+    try:
+        # Частый опрос одинаков для всех вариантов и почти не добавляет задержку к распознаванию
+        stt = SaluteSpeech(
+            api_key="key",
+            scope="SALUTE_SPEECH_PERS",
+            http_client=http_client,
+            polling_strategy=PollingStrategy(realtime_factor=0.0, min_delay=0.05, max_delay=0.1)
+        )
+        await stt.transcribe(audio_data, audio_format, speakers_count=SPEAKERS_COUNT)
+        return server.uploaded_bytes
+    finally:
+        await http_client.close()
+        await test_server.close()
+
+
+async def run(duration: float, bandwidth: float, realtime_factor: float) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        pcm_path = os.path.join(directory, "recording.pcm")
+        mp3_path = os.path.join(directory, "recording.mp3")
+        generate_recording(pcm_path, int(duration * SAMPLE_RATE) * 2)
+        encode_mp3(pcm_path, mp3_path)
+        os.remove(pcm_path)
+        print(f"Recording: {duration / 60:.0f} min, uplink {bandwidth / 1_000_000:.0f} Mbit/s")
+        print(f"{'':<24}{'sent':>10}{'prepare':>10}{'transcribe':>12}{'total':>10}")
+        variants: list[tuple[str, Optional[FFmpegAudioProcessor]]] = [
+            ("MP3 44.1 kHz stereo", None),
+            ("Opus 16 kHz mono", FFmpegAudioProcessor(max_workers=1, vad_enabled=False)),
+            ("Opus 16 kHz mono + VAD", FFmpegAudioProcessor(max_workers=1, vad_enabled=True))
+        ]
+        for name, audio_processor in variants:
+            started_at = time.perf_counter()
+            audio_data, audio_format, removed_duration = await prepare(audio_processor, mp3_path)
+            prepare_time = time.perf_counter() - started_at
+            # Время распознавания пропорционально длительности отправленного аудио, VAD её сокращает
+            recognition_time = (duration - removed_duration) * realtime_factor
+            started_at = time.perf_counter()
+            sent = await transcribe(audio_data, audio_format, bandwidth, recognition_time)
+            transcribe_time = time.perf_counter() - started_at
+            print(
+                f"{name:<24}{sent / MB:>8.1f}MB{prepare_time:>9.1f}s"
+                f"{transcribe_time:>11.1f}s{prepare_time + transcribe_time:>9.1f}s"
+            )
+            if audio_processor:
+                audio_processor.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=60, help="Длительность записи, мин")
+    parser.add_argument("--bandwidth", type=float, default=20, help="Пропускная способность канала до STT, Мбит/с")
+    parser.add_argument(
+        "--realtime-factor",
+        type=float,
+        default=STT_REALTIME_FACTOR,
+        help="Время распознавания относительно длительности аудио"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.duration * 60, args.bandwidth * 1_000_000, args.realtime_factor))
+
+
+if __name__ == "__main__":
+    main()
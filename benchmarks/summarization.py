@@ -0,0 +1,103 @@
+"""Время составления протокола по длинному транскрипту при последовательной и параллельной обработке частей.
+
+SummarizationService работает с фиктивной LLM, которая отвечает с задержкой
+latency + токены запроса / prefill_rate и возвращает конспект заданного размера.
+Последовательная схема соответствует max_concurrency=1, параллельная - заданному
+числу одновременных запросов:
+
+    python -m benchmarks.summarization --utterances 2000 --latency 1.0 --concurrency 4
+"""
+from collections.abc import AsyncIterator
+
+import time
+import random
+import asyncio
+import argparse
+
+from src.dio_meetings.core.base import BaseLLM
+from src.dio_meetings.core.dto import BaseMessage, AIMessage, Transcription
+from src.dio_meetings.core.enums import Emotion
+from src.dio_meetings.core.services import SummarizationService
+from src.dio_meetings.constants import MAX_CHUNK_TOKENS, SUMMARIZATION_MAX_CONCURRENCY, CHARS_PER_TOKEN
+from src.dio_meetings.utils import estimate_tokens
+
+WORDS = ["протокол", "встреча", "задача", "срок", "решение", "бюджет", "релиз", "команда", "клиент", "отчёт"]
+SPEAKERS_COUNT = 4
+
+
+def make_transcriptions(utterances: int, seed: int = 0) -> list[Transcription]:
+    """Транскрипт совещания: реплики по 3-20 слов, спикеры часто говорят несколько фраз подряд"""
+    rng = random.Random(seed)
+    transcriptions = []
+    speaker_id, start = 0, 0.0
+    for _ in range(utterances):
+        if rng.random() < 0.4:
+            speaker_id = rng.randrange(SPEAKERS_COUNT)
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 20))).capitalize() + "."
+        end = start + len(text) / 15
+        emotion = rng.choices(list(Emotion), weights=[1, 8, 1])[0]
+        transcriptions.append(Transcription(text=text, speaker_id=speaker_id, emotion=emotion, start=start, end=end))
+        start = end + 0.5
+    return transcriptions
+
+
+class FakeLLM(BaseLLM):
+    """LLM с задержкой ответа, растущей с размером запроса, и ответом фиксированного размера"""
+    def __init__(self, latency: float, prefill_rate: float = 0.0, answer_tokens: int = 500) -> None:
+        self.latency = latency
+        self.prefill_rate = prefill_rate
+        self.answer_tokens = answer_tokens
+        self.requests: list[list[BaseMessage]] = []
+        self.max_concurrency = 0
+        self._active = 0
+
+    async def generate(self, messages: list[BaseMessage]) -> AIMessage:
+        self.requests.append(messages)
+        self._active += 1
+        self.max_concurrency = max(self.max_concurrency, self._active)
+        try:
+            tokens = sum(estimate_tokens(message.text) for message in messages)
+            await asyncio.sleep(self.latency + (tokens / self.prefill_rate if self.prefill_rate else 0.0))
+        finally:
+            self._active -= 1
+        return AIMessage(text="к" * self.answer_tokens * CHARS_PER_TOKEN)
+
+    async def astream(self, messages: list[BaseMessage]) -> AsyncIterator[str]:
+        yield (await self.generate(messages)).text
+
+
+async def measure(
+        transcriptions: list[Transcription],
+        llm: FakeLLM,
+        max_concurrency: int,
+        max_chunk_tokens: int
+) -> float:
+    summarization_service = SummarizationService(
+        stt=None,
+        llm=llm,
+        max_chunk_tokens=max_chunk_tokens,
+        max_concurrency=max_concurrency
+    )
+    started_at = time.perf_counter()
+    await summarization_service.summarize(transcriptions, prompt_template="")
+    return time.perf_counter() - started_at
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=2000, help="Фраз в транскрипте")
+    parser.add_argument("--latency", type=float, default=1.0, help="Задержка ответа LLM без учёта запроса, сек")
+    parser.add_argument("--prefill-rate", type=float, default=20000, help="Обработка запроса LLM, токенов/сек")
+    parser.add_argument("--answer-tokens", type=int, default=500, help="Размер конспекта части, токенов")
+    parser.add_argument("--concurrency", type=int, default=SUMMARIZATION_MAX_CONCURRENCY)
+    parser.add_argument("--max-chunk-tokens", type=int, default=MAX_CHUNK_TOKENS)
+    args = parser.parse_args()
+    transcriptions = make_transcriptions(args.utterances)
+    for name, max_concurrency in (("serial", 1), (f"concurrent x{args.concurrency}", args.concurrency)):
+        llm = FakeLLM(args.latency, args.prefill_rate, args.answer_tokens)
+        elapsed = asyncio.run(measure(transcriptions, llm, max_concurrency, args.max_chunk_tokens))
+        print(f"{name:<16} {elapsed:6.2f} s  {len(llm.requests)} LLM requests, max {llm.max_concurrency} at once")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Задержка ответов API во время загрузки видео.
+
+Поднимает HTTP сервер с лёгким обработчиком /ping и загрузкой видео /upload и сравнивает
+прежнюю схему (видео читается целиком, ffmpeg вызывается через subprocess.communicate внутри
+обработчика и блокирует event loop) с потоковой через asyncio pipe (convert_video_to_audio).
+Во время загрузки клиент в отдельном потоке отправляет /ping с постоянной частотой,
+не дожидаясь предыдущих ответов, как независимые пользователи, и печатает перцентили задержки.
+Нужен ffmpeg:
+
+    python -m benchmarks.video_upload_latency --duration 600
+"""
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import os
+import time
+import asyncio
+import argparse
+import tempfile
+import threading
+import subprocess
+
+import numpy as np
+from aiohttp import web, ClientSession, ClientTimeout
+
+from src.dio_meetings.utils import convert_video_to_audio, MB
+from src.dio_meetings.constants import UPLOAD_CHUNK_SIZE
+
+VIDEO_FORMAT = "avi"
+PROBE_INTERVAL = 0.01  # Период запросов /ping, сек
+IDLE_DURATION = 2.0  # Замер задержки без нагрузки перед загрузкой, сек
+
+
+def generate_video(path: str, duration: int) -> None:
+    """Тестовое видео 640x360 со звуком в AVI, который ffmpeg читает из pipe"""
+    subprocess.run(
+        [
+            "ffmpeg", "-loglevel", "error", "-y",
+            "-f", "lavfi", "-i", "testsrc=size=640x360:rate=25",
+            "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=44100",
+            "-t", str(duration),
+            "-c:v", "mpeg4", "-q:v", "8",
+            "-c:a", "mp3",
+            "-f", "avi", path
+        ],
+        check=True
+    )
+
+
+def convert_video_to_audio_legacy(video_bytes: bytes) -> bytes:
+    """Прежняя схема: всё видео передаётся ffmpeg одним вызовом, обработчик ждёт его синхронно"""
+    process = subprocess.Popen(
+        ["ffmpeg", "-i", "pipe:0", "-f", "mp3", "-ac", "2", "-ar", "44100", "-b:a", "192k", "-vn", "pipe:1"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+    audio_bytes, stderr = process.communicate(input=video_bytes)
+    if process.returncode != 0:
+        raise RuntimeError(f"FFmpeg error: {stderr.decode('utf-8')}")
+    return audio_bytes
+
+
+async def upload_legacy(request: web.Request) -> int:
+    video_bytes = await request.read()
+    return len(convert_video_to_audio_legacy(video_bytes))
+
+
+async def upload_streaming(request: web.Request) -> int:
+    size = 0
+    async for chunk in convert_video_to_audio(request.content.iter_chunked(UPLOAD_CHUNK_SIZE), VIDEO_FORMAT):
+        size += len(chunk)  # Вместо загрузки в S3
+    return size
+
+
+def create_app(upload: Callable[[web.Request], Awaitable[int]]) -> web.Application:
+    async def ping(request: web.Request) -> web.Response:
+        return web.json_response({"status": "ok"})
+
+    async def handle_upload(request: web.Request) -> web.Response:
+        return web.json_response({"size": await upload(request)})
+
+    app = web.Application(client_max_size=0)
+    app.router.add_get("/ping", ping)
+    app.router.add_post("/upload", handle_upload)
+    return app
+
+
+async def iter_video(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+
+async def run_client(url: str, video_path: str) -> tuple[list[float], list[float], float]:
+    """Задержки /ping без нагрузки и во время загрузки, сек, и время загрузки видео, сек"""
+    async with ClientSession(timeout=ClientTimeout(total=None)) as session:
+        idle_latencies: list[float] = []
+        upload_latencies: list[float] = []
+
+        async def ping(latencies: list[float]) -> None:
+            started_at = time.perf_counter()
+            async with session.get(f"{url}/ping") as response:
+                await response.read()
+            latencies.append(time.perf_counter() - started_at)
+
+        async def probe(latencies: list[float], is_stopped: Callable[[], bool]) -> None:
+            probes: list[asyncio.Task] = []
+            while not is_stopped():
+                probes.append(asyncio.create_task(ping(latencies)))
+                await asyncio.sleep(PROBE_INTERVAL)
+            await asyncio.gather(*probes)
+
+        idle_until = time.perf_counter() + IDLE_DURATION
+        await probe(idle_latencies, lambda: time.perf_counter() >= idle_until)
+        upload = asyncio.create_task(session.post(f"{url}/upload", data=iter_video(video_path)))
+        started_at = time.perf_counter()
+        await probe(upload_latencies, upload.done)
+        async with await upload as response:
+            response.raise_for_status()
+        return idle_latencies, upload_latencies, time.perf_counter() - started_at
+
+
+async def measure(upload: Callable[[web.Request], Awaitable[int]], video_path: str):
+    runner = web.AppRunner(create_app(upload))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    results = []
+    # Клиент работает в своём потоке, чтобы блокировка event loop сервера не задерживала отправку
+    thread = threading.Thread(
+        target=lambda: results.append(asyncio.run(run_client(f"http://127.0.0.1:{port}", video_path)))
+    )
+    thread.start()
+    await asyncio.to_thread(thread.join)
+    await runner.cleanup()
+    return results[0]
+
+
+def format_latencies(latencies: list[float]) -> str:
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    return f"p50 {p50:7.1f} ms  p99 {p99:7.1f} ms  max {max(latencies) * 1000:7.1f} ms ({len(latencies)} requests)"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=int, default=600, help="Длительность тестового видео, сек")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        video_path = os.path.join(directory, f"video.{VIDEO_FORMAT}")
+        generate_video(video_path, args.duration)
+        print(f"Video: {os.path.getsize(video_path) / MB:.1f} MB, {args.duration} s")
+        for name, upload in (("blocking ffmpeg", upload_legacy), ("asyncio pipe", upload_streaming)):
+            idle_latencies, upload_latencies, upload_time = asyncio.run(measure(upload, video_path))
+            print(f"{name}: upload {upload_time:.1f} s")
+            print(f"  idle          {format_latencies(idle_latencies)}")
+            print(f"  during upload {format_latencies(upload_latencies)}")
+
+
+if __name__ == "__main__":
+    main()
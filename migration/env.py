@@ -9,7 +9,13 @@ from alembic import context
 
 from src.dio_meetings.infrastructure.database.base import Base
 
-from src.dio_meetings.infrastructure.database.models import FileMetadataOrm, TaskOrm
+from src.dio_meetings.infrastructure.database.models import (
+    FileMetadataOrm,
+    TaskOrm,
+    UploadSessionOrm,
+    UploadPartOrm,
+    TranscriptOrm
+)
 
 from src.dio_meetings.settings import PostgresSettings
 
@@ -0,0 +1,30 @@
+"""File metadata sha256
+
+Revision ID: 8f3d2c61a7b5
+Revises: 5c1e7a2b9d40
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f3d2c61a7b5'
+down_revision: Union[str, None] = '5c1e7a2b9d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('file_metadata', sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.create_unique_constraint('file_metadata_sha256_key', 'file_metadata', ['sha256'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('file_metadata_sha256_key', 'file_metadata', type_='unique')
+    op.drop_column('file_metadata', 'sha256')
@@ -1,20 +1,46 @@
 from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+from datetime import timedelta
 
+import asyncio
 import logging
 
 from fastapi import FastAPI
+from faststream.redis import RedisBroker
 
-from ..infrastructure.broker import create_faststream_app
+from ..core.services import UploadService
+from ..core.exceptions import RepositoryError
+from ..constants import UPLOAD_SESSION_TTL, UPLOAD_SESSIONS_GC_INTERVAL
+from ..ioc import container
 
 logger = logging.getLogger(__name__)
 
 
+async def remove_expired_upload_sessions() -> None:
+    while True:
+        await asyncio.sleep(UPLOAD_SESSIONS_GC_INTERVAL)
+        try:
+            async with container() as request_container:
+                upload_service = await request_container.get(UploadService)
+                removed_count = await upload_service.remove_expired(
+                    ttl=timedelta(seconds=UPLOAD_SESSION_TTL)
+                )
+            logger.info("Removed %s expired upload sessions", removed_count)
+        except RepositoryError as e:
+            logger.error("Error while removing expired upload sessions: %s", e)
+
+
 @asynccontextmanager
 async def lifespan(_: FastAPI) -> AsyncIterator[None]:
-    faststream_app = await create_faststream_app()
-    await faststream_app.broker.start()
-    logger.info("Broker started")
+    # API только публикует задачи, обработчики запускаются отдельным воркером (worker.py)
+    broker = await container.get(RedisBroker)
+    await broker.connect()
+    logger.info("Broker connected")
+    upload_sessions_gc = asyncio.create_task(remove_expired_upload_sessions())
     yield
-    await faststream_app.broker.close()
+    upload_sessions_gc.cancel()
+    with suppress(asyncio.CancelledError):
+        await upload_sessions_gc
+    await broker.close()
     logger.info("Broker closed")
+    await container.close()
@@ -3,11 +3,15 @@ __all__ = ("router",)
 from fastapi import APIRouter
 
 from .audio import audio_router
+from .uploads import uploads_router
 from .tasks import tasks_router
 from .documents import documents_router
+from .metrics import metrics_router
 
 router = APIRouter()
 
+router.include_router(uploads_router)
 router.include_router(audio_router)
 router.include_router(tasks_router)
 router.include_router(documents_router)
+router.include_router(metrics_router)
@@ -5,14 +5,17 @@ from fastapi.responses import Response
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka as Depends
 
-from ..schemas import AudioFile, Date, Page, Limit
+from ..schemas import AudioFile, Date, Page, Limit, TimePoint, TranscriptPageNumber, TranscriptLimit
 
 from ...core.base import FileMetadataRepository
-from ...core.services import FileService
+from ...core.services import FileService, TranscriptService
+from ...core.dto import TranscriptPage
 from ...core.enums import FileType
-from ...core.domain import FileMetadata, File
-from ...utils import convert_video_to_audio, get_file_format
+from ...core.domain import FileMetadata
+from ...utils import convert_video_to_audio, get_file_format, iter_chunks
+from ...transcoding import TranscodingScheduler, TranscodingStats
 from ...core.exceptions import (
+    TranscodingQueueFullError,
     CreationError,
     ReadingError,
     UploadingError,
@@ -30,7 +33,11 @@ from ...constants import (
     DELETION_ERROR,
     RECEIVING_ERROR,
     NOT_FILES_YET,
-    VIDEO_FORMATS
+    UNSUPPORTED_FORMAT,
+    TRANSCODING_QUEUE_FULL,
+    VIDEO_FORMATS,
+    START_PAGE,
+    DEFAULT_TRANSCRIPT_LIMIT
 )
 
 audio_router = APIRouter(
@@ -48,24 +55,43 @@ audio_router = APIRouter(
 )
 async def upload_audio(
         audio_file: AudioFile,
-        file_service: Depends[FileService]
+        file_service: Depends[FileService],
+        transcoding_scheduler: Depends[TranscodingScheduler]
 ) -> FileMetadata:
     try:
         file_name = audio_file.filename
         file_format = get_file_format(file_name)
         if file_format in VIDEO_FORMATS:
-            file_data = convert_video_to_audio(video_bytes=await audio_file.read())
             file_name = file_name.replace(file_format, "mp3")
+            # Слот занят только пока работает ffmpeg, остаток загрузки в S3 идёт уже вне слота
+            file_metadata = await transcoding_scheduler.run(
+                transcode=lambda job: convert_video_to_audio(
+                    iter_chunks(audio_file),
+                    video_format=file_format,
+                    on_finish=job.set_cpu_time
+                ),
+                consume=lambda stream: file_service.upload(stream, file_name=file_name, bucket=AUDIO_BUCKET)
+            )
         else:
-            file_data = await audio_file.read()
-        file = File(data=file_data, file_name=file_name)
-        file_metadata = await file_service.upload(file, bucket=AUDIO_BUCKET)
+            stream = iter_chunks(audio_file)
+            file_metadata = await file_service.upload(stream, file_name=file_name, bucket=AUDIO_BUCKET)
         if not file_metadata:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=NOT_CREATED
             )
         return file_metadata
+    except TranscodingQueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=TRANSCODING_QUEUE_FULL,
+            headers={"Retry-After": str(transcoding_scheduler.retry_after)}
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=UNSUPPORTED_FORMAT
+        )
     except (CreationError, UploadingError):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -73,6 +99,18 @@ async def upload_audio(
         )
 
 
+@audio_router.get(
+    path="/transcoding/stats",
+    status_code=status.HTTP_200_OK,
+    response_model=TranscodingStats,
+    summary="Получает статистику очереди транскодирования видео."
+)
+async def get_transcoding_stats(
+        transcoding_scheduler: Depends[TranscodingScheduler]
+) -> TranscodingStats:
+    return transcoding_scheduler.stats
+
+
 @audio_router.get(
     path="/{file_id}/download",
     status_code=status.HTTP_200_OK,
@@ -182,6 +220,38 @@ async def get_document_by_audio(
         )
 
 
+@audio_router.get(
+    path="/{file_id}/transcript",
+    status_code=status.HTTP_200_OK,
+    response_model=TranscriptPage,
+    summary="Получает страницу транскрипта аудиозаписи в диапазоне времени."
+)
+async def get_audio_transcript(
+        file_id: UUID,
+        transcript_service: Depends[TranscriptService],
+        start: TimePoint = None,
+        end: TimePoint = None,
+        page: TranscriptPageNumber = START_PAGE,
+        limit: TranscriptLimit = DEFAULT_TRANSCRIPT_LIMIT
+) -> TranscriptPage:
+    try:
+        transcript_page = await transcript_service.get_page(
+            file_id,
+            start=start,
+            end=end,
+            page=page,
+            limit=limit
+        )
+        if not transcript_page:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+        return transcript_page
+    except (ReadingError, DownloadingError):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=RECEIVING_ERROR
+        )
+
+
 @audio_router.get(
     path="/{file_id}",
     status_code=status.HTTP_200_OK,
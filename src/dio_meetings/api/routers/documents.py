@@ -1,18 +1,26 @@
 from uuid import UUID
+from urllib.parse import quote
 
 from fastapi import APIRouter, status, HTTPException
 from fastapi.responses import Response
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka as Depends
 
-from ..schemas import Date, Page, Limit
+from ..schemas import Date, Page, Limit, DocumentFormat
 
 from ...core.enums import FileType
 from ...core.domain import FileMetadata
-from ...core.services import FileService
+from ...core.services import DocumentService
+from ...core.exceptions import DocumentRenderingError, UnsupportedDocumentFormatError
 from ...core.base import FileMetadataRepository
 
-from ...constants import DOCUMENTS_BUCKET, NOT_FOUND
+from ...constants import (
+    DOCUMENTS_BUCKET,
+    DOCUMENT_MEDIA_TYPES,
+    NOT_FOUND,
+    UNSUPPORTED_FORMAT,
+    RENDERING_ERROR
+)
 
 documents_router = APIRouter(
     prefix="/api/v1/documents",
@@ -41,16 +49,26 @@ async def filter_document_by_date_range(
 @documents_router.get(
     path="/{result_id}/download",
     status_code=status.HTTP_200_OK,
+    summary="Скачивает протокол в нужном формате, документ собирается при первом запросе."
 )
-async def download_document(result_id: UUID, file_service: Depends[FileService]) -> Response:
-    downloaded_file = await file_service.download(result_id, bucket=DOCUMENTS_BUCKET)
+async def download_document(
+        result_id: UUID,
+        document_service: Depends[DocumentService],
+        format: DocumentFormat = None
+) -> Response:
+    try:
+        downloaded_file = await document_service.download(result_id, bucket=DOCUMENTS_BUCKET, format=format)
+    except UnsupportedDocumentFormatError:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=UNSUPPORTED_FORMAT)
+    except DocumentRenderingError:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=RENDERING_ERROR)
     if not downloaded_file:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
     return Response(
         content=downloaded_file.data,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        media_type=DOCUMENT_MEDIA_TYPES[downloaded_file.format],
         headers={
-            "Content-Disposition": f"attachment; filename*=UTF-8''{downloaded_file.file_name}",
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(downloaded_file.file_name)}",
             "Content-Length": str(len(downloaded_file.data)),
         }
     )
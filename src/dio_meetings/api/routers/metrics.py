@@ -0,0 +1,36 @@
+from fastapi import APIRouter, status
+
+from dishka.integrations.fastapi import DishkaRoute, FromDishka as Depends
+
+from ...infrastructure.http import HTTPClient, HTTPClientStats
+from ...infrastructure.llms.cache import LLMCache, LLMCacheStats
+
+metrics_router = APIRouter(
+    prefix="/api/v1/metrics",
+    tags=["Metrics"],
+    route_class=DishkaRoute
+)
+
+
+@metrics_router.get(
+    path="/http",
+    status_code=status.HTTP_200_OK,
+    response_model=HTTPClientStats,
+    summary="Получает статистику пула HTTP соединений к внешним API."
+)
+async def get_http_client_stats(
+        http_client: Depends[HTTPClient]
+) -> HTTPClientStats:
+    return http_client.stats
+
+
+@metrics_router.get(
+    path="/llm-cache",
+    status_code=status.HTTP_200_OK,
+    response_model=LLMCacheStats,
+    summary="Получает статистику кэша ответов LLM всех воркеров."
+)
+async def get_llm_cache_stats(
+        llm_cache: Depends[LLMCache]
+) -> LLMCacheStats:
+    return await llm_cache.get_stats()
@@ -1,13 +1,19 @@
+from typing import Optional
+from collections.abc import AsyncIterator
+
 from uuid import UUID
 
 from fastapi import APIRouter, status, HTTPException
+from fastapi.responses import StreamingResponse
 
 from dishka.integrations.fastapi import DishkaRoute, FromDishka as Depends
 
-from ..schemas import TaskCreateSchema
+from ..schemas import TaskCreateSchema, LastEventId
 
+from ...core.dto import ProtocolEvent
 from ...core.domain import Task
 from ...core.services import TaskService
+from ...core.exceptions import TextStreamError
 
 from ...constants import NOT_FOUND, NOT_CREATED
 
@@ -45,3 +51,39 @@ async def get_task_status(task_id: UUID, task_service: Depends[TaskService]) ->
     if not task:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
     return task
+
+
+@tasks_router.get(
+    path="/{task_id}/stream",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    summary="Транслирует текст протокола по мере генерации (Server-Sent Events)."
+)
+async def stream_protocol(
+        task_id: UUID,
+        task_service: Depends[TaskService],
+        last_event_id: LastEventId = None
+) -> StreamingResponse:
+    task = await task_service.get_status(task_id)
+    if not task:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+    return StreamingResponse(
+        to_server_sent_events(task_service.stream_protocol(task, last_event_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def to_server_sent_events(events: AsyncIterator[Optional[ProtocolEvent]]) -> AsyncIterator[str]:
+    try:
+        async for event in events:
+            if event is None:
+                # Комментарий не даёт прокси закрыть простаивающее соединение
+                yield ": ping\n\n"
+                continue
+            # После события reset клиент отбрасывает полученный текст: генерация началась заново
+            event_type = "status" if event.status else "reset" if event.reset else "text"
+            yield f"id: {event.id}\nevent: {event_type}\ndata: {event.model_dump_json()}\n\n"
+    except TextStreamError:
+        # Клиент переподключится сам и продолжит с последнего полученного события
+        return
@@ -0,0 +1,159 @@
+from uuid import UUID
+
+from fastapi import APIRouter, Request, status, HTTPException
+from fastapi.responses import Response
+
+from dishka.integrations.fastapi import DishkaRoute, FromDishka as Depends
+
+from ..schemas import UploadSessionCreateSchema, PartNumber
+
+from ...core.services import UploadService
+from ...core.domain import FileMetadata, UploadSession, UploadPart, UploadProgress
+from ...core.exceptions import (
+    UploadSessionError,
+    CreationError,
+    ReadingError,
+    UploadingError,
+    DeletingError
+)
+
+from ...constants import (
+    AUDIO_BUCKET,
+    MAX_UPLOAD_PART_SIZE,
+    NOT_FOUND,
+    UPLOADING_ERROR,
+    DELETION_ERROR,
+    RECEIVING_ERROR,
+    UNSUPPORTED_FORMAT,
+    INVALID_UPLOAD,
+    PART_TOO_LARGE
+)
+
+uploads_router = APIRouter(
+    prefix="/api/v1/audio/uploads",
+    tags=["Resumable uploads"],
+    route_class=DishkaRoute
+)
+
+
+@uploads_router.post(
+    path="",
+    status_code=status.HTTP_201_CREATED,
+    response_model=UploadSession,
+    summary="Создаёт сессию возобновляемой загрузки аудио записи."
+)
+async def create_upload_session(
+        upload_session_create: UploadSessionCreateSchema,
+        upload_service: Depends[UploadService]
+) -> UploadSession:
+    try:
+        return await upload_service.create(upload_session_create.file_name, bucket=AUDIO_BUCKET)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=UNSUPPORTED_FORMAT
+        )
+    except (CreationError, UploadingError):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=UPLOADING_ERROR
+        )
+
+
+@uploads_router.put(
+    path="/{session_id}/parts/{part_number}",
+    status_code=status.HTTP_200_OK,
+    response_model=UploadPart,
+    summary="Загружает часть аудио записи. Повторная загрузка части перезаписывает её."
+)
+async def upload_part(
+        session_id: UUID,
+        part_number: PartNumber,
+        request: Request,
+        upload_service: Depends[UploadService]
+) -> UploadPart:
+    data = bytearray()
+    async for chunk in request.stream():
+        data.extend(chunk)
+        if len(data) > MAX_UPLOAD_PART_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=PART_TOO_LARGE
+            )
+    try:
+        part = await upload_service.upload_part(session_id, part_number=part_number, data=bytes(data))
+        if not part:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+        return part
+    except (CreationError, ReadingError, UploadingError):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=UPLOADING_ERROR
+        )
+
+
+@uploads_router.get(
+    path="/{session_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=UploadProgress,
+    summary="Получает полученные части и смещение для продолжения загрузки."
+)
+async def get_upload_progress(
+        session_id: UUID,
+        upload_service: Depends[UploadService]
+) -> UploadProgress:
+    try:
+        upload_progress = await upload_service.get_progress(session_id)
+        if not upload_progress:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+        return upload_progress
+    except ReadingError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=RECEIVING_ERROR
+        )
+
+
+@uploads_router.post(
+    path="/{session_id}/complete",
+    status_code=status.HTTP_201_CREATED,
+    response_model=FileMetadata,
+    summary="Завершает загрузку и сохраняет аудио запись."
+)
+async def complete_upload(
+        session_id: UUID,
+        upload_service: Depends[UploadService]
+) -> FileMetadata:
+    try:
+        file_metadata = await upload_service.complete(session_id)
+        if not file_metadata:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+        return file_metadata
+    except UploadSessionError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=INVALID_UPLOAD)
+    except (CreationError, ReadingError, UploadingError, DeletingError):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=UPLOADING_ERROR
+        )
+
+
+@uploads_router.delete(
+    path="/{session_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Отменяет загрузку и удаляет полученные части."
+)
+async def abort_upload(
+        session_id: UUID,
+        upload_service: Depends[UploadService]
+) -> Response:
+    try:
+        is_aborted = await upload_service.abort(session_id)
+        if not is_aborted:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=NOT_FOUND)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    except (ReadingError, DeletingError):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=DELETION_ERROR
+        )
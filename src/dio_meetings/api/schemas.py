@@ -1,11 +1,13 @@
-from typing import Annotated
+from typing import Annotated, Optional, Literal
 
 from uuid import UUID
 from datetime import datetime
 
 from pydantic import BaseModel
 
-from fastapi import UploadFile, File, Query
+from fastapi import UploadFile, File, Query, Path, Header
+
+from ..constants import START_PAGE, DEFAULT_TRANSCRIPT_LIMIT
 
 AudioFile = Annotated[UploadFile, File(..., description="Аудио запись встречи/совещания")]
 
@@ -18,6 +20,8 @@ Date = Annotated[
     )
 ]
 
+PartNumber = Annotated[int, Path(ge=1, le=10000, description="Номер части файла")]
+
 Page = Annotated[int, Query(description="Страница с метаданными")]
 
 Limit = Annotated[
@@ -25,6 +29,29 @@ Limit = Annotated[
     Query(description="Лимит метаданных на одной странице")
 ]
 
+TimePoint = Annotated[
+    Optional[float],
+    Query(ge=0, description="Время от начала аудиозаписи, сек")
+]
+
+TranscriptPageNumber = Annotated[int, Query(ge=START_PAGE, description="Страница транскрипта")]
+
+TranscriptLimit = Annotated[int, Query(ge=1, le=1000, description="Лимит фраз на одной странице")]
+
+DocumentFormat = Annotated[
+    Optional[Literal["docx", "pdf", "md", "html"]],
+    Query(description="Формат документа, по умолчанию docx")
+]
+
+LastEventId = Annotated[
+    Optional[str],
+    Header(description="ID последнего полученного события для продолжения трансляции")
+]
+
 
 class TaskCreateSchema(BaseModel):
     file_id: UUID
+
+
+class UploadSessionCreateSchema(BaseModel):
+    file_name: str
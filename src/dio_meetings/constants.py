@@ -44,19 +44,98 @@ VIDEO_FORMATS = [
     "ts",
     "wmv"
 ]
+# Форматы, в которых индекс moov может лежать в конце файла, тогда ffmpeg не может читать их из pipe:
+MP4_FORMATS = [
+    "mp4",
+    "mov"
+]
+MP4_PROBE_SIZE = 8 * 1024 * 1024  # Сколько начала файла читать в поисках moov до сохранения во временный файл
 DOCUMENT_FORMATS = [
     "doc",
     "docx",
-    "pdf"
+    "pdf",
+    "md",
+    "html"
 ]
 
+# Документы протокола, формируемые при первом скачивании:
+PROTOCOL_FORMAT = "md"  # Формат, в котором воркер сохраняет протокол
+DEFAULT_DOCUMENT_FORMAT = "docx"
+RENDERED_DOCUMENT_SUFFIX = ".rendered"
+DOCUMENT_RENDERER_VERSION = 1  # Увеличивается при изменении оформления, чтобы не отдавать старые документы
+RENDERING_LOCK_TIMEOUT = 5 * 60  # Время жизни блокировки формирования документа, сек
+DOCUMENT_MEDIA_TYPES = {
+    "doc": "application/msword",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+    "md": "text/markdown; charset=utf-8",
+    "html": "text/html; charset=utf-8"
+}
+
+# Формат аудио, подготовленного для STT (Opus в контейнере ogg, моно, 16 кГц):
+PREPARED_AUDIO_FORMAT = "ogg"
+PREPARED_AUDIO_SUFFIX = ".prepared"
+
+# Суммаризация длинных совещаний (map-reduce):
+CHARS_PER_TOKEN = 3  # Среднее количество символов русского текста в одном токене
+MAX_CHUNK_TOKENS = 6000  # Максимальный размер части транскрипта в одном запросе к LLM
+SUMMARIZATION_MAX_CONCURRENCY = 4  # Количество одновременных запросов к LLM
+MAX_TRANSCRIPT_TOKENS = 0  # Жёсткий лимит токенов всего транскрипта, 0 - без ограничения
+PROTOCOL_STREAM_FLUSH_SIZE = 200  # Минимальный фрагмент протокола, публикуемый при генерации, символов
+PROTOCOL_STREAM_IDLE_TIMEOUT = 60 * 60  # Ожидание событий потока протокола, после которого чтение прекращается, сек
+
+# Примерный битрейт аудио для оценки его длительности по размеру, бит/сек:
+ESTIMATED_BITRATES = {
+    "ogg": 32_000,
+    "mp3": 128_000,
+    "flac": 512_000,
+    "pcm": 256_000
+}
+DEFAULT_ESTIMATED_BITRATE = 128_000
+
+# Предварительная оценка задачи:
+SPEECH_CHARS_PER_SECOND = 13  # Символов транскрипта на секунду речи
+STT_REALTIME_FACTOR = 0.05  # Время распознавания относительно длительности аудио
+SUMMARY_OUTPUT_TOKENS = 1500  # Ожидаемый размер ответа LLM, токенов
+# Скорость провайдеров LLM: постоянная часть времени ответа, сек, обработка промпта и генерация, токенов/сек
+LLM_THROUGHPUT = {
+    "giga_chat": {"base_latency": 5, "prompt_tokens_per_second": 2000, "output_tokens_per_second": 30},
+    "yandex_gpt": {"base_latency": 3, "prompt_tokens_per_second": 3000, "output_tokens_per_second": 40}
+}
+DEFAULT_LLM_PROVIDER = "giga_chat"
+
+# Очередь задач (Redis Stream с группой потребителей):
+TASKS_STREAM = "tasks"
+TASKS_GROUP = "workers"
+TASKS_STREAM_MAX_LENGTH = 10_000  # Старые записи удаляются из потока при превышении
+TASK_HEARTBEAT_INTERVAL = 30  # Период продления выполняемых задач, сек
+TASK_RECLAIM_INTERVAL = 60  # Период поиска брошенных задач, сек
+TASK_VISIBILITY_TIMEOUT = 5 * 60  # Задача без продления дольше этого времени считается брошенной, сек
+TASK_MAX_DELIVERIES = 3  # Попыток выполнения задачи до перевода в ERROR
+TASK_CONSUMER_TTL = 24 * 60 * 60  # Время, после которого неактивный потребитель удаляется из группы, сек
+
+# Транскрипт, сохранённый рядом с исходным аудио:
+TRANSCRIPT_SUFFIX = ".transcript"
+TRANSCRIPT_FORMAT = "bin"
+
 # Имена s3 бакетов для хранения объектов:
 AUDIO_BUCKET = "audio"
 DOCUMENTS_BUCKET = "documents"
 
+# Размеры частей при потоковой загрузке:
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Размер чанка чтения входящего файла (1 МБ)
+MULTIPART_PART_SIZE = 8 * 1024 * 1024  # Размер части multipart загрузки в S3 (не меньше 5 МБ)
+
+# Возобновляемая загрузка:
+MIN_UPLOAD_PART_SIZE = 5 * 1024 * 1024  # Минимальный размер части (кроме последней), ограничение S3
+MAX_UPLOAD_PART_SIZE = 64 * 1024 * 1024  # Максимальный размер одной части
+UPLOAD_SESSION_TTL = 24 * 60 * 60  # Время жизни неактивной сессии загрузки, сек
+UPLOAD_SESSIONS_GC_INTERVAL = 60 * 60  # Интервал очистки брошенных сессий, сек
+
 # Пагинация
 START_PAGE = 1
 DEFAULT_LIMIT = 5
+DEFAULT_TRANSCRIPT_LIMIT = 100  # Фраз транскрипта на одной странице
 
 # API ошибки
 NOT_CREATED = "NOT_CREATED"
@@ -66,3 +145,8 @@ DOWNLOADING_ERROR = "DOWNLOADING_ERROR"
 DELETION_ERROR = "DELETION_ERROR"
 RECEIVING_ERROR = "RECEIVING_ERROR"
 NOT_FILES_YET = "NOT_FILES_YET"
+UNSUPPORTED_FORMAT = "UNSUPPORTED_FORMAT"
+TRANSCODING_QUEUE_FULL = "TRANSCODING_QUEUE_FULL"
+INVALID_UPLOAD = "INVALID_UPLOAD"
+PART_TOO_LARGE = "PART_TOO_LARGE"
+RENDERING_ERROR = "RENDERING_ERROR"
@@ -1,14 +1,16 @@
 from typing import Optional, Protocol, Generic, TypeVar, Union
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import AbstractAsyncContextManager
 
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timedelta
 from uuid import UUID
 
 from pydantic import BaseModel
 
-from .enums import FileType
-from .domain import FileMetadata, File
-from .dto import BaseMessage, AIMessage, Transcription
+from .enums import FileType, TaskStatus
+from .domain import FileMetadata, File, UploadSession, UploadPart, OffsetMap, AudioChunk, Transcript
+from .dto import BaseMessage, AIMessage, Transcription, ProtocolEvent
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -34,28 +36,165 @@ class BaseSTT(ABC):
             speakers_count: int
     ) -> list[Transcription]: pass
 
+    async def transcribe_stream(
+            self,
+            audio_stream: AsyncIterable[bytes],
+            audio_format: str,
+            speakers_count: int
+    ) -> list[Transcription]:
+        """Распознаёт аудио из потока, по умолчанию поток собирается в память целиком"""
+        audio_data = bytearray()
+        async for chunk in audio_stream:
+            audio_data.extend(chunk)
+        return await self.transcribe(bytes(audio_data), audio_format, speakers_count)
+
 
 class BaseLLM(ABC):
     @abstractmethod
     async def generate(self, messages: list[BaseMessage]) -> AIMessage: pass
 
+    async def astream(self, messages: list[BaseMessage]) -> AsyncIterator[str]:
+        """Генерирует ответ по частям, по умолчанию ответ возвращается одной частью"""
+        ai_message = await self.generate(messages)
+        yield ai_message.text
+
+
+class AudioProcessor(ABC):
+    @abstractmethod
+    def prepare_stream(
+            self,
+            audio_stream: AsyncIterable[bytes],
+            audio_format: str
+    ) -> AbstractAsyncContextManager[tuple[AsyncIterator[bytes], OffsetMap]]:
+        """Приводит аудио к формату, который принимает STT (моно, 16 кГц, Opus),
+        и вырезает длинные участки без речи. Запись обрабатывается на диске, поэтому память
+        не зависит от её длины. Подготовленный поток можно читать, пока открыт контекст.
+        """
+        pass
+
+    @abstractmethod
+    def split_stream(
+            self,
+            audio_stream: AsyncIterable[bytes],
+            audio_format: str,
+            chunk_duration: float
+    ) -> AbstractAsyncContextManager[AsyncIterator[AudioChunk]]:
+        """Делит аудио на фрагменты около chunk_duration секунд по паузам в речи.
+        Фрагменты кодируются по мере чтения, пока открыт контекст.
+        """
+        pass
+
+    @abstractmethod
+    async def get_speaker_profiles(
+            self,
+            audio_data: bytes,
+            audio_format: str,
+            utterances: list[tuple[int, float, float]]
+    ) -> dict[int, list[float]]:
+        """Возвращает вектор признаков голоса каждого спикера по его фразам (speaker_id, start, end)"""
+        pass
+
 
 class DocumentFactory(ABC):
+    @property
     @abstractmethod
-    def create_document(self, text: str) -> File: pass
+    def formats(self) -> list[str]:
+        """Форматы, в которых можно собрать документ"""
+        pass
+
+    @abstractmethod
+    async def create_document(self, text: str, format: str) -> File:
+        """Собирает документ в формате format из markdown текста протокола"""
+        pass
 
 
 class FileStorage(ABC):
     @abstractmethod
-    async def upload_file(self, data: bytes, key: str, bucket: str) -> None: pass
+    async def upload_file(
+            self,
+            data: bytes,
+            key: str,
+            bucket: str,
+            metadata: Optional[dict[str, str]] = None
+    ) -> None: pass
+
+    @abstractmethod
+    async def upload_stream(self, stream: AsyncIterable[bytes], key: str, bucket: str) -> int:
+        """Загружает поток байтов частями, возвращает размер загруженного файла в байтах"""
+        pass
+
+    @abstractmethod
+    async def create_multipart_upload(self, key: str, bucket: str) -> str: pass
+
+    @abstractmethod
+    async def upload_part(
+            self,
+            data: bytes,
+            key: str,
+            bucket: str,
+            upload_id: str,
+            part_number: int
+    ) -> str: pass
+
+    @abstractmethod
+    async def complete_multipart_upload(
+            self,
+            key: str,
+            bucket: str,
+            upload_id: str,
+            parts: list[dict[str, Union[int, str]]]
+    ) -> None: pass
+
+    @abstractmethod
+    async def abort_multipart_upload(self, key: str, bucket: str, upload_id: str) -> None: pass
 
     @abstractmethod
     async def download_file(self, key: str, bucket: str) -> bytes: pass
 
+    @abstractmethod
+    def download_stream(self, key: str, bucket: str) -> AsyncIterator[bytes]:
+        """Читает файл частями, не загружая его в память целиком"""
+        pass
+
+    @abstractmethod
+    async def file_exists(self, key: str, bucket: str) -> bool: pass
+
     @abstractmethod
     async def remove_file(self, key: str, bucket: str) -> str: pass
 
 
+class TextStream(ABC):
+    @abstractmethod
+    async def publish(self, stream_id: UUID, text: str) -> None:
+        """Добавляет фрагмент текста в поток"""
+        pass
+
+    @abstractmethod
+    async def reset(self, stream_id: UUID) -> None:
+        """Начинает поток заново, например, при повторной доставке задачи.
+        Читатели получают событие сброса и отбрасывают полученный ранее текст.
+        """
+        pass
+
+    @abstractmethod
+    async def finish(self, stream_id: UUID, status: TaskStatus) -> None:
+        """Завершает поток итоговым статусом задачи"""
+        pass
+
+    @abstractmethod
+    def read(
+            self,
+            stream_id: UUID,
+            last_event_id: Optional[str] = None,
+            wait: bool = True
+    ) -> AsyncIterator[Optional[ProtocolEvent]]:
+        """Читает события после last_event_id до завершения потока.
+        При wait=False возвращает только уже опубликованные события.
+        None означает, что новых событий пока нет.
+        """
+        pass
+
+
 class FileMetadataRepository(CRUDRepository[FileMetadata]):
     async def read_all(
             self,
@@ -75,8 +214,24 @@ class FileMetadataRepository(CRUDRepository[FileMetadata]):
 
     async def get_result(self, id: UUID) -> Optional[FileMetadata]: pass
 
+    async def get_by_hash(self, sha256: str) -> Optional[FileMetadata]: pass
+
     async def count(self, type: Optional[FileType] = None) -> int: pass
 
 
+class UploadSessionRepository(CRUDRepository[UploadSession]):
+    async def add_part(self, session_id: UUID, part: UploadPart) -> UploadPart: pass
+
+    async def get_parts(self, session_id: UUID) -> list[UploadPart]: pass
+
+    async def get_expired(self, ttl: timedelta) -> list[UploadSession]:
+        """Сессии, не обновлявшиеся дольше ttl. Время сравнивается по часам базы данных"""
+        pass
+
+
+class TranscriptRepository(CRUDRepository[Transcript]):
+    async def get_by_file_id(self, file_id: UUID) -> Optional[Transcript]: pass
+
+
 class BaseBroker(Protocol):
     async def publish(self, messages: BaseModel | list[BaseModel] | dict, **kwargs) -> None: pass
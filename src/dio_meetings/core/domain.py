@@ -1,13 +1,16 @@
-from typing import Optional
+from typing import Optional, Union
+from collections.abc import AsyncIterable
+
+import bisect
 
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, computed_field
 
 from .enums import FileType, TaskStatus
 
-from ..constants import AUDIO_FORMATS, DOCUMENT_FORMATS
+from ..utils import get_file_type, get_file_size
 
 
 class File(BaseModel):
@@ -16,7 +19,22 @@ class File(BaseModel):
 
     @property
     def size(self) -> float:
-        return round(len(self.data) / (1024 * 1024), 2)
+        return get_file_size(len(self.data))
+
+    @property
+    def format(self) -> str:
+        return self.file_name.split(".")[-1]
+
+    @property
+    def type(self) -> FileType:
+        return get_file_type(self.format)
+
+
+class FileStream(BaseModel):
+    stream: AsyncIterable[bytes]  # Содержимое файла, читаемое по частям
+    file_name: str
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
 
     @property
     def format(self) -> str:
@@ -24,12 +42,7 @@ class File(BaseModel):
 
     @property
     def type(self) -> FileType:
-        if self.format in AUDIO_FORMATS:
-            return FileType.AUDIO
-        elif self.format in DOCUMENT_FORMATS:
-            return FileType.DOCUMENT
-        else:
-            raise ValueError("Unsupported file format")
+        return get_file_type(self.format)
 
 
 class FileMetadata(BaseModel):
@@ -41,17 +54,124 @@ class FileMetadata(BaseModel):
     format: str                  # Формат файла / расширение
     type: FileType               # Тип файла
     uploaded_date: datetime      # Дата загрузки
+    sha256: Optional[str] = None  # SHA-256 содержимого файла
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class LLMThroughput(BaseModel):
+    base_latency: float              # Постоянная часть времени ответа, сек
+    prompt_tokens_per_second: float  # Скорость обработки промпта, токенов/сек
+    output_tokens_per_second: float  # Скорость генерации ответа, токенов/сек
+
+    def get_latency(self, prompt_tokens: int, output_tokens: int) -> float:
+        """Ожидаемое время ответа на запрос, сек"""
+        return (
+            self.base_latency
+            + prompt_tokens / self.prompt_tokens_per_second
+            + output_tokens / self.output_tokens_per_second
+        )
+
+
+class TaskEstimate(BaseModel):
+    audio_duration: float    # Длительность аудио, сек
+    transcript_tokens: int   # Ожидаемый размер транскрипта, токенов
+    prompt_tokens: int       # Ожидаемый размер промптов LLM, токенов
+    llm_calls: int           # Количество запросов к LLM
+    processing_time: float   # Ожидаемое время обработки, сек
+
+
 class Task(BaseModel):
     id: Optional[UUID] = None         # ID задачи
     file_id: UUID                     # Файл для распознавания
     status: TaskStatus                # Статус выполнения задачи
     result_id: Optional[UUID] = None  # ID сформированного файла
+    estimate: Optional[TaskEstimate] = None  # Предварительная оценка задачи
+
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @computed_field
+    @property
+    def eta(self) -> Optional[datetime]:
+        """Ожидаемое время готовности протокола"""
+        if self.status not in (TaskStatus.NEW, TaskStatus.RUNNING):
+            return None
+        if not self.estimate or not self.created_at:
+            return None
+        return self.created_at + timedelta(seconds=self.estimate.processing_time)
+
+
+class UploadSession(BaseModel):
+    id: Optional[UUID] = None  # ID сессии загрузки
+    file_name: str             # Имя загружаемого файла
+    key: str                   # Ключ объекта в S3
+    bucket: str                # Имя бакета в S3
+    upload_id: str             # ID multipart загрузки в S3
 
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class UploadPart(BaseModel):
+    part_number: int  # Номер части, начиная с 1
+    etag: str         # ETag загруженной части в S3
+    size: int         # Размер части в байтах
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UploadProgress(BaseModel):
+    session_id: UUID         # ID сессии загрузки
+    parts: list[UploadPart]  # Полученные части
+    received_size: int       # Всего получено байт
+    offset: int              # Смещение, до которого файл получен без пропусков
+    next_part_number: int    # Номер первой недостающей части
+
+
+class Transcript(BaseModel):
+    id: Optional[UUID] = None   # ID транскрипта
+    file_id: UUID               # ID распознанной аудиозаписи
+    key: str                    # Ключ файла транскрипта в S3
+    bucket: str                 # Имя бакета в S3
+    utterances_count: int       # Количество фраз
+    duration: float             # Конец последней фразы, сек
+    size: int                   # Размер файла транскрипта в байтах
+
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SpeechSegment(BaseModel):
+    start: float           # Начало отрезка речи в обрезанном аудио, сек
+    end: float             # Конец отрезка речи в обрезанном аудио, сек
+    original_start: float  # Начало отрезка в исходном аудио, сек
+
+
+class OffsetMap(BaseModel):
+    """Соответствие времени в аудио без тишины времени в исходной записи"""
+    segments: list[SpeechSegment] = []
+    removed_duration: float = 0.0  # Сколько секунд тишины вырезано
+
+    def to_original(self, time: float) -> float:
+        if not self.segments:
+            return time
+        index = bisect.bisect_right([segment.start for segment in self.segments], time) - 1
+        segment = self.segments[max(index, 0)]
+        return segment.original_start + (time - segment.start)
+
+
+class AudioChunk(BaseModel):
+    data: bytes    # Аудио фрагмента в формате PREPARED_AUDIO_FORMAT
+    offset: float  # Начало фрагмента в исходном аудио, сек
+
+
+class PreparedAudio(BaseModel):
+    file: Union[File, FileStream]  # Аудио для STT
+    offset_map: OffsetMap  # Смещения для восстановления исходных таймингов
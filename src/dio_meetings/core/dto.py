@@ -1,6 +1,10 @@
+from typing import Optional
+
+from uuid import UUID
+
 from pydantic import BaseModel, ConfigDict
 
-from .enums import Role, Emotion
+from .enums import Role, Emotion, TaskStatus
 
 
 class BaseMessage(BaseModel):
@@ -24,5 +28,24 @@ class Transcription(BaseModel):
     text: str         # Транскрибированный текст
     speaker_id: int   # ID спикера
     emotion: Emotion  # Эмоция спикера
+    start: Optional[float] = None  # Начало фразы в аудио, сек
+    end: Optional[float] = None    # Конец фразы в аудио, сек
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class TranscriptPage(BaseModel):
+    file_id: UUID                 # ID аудиозаписи
+    start: Optional[float]        # Начало диапазона времени, сек
+    end: Optional[float]          # Конец диапазона времени, сек
+    page: int                     # Номер страницы
+    limit: int                    # Фраз на странице
+    total: int                    # Всего фраз в диапазоне
+    transcriptions: list[Transcription]
+
+
+class ProtocolEvent(BaseModel):
+    id: str                              # ID события, для возобновления через Last-Event-ID
+    text: str = ""                       # Очередной фрагмент текста протокола
+    status: Optional[TaskStatus] = None  # Итоговый статус задачи, передаётся последним событием
+    reset: bool = False                  # Генерация началась заново, полученный ранее текст отбрасывается
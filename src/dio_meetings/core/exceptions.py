@@ -11,6 +11,10 @@ class DownloadingError(FileStoreError):
     pass
 
 
+class TextStreamError(Exception):
+    pass
+
+
 class RepositoryError(Exception):
     pass
 
@@ -49,3 +53,23 @@ class ResultDownloadingError(ServiceError):
 
 class SummarizationError(ServiceError):
     pass
+
+
+class TranscodingQueueFullError(ServiceError):
+    pass
+
+
+class UploadSessionError(ServiceError):
+    pass
+
+
+class AudioPreparationError(ServiceError):
+    pass
+
+
+class DocumentRenderingError(ServiceError):
+    pass
+
+
+class UnsupportedDocumentFormatError(ServiceError):
+    pass
@@ -1,64 +1,258 @@
-from typing import Optional
+from typing import Optional, Union
+from collections.abc import AsyncIterable, AsyncIterator
 
+import time
+import asyncio
+import hashlib
+import logging
 from uuid import UUID, uuid4
-from datetime import datetime
+from contextlib import aclosing
+from datetime import datetime, timedelta
 
 from .enums import FileType, TaskStatus
-from .domain import File, FileMetadata, Task
-from .dto import SystemMessage, UserMessage, Transcription
+from .domain import (
+    File,
+    FileStream,
+    FileMetadata,
+    Task,
+    UploadSession,
+    UploadPart,
+    UploadProgress,
+    OffsetMap,
+    PreparedAudio,
+    Transcript
+)
+from .dto import SystemMessage, UserMessage, BaseMessage, Transcription, TranscriptPage, ProtocolEvent
 from .base import (
+    AudioProcessor,
     BaseSTT,
     BaseLLM,
     BaseBroker,
     DocumentFactory,
     FileStorage,
+    TextStream,
     CRUDRepository,
-    FileMetadataRepository
+    FileMetadataRepository,
+    UploadSessionRepository,
+    TranscriptRepository
 )
 from .exceptions import (
+    ReadingError,
     UpdatingError,
     CreationError,
     UploadingError,
     TaskCreationError,
     TaskStatusUpdatingError,
     SummarizationError,
+    UploadSessionError,
+    AudioPreparationError,
+    TextStreamError,
+    DocumentRenderingError,
+    UnsupportedDocumentFormatError
 )
 
-from ..utils import generate_file_name, get_document_file_name
-from ..constants import DOCUMENTS_BUCKET
+from ..utils import (
+    generate_file_name,
+    get_document_file_name,
+    get_file_format,
+    get_file_type,
+    get_file_size,
+    get_prepared_file_name,
+    get_offset_map_file_name,
+    get_transcript_file_name,
+    get_rendered_file_name,
+    iter_with_hash,
+    estimate_tokens,
+    split_by_tokens
+)
+from ..transcript_codec import encode_transcript, decode_transcript, read_transcript_page
+from ..estimation import TaskEstimator
+from ..single_flight import SingleFlight
+from ..transcript_format import format_transcript_turns, fit_token_budget
+from ..templates import (
+    PARTIAL_SUMMARY_TEMPLATE,
+    COMBINE_SUMMARIES_TEMPLATE,
+    SUMMARIES_HEADER,
+    TRANSCRIPT_LEGEND
+)
+from ..constants import (
+    DOCUMENTS_BUCKET,
+    TASKS_STREAM,
+    TASKS_STREAM_MAX_LENGTH,
+    MIN_UPLOAD_PART_SIZE,
+    MAX_CHUNK_TOKENS,
+    SUMMARIZATION_MAX_CONCURRENCY,
+    MAX_TRANSCRIPT_TOKENS,
+    PROTOCOL_STREAM_FLUSH_SIZE,
+    PROTOCOL_STREAM_IDLE_TIMEOUT,
+    PROTOCOL_FORMAT,
+    DEFAULT_DOCUMENT_FORMAT,
+    DOCUMENT_FORMATS,
+    DOCUMENT_RENDERER_VERSION
+)
 
 
 class SummarizationService:
-    def __init__(self, stt: BaseSTT, llm: BaseLLM, document_factory: DocumentFactory) -> None:
+    def __init__(
+            self,
+            stt: BaseSTT,
+            llm: BaseLLM,
+            max_chunk_tokens: int = MAX_CHUNK_TOKENS,
+            max_concurrency: int = SUMMARIZATION_MAX_CONCURRENCY,
+            max_transcript_tokens: int = MAX_TRANSCRIPT_TOKENS,
+            text_stream: Optional[TextStream] = None
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
         self._stt = stt
         self._llm = llm
-        self._document_factory = document_factory
+        self._max_chunk_tokens = max_chunk_tokens
+        self._max_concurrency = max_concurrency
+        self._max_transcript_tokens = max_transcript_tokens
+        self._text_stream = text_stream
 
-    async def summarize(self, audio: File, speakers_count: int, prompt_template: str) -> Optional[File]:
+    async def transcribe(
+            self,
+            audio: Union[File, FileStream],
+            speakers_count: int,
+            offset_map: Optional[OffsetMap] = None
+    ) -> list[Transcription]:
         if audio.type != FileType.AUDIO:
             raise ValueError("File type must be audio")
         try:
-            transcriptions = await self._stt.transcribe(
-                audio_data=audio.data,
-                audio_format=audio.format,
-                speakers_count=speakers_count
+            if isinstance(audio, FileStream):
+                transcriptions = await self._stt.transcribe_stream(
+                    audio_stream=audio.stream,
+                    audio_format=audio.format,
+                    speakers_count=speakers_count
+                )
+            else:
+                transcriptions = await self._stt.transcribe(
+                    audio_data=audio.data,
+                    audio_format=audio.format,
+                    speakers_count=speakers_count
+                )
+            if offset_map:
+                transcriptions = self._restore_timings(transcriptions, offset_map)
+            return transcriptions
+        except Exception as e:
+            raise SummarizationError(f"Error while transcribing audio: {e}") from e
+
+    async def summarize(
+            self,
+            transcriptions: list[Transcription],
+            prompt_template: str,
+            stream_id: Optional[UUID] = None
+    ) -> Optional[File]:
+        """Составляет протокол в markdown по транскрипту. Транскрипт, не помещающийся в один запрос,
+        делится на части, конспекты частей составляются параллельно и затем объединяются.
+        Если передан stream_id, текст итогового ответа публикуется по мере генерации.
+        """
+        try:
+            started_at = time.perf_counter()
+            turns = format_transcript_turns(transcriptions)
+            if self._max_transcript_tokens:
+                turns = fit_token_budget(turns, self._max_transcript_tokens)
+            chunks = [
+                "\n".join([TRANSCRIPT_LEGEND, *chunk])
+                for chunk in split_by_tokens(turns, self._max_chunk_tokens)
+            ]
+            if len(chunks) <= 1:
+                text = chunks[0] if chunks else ""
+            else:
+                summaries = await self._map(PARTIAL_SUMMARY_TEMPLATE, chunks)
+                summaries = await self._collapse(summaries)
+                text = "\n\n".join([SUMMARIES_HEADER, *summaries])
+            messages = [SystemMessage(text=prompt_template), UserMessage(text=text)]
+            if self._text_stream and stream_id:
+                protocol = await self._generate_streaming(messages, stream_id)
+            else:
+                protocol = (await self._llm.generate(messages)).text
+            document = File(data=protocol.encode("utf-8"), file_name=generate_file_name(PROTOCOL_FORMAT))
+            self._logger.info(
+                "Summarized %d utterances (%d turns, ~%d prompt tokens) in %d chunks in %.2fs",
+                len(transcriptions),
+                len(turns),
+                sum(estimate_tokens(chunk) for chunk in chunks),
+                len(chunks),
+                time.perf_counter() - started_at
             )
-            formated_transcriptions = self._format_transcriptions(transcriptions)
-            messages = [SystemMessage(text=prompt_template), UserMessage(text=formated_transcriptions)]
-            ai_message = await self._llm.generate(messages)
-            document = self._document_factory.create_document(ai_message.text)
             return document
         except Exception as e:
             raise SummarizationError(f"Error while summarizing audio: {e}") from e
 
+    async def _generate_streaming(self, messages: list[BaseMessage], stream_id: UUID) -> str:
+        """Генерирует ответ, публикуя его фрагментами не меньше PROTOCOL_STREAM_FLUSH_SIZE символов.
+        Задача может выполняться повторно после падения воркера, поэтому поток начинается заново,
+        иначе читатель получит текст прерванной попытки и следом полный текст новой.
+        """
+        parts: list[str] = []
+        buffer: list[str] = []
+        buffer_size = 0
+        is_publishing = await self._reset_stream(stream_id)
+        async for part in self._llm.astream(messages):
+            parts.append(part)
+            if not is_publishing:
+                continue
+            buffer.append(part)
+            buffer_size += len(part)
+            if buffer_size >= PROTOCOL_STREAM_FLUSH_SIZE:
+                is_publishing = await self._publish(stream_id, "".join(buffer))
+                buffer.clear()
+                buffer_size = 0
+        if is_publishing and buffer:
+            await self._publish(stream_id, "".join(buffer))
+        return "".join(parts)
+
+    async def _publish(self, stream_id: UUID, text: str) -> bool:
+        """Публикует фрагмент протокола, ошибка публикации не прерывает генерацию"""
+        try:
+            await self._text_stream.publish(stream_id, text)
+            return True
+        except TextStreamError as e:
+            self._logger.warning("Error while publishing protocol text, streaming stopped: %s", e)
+            return False
+
+    async def _reset_stream(self, stream_id: UUID) -> bool:
+        """Сбрасывает поток перед генерацией. Без сброса текст не публикуется, чтобы не смешать попытки"""
+        try:
+            await self._text_stream.reset(stream_id)
+            return True
+        except TextStreamError as e:
+            self._logger.warning("Error while resetting protocol stream, streaming disabled: %s", e)
+            return False
+
+    async def _map(self, prompt_template: str, texts: list[str]) -> list[str]:
+        """Параллельно обрабатывает тексты LLM, не больше max_concurrency запросов одновременно"""
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def generate(text: str) -> str:
+            async with semaphore:
+                ai_message = await self._llm.generate([SystemMessage(text=prompt_template), UserMessage(text=text)])
+                return ai_message.text
+
+        return list(await asyncio.gather(*[generate(text) for text in texts]))
+
+    async def _collapse(self, summaries: list[str]) -> list[str]:
+        """Объединяет конспекты группами, пока они не поместятся в один запрос"""
+        while estimate_tokens("\n\n".join(summaries)) > self._max_chunk_tokens:
+            groups = split_by_tokens(summaries, self._max_chunk_tokens)
+            if len(groups) == len(summaries):
+                # Каждый конспект сам по себе превышает лимит, объединять дальше нечего
+                break
+            summaries = await self._map(
+                COMBINE_SUMMARIES_TEMPLATE,
+                ["\n\n".join(group) for group in groups]
+            )
+        return summaries
+
     @staticmethod
-    def _format_transcriptions(transcriptions: list[Transcription]) -> str:
-        return "\n\n".join([
-            f"speaker_id: {transcription.speaker_id}, "
-            f"text: {transcription.text}, "
-            f"emotion: {transcription.emotion}"
-            for transcription in transcriptions
-        ])
+    def _restore_timings(transcriptions: list[Transcription], offset_map: OffsetMap) -> list[Transcription]:
+        for transcription in transcriptions:
+            if transcription.start is not None:
+                transcription.start = offset_map.to_original(transcription.start)
+            if transcription.end is not None:
+                transcription.end = offset_map.to_original(transcription.end)
+        return transcriptions
 
 
 class TaskService:
@@ -67,27 +261,42 @@ class TaskService:
             task_repository: CRUDRepository[Task],
             file_metadata_repository: FileMetadataRepository,
             file_storage: FileStorage,
-            broker: BaseBroker
+            broker: BaseBroker,
+            task_estimator: Optional[TaskEstimator] = None,
+            text_stream: Optional[TextStream] = None,
+            stream_idle_timeout: float = PROTOCOL_STREAM_IDLE_TIMEOUT
     ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
         self._task_repository = task_repository
         self._file_metadata_repository = file_metadata_repository
         self._file_storage = file_storage
         self._broker = broker
+        self._task_estimator = task_estimator or TaskEstimator()
+        self._text_stream = text_stream
+        self._stream_idle_timeout = stream_idle_timeout
 
     async def create(self, file_id: UUID) -> Optional[Task]:
         try:
-            task = Task(file_id=file_id, status=TaskStatus.RUNNING)
+            result = await self._file_metadata_repository.get_result(file_id)
+            if result:
+                # Запись уже обработана, переиспользуем готовый протокол
+                task = Task(file_id=file_id, status=TaskStatus.DONE, result_id=result.id)
+                return await self._task_repository.create(task)
+            file_metadata = await self._file_metadata_repository.read(file_id)
+            estimate = self._task_estimator.estimate(file_metadata) if file_metadata else None
+            task = Task(file_id=file_id, status=TaskStatus.RUNNING, estimate=estimate)
             created_task = await self._task_repository.create(task)
             created_task.status = TaskStatus.NEW
-            await self._broker.publish(created_task, channel="tasks")
+            await self._broker.publish(created_task, stream=TASKS_STREAM, maxlen=TASKS_STREAM_MAX_LENGTH)
             return created_task
-        except CreationError as e:
+        except (CreationError, ReadingError) as e:
             raise TaskCreationError(f"Error while task creation: {e}") from e
 
     async def update_status(self, task_id: UUID, document: Optional[File]) -> None:
         try:
             if not document:
                 await self._task_repository.update(id=task_id, status=TaskStatus.ERROR)
+                await self._finish_stream(task_id, TaskStatus.ERROR)
                 return
         except UpdatingError as e:
             raise TaskStatusUpdatingError(f"Error while updating task status: {e}") from e
@@ -111,6 +320,7 @@ class TaskService:
             await self._file_metadata_repository.create(file_metadata)
         except (UpdatingError, UploadingError, CreationError) as e:
             raise TaskStatusUpdatingError(f"Error while updating task status: {e}") from e
+        await self._finish_stream(task_id, TaskStatus.DONE)
 
     async def get_status(self, task_id: UUID) -> Optional[Task]:
         task = await self._task_repository.read(task_id)
@@ -118,6 +328,54 @@ class TaskService:
             return None
         return task
 
+    async def stream_protocol(
+            self,
+            task: Task,
+            last_event_id: Optional[str] = None
+    ) -> AsyncIterator[Optional[ProtocolEvent]]:
+        """Возвращает текст протокола по мере генерации, последним событием - итоговый статус.
+        Для завершённой задачи отдаются сохранённые события, None - новых событий пока нет.
+        Событие со сбросом означает, что генерация началась заново и полученный текст устарел.
+        Если поток не завершён, а воркер упал, чтение прекращается, когда задача завершится
+        без события в потоке или событий не будет дольше stream_idle_timeout. Тогда последним
+        отдаётся текущий статус, в том числе RUNNING, и клиент может переподключиться.
+        """
+        is_running = task.status in (TaskStatus.NEW, TaskStatus.RUNNING)
+        if self._text_stream:
+            idle_since = time.monotonic()
+            is_finished = False
+            async with aclosing(self._text_stream.read(task.id, last_event_id, wait=is_running)) as events:
+                async for event in events:
+                    if event is None:
+                        task = await self._task_repository.read(task.id) or task
+                        is_finished = task.status not in (TaskStatus.NEW, TaskStatus.RUNNING)
+                        if is_finished or time.monotonic() - idle_since >= self._stream_idle_timeout:
+                            break
+                        yield None
+                        continue
+                    idle_since = time.monotonic()
+                    last_event_id = event.id
+                    yield event
+                    if event.status:
+                        return
+            if is_finished:
+                # Задача могла завершиться после последнего чтения, дочитываем опубликованное
+                async for event in self._text_stream.read(task.id, last_event_id, wait=False):
+                    last_event_id = event.id
+                    yield event
+                    if event.status:
+                        return
+        # Поток истёк, не создавался, например, для переиспользованного протокола, или не завершён
+        yield ProtocolEvent(id=last_event_id or "0-0", status=task.status)
+
+    async def _finish_stream(self, task_id: UUID, status: TaskStatus) -> None:
+        if not self._text_stream:
+            return
+        try:
+            await self._text_stream.finish(task_id, status)
+        except TextStreamError as e:
+            self._logger.warning("Error while finishing protocol stream: %s", e)
+
 
 class FileService:
     def __init__(
@@ -128,20 +386,43 @@ class FileService:
         self._file_metadata_repository = file_metadata_repository
         self._file_storage = file_storage
 
-    async def upload(self, file: File, bucket: str) -> FileMetadata:
-        key = generate_file_name(file.format)
-        await self._file_storage.upload_file(data=file.data, key=key, bucket=bucket)
+    async def upload(self, stream: AsyncIterable[bytes], file_name: str, bucket: str) -> FileMetadata:
+        file_format = get_file_format(file_name)
+        file_type = get_file_type(file_format)
+        key = generate_file_name(file_format)
+        hasher = hashlib.sha256()
+        size = await self._file_storage.upload_stream(
+            iter_with_hash(stream, hasher), key=key, bucket=bucket
+        )
         file_metadata = FileMetadata(
-            file_name=file.file_name,
+            file_name=file_name,
             key=key,
             bucket=bucket,
-            size=file.size,
-            format=file.format,
-            type=file.type,
-            uploaded_date=datetime.now()
+            size=get_file_size(size),
+            format=file_format,
+            type=file_type,
+            uploaded_date=datetime.now(),
+            sha256=hasher.hexdigest()
         )
-        created_file_metadata = await self._file_metadata_repository.create(file_metadata)
-        return created_file_metadata
+        return await self.save_unique(file_metadata)
+
+    async def save_unique(self, file_metadata: FileMetadata) -> FileMetadata:
+        """Сохраняет метаданные загруженного файла. Если файл с таким же содержимым уже есть,
+        загруженная копия удаляется и возвращается существующий файл вместе с готовым результатом.
+        """
+        existing_file_metadata = await self._file_metadata_repository.get_by_hash(file_metadata.sha256)
+        if existing_file_metadata:
+            await self._file_storage.remove_file(key=file_metadata.key, bucket=file_metadata.bucket)
+            return existing_file_metadata
+        try:
+            return await self._file_metadata_repository.create(file_metadata)
+        except CreationError:
+            # Такой же файл мог быть загружен параллельно
+            existing_file_metadata = await self._file_metadata_repository.get_by_hash(file_metadata.sha256)
+            if not existing_file_metadata:
+                raise
+            await self._file_storage.remove_file(key=file_metadata.key, bucket=file_metadata.bucket)
+            return existing_file_metadata
 
     async def download(self, id: UUID, bucket: str) -> Optional[File]:
         file_metadata = await self._file_metadata_repository.read(id)
@@ -150,10 +431,333 @@ class FileService:
         data = await self._file_storage.download_file(key=file_metadata.key, bucket=bucket)
         return File(data=data, file_name=file_metadata.key)
 
+    async def download_stream(self, id: UUID, bucket: str) -> Optional[FileStream]:
+        file_metadata = await self._file_metadata_repository.read(id)
+        if not file_metadata:
+            return None
+        return FileStream(
+            stream=self._file_storage.download_stream(key=file_metadata.key, bucket=bucket),
+            file_name=file_metadata.key
+        )
+
     async def remove(self, id: UUID, bucket: str) -> bool:
         file_metadata = await self._file_metadata_repository.read(id)
         if not file_metadata:
             return False
         is_deleted = await self._file_metadata_repository.delete(id)
         await self._file_storage.remove_file(key=file_metadata.key, bucket=bucket)
+        if file_metadata.type == FileType.AUDIO:
+            await self._file_storage.remove_file(key=get_prepared_file_name(file_metadata.key), bucket=bucket)
+            await self._file_storage.remove_file(key=get_offset_map_file_name(file_metadata.key), bucket=bucket)
+            await self._file_storage.remove_file(key=get_transcript_file_name(file_metadata.key), bucket=bucket)
+        if file_metadata.type == FileType.DOCUMENT:
+            for format in DOCUMENT_FORMATS:
+                rendered_key = get_rendered_file_name(file_metadata.key, format)
+                await self._file_storage.remove_file(key=rendered_key, bucket=bucket)
         return is_deleted
+
+
+class DocumentService:
+    """Отдаёт протокол в запрошенном формате. Документ собирается из markdown протокола
+    при первом скачивании и сохраняется в S3 рядом с ним. Одновременные запросы
+    одного документа собирают его один раз.
+    """
+    def __init__(
+            self,
+            file_metadata_repository: FileMetadataRepository,
+            file_storage: FileStorage,
+            document_factory: DocumentFactory,
+            single_flight: Optional[SingleFlight] = None
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._file_metadata_repository = file_metadata_repository
+        self._file_storage = file_storage
+        self._document_factory = document_factory
+        self._single_flight = single_flight or SingleFlight()
+
+    async def download(self, id: UUID, bucket: str, format: Optional[str] = None) -> Optional[File]:
+        file_metadata = await self._file_metadata_repository.read(id)
+        if not file_metadata:
+            return None
+        format = format or DEFAULT_DOCUMENT_FORMAT
+        file_name = f"{file_metadata.file_name.rsplit('.', 1)[0]}.{format}"
+        if format == file_metadata.format:
+            data = await self._file_storage.download_file(key=file_metadata.key, bucket=bucket)
+            return File(data=data, file_name=file_name)
+        if file_metadata.format != PROTOCOL_FORMAT or format not in self._document_factory.formats:
+            raise UnsupportedDocumentFormatError(
+                f"Document in {file_metadata.format} format can not be converted to {format}"
+            )
+        key = get_rendered_file_name(file_metadata.key, format)
+        try:
+            if await self._file_storage.file_exists(key=key, bucket=bucket):
+                data = await self._file_storage.download_file(key=key, bucket=bucket)
+            else:
+                data = await self._single_flight.run(
+                    key, lambda: self._render(file_metadata, key=key, format=format, bucket=bucket)
+                )
+        except Exception as e:
+            raise DocumentRenderingError(f"Error while rendering document: {e}") from e
+        return File(data=data, file_name=file_name)
+
+    async def _render(self, file_metadata: FileMetadata, key: str, format: str, bucket: str) -> bytes:
+        # Документ мог собрать другой процесс, пока ожидалась блокировка
+        if await self._file_storage.file_exists(key=key, bucket=bucket):
+            return await self._file_storage.download_file(key=key, bucket=bucket)
+        protocol = await self._file_storage.download_file(key=file_metadata.key, bucket=bucket)
+        document = await self._document_factory.create_document(protocol.decode("utf-8"), format)
+        await self._file_storage.upload_file(
+            data=document.data,
+            key=key,
+            bucket=bucket,
+            metadata={
+                "source-key": file_metadata.key,
+                "renderer-version": str(DOCUMENT_RENDERER_VERSION)
+            }
+        )
+        self._logger.info("Document %s rendered to %s and cached", file_metadata.id, format)
+        return document.data
+
+
+class AudioPreparationService:
+    def __init__(
+            self,
+            file_metadata_repository: FileMetadataRepository,
+            file_storage: FileStorage,
+            audio_processor: AudioProcessor
+    ) -> None:
+        self._file_metadata_repository = file_metadata_repository
+        self._file_storage = file_storage
+        self._audio_processor = audio_processor
+
+    async def prepare(self, id: UUID, bucket: str) -> Optional[PreparedAudio]:
+        """Возвращает аудио в формате для STT, подготовленная копия кэшируется в S3 рядом с оригиналом"""
+        file_metadata = await self._file_metadata_repository.read(id)
+        if not file_metadata:
+            return None
+        prepared_key = get_prepared_file_name(file_metadata.key)
+        offset_map_key = get_offset_map_file_name(file_metadata.key)
+        if await self._file_storage.file_exists(key=offset_map_key, bucket=bucket):
+            offset_map_data = await self._file_storage.download_file(key=offset_map_key, bucket=bucket)
+            return PreparedAudio(
+                file=FileStream(
+                    stream=self._file_storage.download_stream(key=prepared_key, bucket=bucket),
+                    file_name=prepared_key
+                ),
+                offset_map=OffsetMap.model_validate_json(offset_map_data)
+            )
+        # Оригинал и подготовленное аудио передаются потоком, запись не загружается в память целиком
+        try:
+            async with self._audio_processor.prepare_stream(
+                self._file_storage.download_stream(key=file_metadata.key, bucket=bucket),
+                audio_format=file_metadata.format
+            ) as (prepared_stream, offset_map):
+                await self._file_storage.upload_stream(prepared_stream, key=prepared_key, bucket=bucket)
+        except RuntimeError as e:
+            raise AudioPreparationError(f"Error while preparing audio: {e}") from e
+        # Карта смещений загружается последней и служит признаком готового кэша
+        await self._file_storage.upload_file(
+            data=offset_map.model_dump_json().encode("utf-8"),
+            key=offset_map_key,
+            bucket=bucket
+        )
+        return PreparedAudio(
+            file=FileStream(
+                stream=self._file_storage.download_stream(key=prepared_key, bucket=bucket),
+                file_name=prepared_key
+            ),
+            offset_map=offset_map
+        )
+
+
+class TranscriptService:
+    def __init__(
+            self,
+            transcript_repository: TranscriptRepository,
+            file_metadata_repository: FileMetadataRepository,
+            file_storage: FileStorage
+    ) -> None:
+        self._transcript_repository = transcript_repository
+        self._file_metadata_repository = file_metadata_repository
+        self._file_storage = file_storage
+
+    async def get(self, file_id: UUID) -> Optional[list[Transcription]]:
+        """Возвращает сохранённый транскрипт аудиозаписи, если она уже распознавалась"""
+        transcript = await self._transcript_repository.get_by_file_id(file_id)
+        if not transcript:
+            return None
+        data = await self._file_storage.download_file(key=transcript.key, bucket=transcript.bucket)
+        return decode_transcript(data)
+
+    async def save(self, file_id: UUID, transcriptions: list[Transcription]) -> Optional[Transcript]:
+        file_metadata = await self._file_metadata_repository.read(file_id)
+        if not file_metadata:
+            return None
+        key = get_transcript_file_name(file_metadata.key)
+        data = encode_transcript(transcriptions)
+        await self._file_storage.upload_file(data=data, key=key, bucket=file_metadata.bucket)
+        transcript = Transcript(
+            file_id=file_id,
+            key=key,
+            bucket=file_metadata.bucket,
+            utterances_count=len(transcriptions),
+            duration=max((transcription.end or 0.0 for transcription in transcriptions), default=0.0),
+            size=len(data)
+        )
+        try:
+            return await self._transcript_repository.create(transcript)
+        except CreationError:
+            # Транскрипт мог быть сохранён параллельной задачей
+            existing_transcript = await self._transcript_repository.get_by_file_id(file_id)
+            if not existing_transcript:
+                raise
+            return existing_transcript
+
+    async def get_page(
+            self,
+            file_id: UUID,
+            start: Optional[float],
+            end: Optional[float],
+            page: int,
+            limit: int
+    ) -> Optional[TranscriptPage]:
+        """Возвращает страницу фраз, начинающихся в диапазоне времени [start, end)"""
+        transcript = await self._transcript_repository.get_by_file_id(file_id)
+        if not transcript:
+            return None
+        data = await self._file_storage.download_file(key=transcript.key, bucket=transcript.bucket)
+        total, transcriptions = read_transcript_page(
+            data,
+            start=start,
+            end=end,
+            offset=(page - 1) * limit,
+            limit=limit
+        )
+        return TranscriptPage(
+            file_id=file_id,
+            start=start,
+            end=end,
+            page=page,
+            limit=limit,
+            total=total,
+            transcriptions=transcriptions
+        )
+
+
+class UploadService:
+    def __init__(
+            self,
+            upload_session_repository: UploadSessionRepository,
+            file_metadata_repository: FileMetadataRepository,
+            file_storage: FileStorage
+    ) -> None:
+        self._upload_session_repository = upload_session_repository
+        self._file_metadata_repository = file_metadata_repository
+        self._file_storage = file_storage
+        self._file_service = FileService(file_metadata_repository, file_storage)
+
+    async def create(self, file_name: str, bucket: str) -> UploadSession:
+        file_format = get_file_format(file_name)
+        get_file_type(file_format)
+        key = generate_file_name(file_format)
+        upload_id = await self._file_storage.create_multipart_upload(key=key, bucket=bucket)
+        upload_session = UploadSession(
+            file_name=file_name,
+            key=key,
+            bucket=bucket,
+            upload_id=upload_id
+        )
+        return await self._upload_session_repository.create(upload_session)
+
+    async def upload_part(self, session_id: UUID, part_number: int, data: bytes) -> Optional[UploadPart]:
+        upload_session = await self._upload_session_repository.read(session_id)
+        if not upload_session:
+            return None
+        etag = await self._file_storage.upload_part(
+            data=data,
+            key=upload_session.key,
+            bucket=upload_session.bucket,
+            upload_id=upload_session.upload_id,
+            part_number=part_number
+        )
+        part = UploadPart(part_number=part_number, etag=etag, size=len(data))
+        return await self._upload_session_repository.add_part(session_id, part)
+
+    async def get_progress(self, session_id: UUID) -> Optional[UploadProgress]:
+        upload_session = await self._upload_session_repository.read(session_id)
+        if not upload_session:
+            return None
+        parts = await self._upload_session_repository.get_parts(session_id)
+        offset, next_part_number = 0, 1
+        for part in parts:
+            if part.part_number != next_part_number:
+                break
+            offset += part.size
+            next_part_number += 1
+        return UploadProgress(
+            session_id=session_id,
+            parts=parts,
+            received_size=sum(part.size for part in parts),
+            offset=offset,
+            next_part_number=next_part_number
+        )
+
+    async def complete(self, session_id: UUID) -> Optional[FileMetadata]:
+        upload_session = await self._upload_session_repository.read(session_id)
+        if not upload_session:
+            return None
+        parts = await self._upload_session_repository.get_parts(session_id)
+        if not parts:
+            raise UploadSessionError("Upload session has no parts")
+        for index, part in enumerate(parts, start=1):
+            if part.part_number != index:
+                raise UploadSessionError(f"Part {index} is missing")
+            if index < len(parts) and part.size < MIN_UPLOAD_PART_SIZE:
+                raise UploadSessionError(f"Part {index} is smaller than {MIN_UPLOAD_PART_SIZE} bytes")
+        await self._file_storage.complete_multipart_upload(
+            key=upload_session.key,
+            bucket=upload_session.bucket,
+            upload_id=upload_session.upload_id,
+            parts=[{"PartNumber": part.part_number, "ETag": part.etag} for part in parts]
+        )
+        # Части могут приходить в любом порядке и загружаться повторно, поэтому хэш
+        # считается по собранному объекту одним последовательным чтением из S3
+        hasher = hashlib.sha256()
+        async for chunk in self._file_storage.download_stream(key=upload_session.key, bucket=upload_session.bucket):
+            hasher.update(chunk)
+        file_format = get_file_format(upload_session.file_name)
+        file_metadata = FileMetadata(
+            file_name=upload_session.file_name,
+            key=upload_session.key,
+            bucket=upload_session.bucket,
+            size=get_file_size(sum(part.size for part in parts)),
+            format=file_format,
+            type=get_file_type(file_format),
+            uploaded_date=datetime.now(),
+            sha256=hasher.hexdigest()
+        )
+        saved_file_metadata = await self._file_service.save_unique(file_metadata)
+        await self._upload_session_repository.delete(session_id)
+        return saved_file_metadata
+
+    async def abort(self, session_id: UUID) -> bool:
+        upload_session = await self._upload_session_repository.read(session_id)
+        if not upload_session:
+            return False
+        await self._file_storage.abort_multipart_upload(
+            key=upload_session.key,
+            bucket=upload_session.bucket,
+            upload_id=upload_session.upload_id
+        )
+        return await self._upload_session_repository.delete(session_id)
+
+    async def remove_expired(self, ttl: timedelta) -> int:
+        expired_sessions = await self._upload_session_repository.get_expired(ttl)
+        for upload_session in expired_sessions:
+            await self._file_storage.abort_multipart_upload(
+                key=upload_session.key,
+                bucket=upload_session.bucket,
+                upload_id=upload_session.upload_id
+            )
+            await self._upload_session_repository.delete(upload_session.id)
+        return len(expired_sessions)
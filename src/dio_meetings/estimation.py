@@ -0,0 +1,70 @@
+from typing import Optional
+
+import math
+
+from .core.domain import FileMetadata, TaskEstimate, LLMThroughput
+from .utils import MB, estimate_tokens
+from .templates import SUMMARY_TEMPLATE, PARTIAL_SUMMARY_TEMPLATE
+from .constants import (
+    ESTIMATED_BITRATES,
+    DEFAULT_ESTIMATED_BITRATE,
+    SPEECH_CHARS_PER_SECOND,
+    CHARS_PER_TOKEN,
+    STT_REALTIME_FACTOR,
+    LLM_THROUGHPUT,
+    DEFAULT_LLM_PROVIDER,
+    SUMMARY_OUTPUT_TOKENS,
+    MAX_CHUNK_TOKENS,
+    SUMMARIZATION_MAX_CONCURRENCY
+)
+
+
+class TaskEstimator:
+    """Предварительно оценивает размер промптов и время обработки задачи по метаданным аудио,
+    не скачивая и не декодируя сам файл. Время ответов LLM оценивается по скорости
+    провайдера, на который уходят запросы.
+    """
+    def __init__(
+            self,
+            max_chunk_tokens: int = MAX_CHUNK_TOKENS,
+            max_concurrency: int = SUMMARIZATION_MAX_CONCURRENCY,
+            stt_realtime_factor: float = STT_REALTIME_FACTOR,
+            llm_throughput: Optional[LLMThroughput] = None
+    ) -> None:
+        self._max_chunk_tokens = max_chunk_tokens
+        self._max_concurrency = max_concurrency
+        self._stt_realtime_factor = stt_realtime_factor
+        self._llm_throughput = llm_throughput or LLMThroughput.model_validate(LLM_THROUGHPUT[DEFAULT_LLM_PROVIDER])
+
+    def estimate(self, file_metadata: FileMetadata) -> TaskEstimate:
+        bitrate = ESTIMATED_BITRATES.get(file_metadata.format, DEFAULT_ESTIMATED_BITRATE)
+        audio_duration = file_metadata.size * MB * 8 / bitrate
+        transcript_tokens = math.ceil(audio_duration * SPEECH_CHARS_PER_SECOND / CHARS_PER_TOKEN)
+        chunks_count = max(math.ceil(transcript_tokens / self._max_chunk_tokens), 1)
+        summary_template_tokens = estimate_tokens(SUMMARY_TEMPLATE)
+        stt_time = audio_duration * self._stt_realtime_factor
+        if chunks_count == 1:
+            prompt_tokens = summary_template_tokens + transcript_tokens
+            llm_calls = 1
+            llm_time = self._get_llm_latency(prompt_tokens)
+        else:
+            # Map: конспект каждой части, волнами по max_concurrency; reduce: протокол по конспектам
+            map_prompt_tokens = estimate_tokens(PARTIAL_SUMMARY_TEMPLATE) + self._max_chunk_tokens
+            reduce_prompt_tokens = summary_template_tokens + chunks_count * SUMMARY_OUTPUT_TOKENS
+            prompt_tokens = chunks_count * map_prompt_tokens + reduce_prompt_tokens
+            llm_calls = chunks_count + 1
+            waves_count = math.ceil(chunks_count / self._max_concurrency)
+            llm_time = (
+                waves_count * self._get_llm_latency(map_prompt_tokens)
+                + self._get_llm_latency(reduce_prompt_tokens)
+            )
+        return TaskEstimate(
+            audio_duration=round(audio_duration, 1),
+            transcript_tokens=transcript_tokens,
+            prompt_tokens=prompt_tokens,
+            llm_calls=llm_calls,
+            processing_time=round(stt_time + llm_time, 1)
+        )
+
+    def _get_llm_latency(self, prompt_tokens: int) -> float:
+        return self._llm_throughput.get_latency(prompt_tokens, SUMMARY_OUTPUT_TOKENS)
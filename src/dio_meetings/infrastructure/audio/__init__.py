@@ -0,0 +1,5 @@
+__all__ = (
+    "FFmpegAudioProcessor"
+)
+
+from .processor import FFmpegAudioProcessor
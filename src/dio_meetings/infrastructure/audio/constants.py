@@ -0,0 +1,32 @@
+# Параметры аудио, которые использует STT:
+SAMPLE_RATE = 16000  # Частота дискретизации, Гц
+CHANNELS_COUNT = 1   # Моно
+OPUS_BITRATE = "32k"  # Бит-рейт Opus, достаточный для распознавания речи
+
+# Форматы без заголовка, параметры которых ffmpeg не может определить сам:
+RAW_INPUT_OPTIONS = {
+    "pcm": ["-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", str(CHANNELS_COUNT)]
+}
+
+# Настройки определения речи (VAD):
+VAD_TOP_DB = 40  # Порог тишины в дБ относительно пика
+VAD_MIN_SILENCE = 2.0  # Вырезаются только паузы длиннее, сек
+VAD_PADDING = 0.3  # Запас тишины, оставляемый вокруг речи, сек
+VAD_FRAME_LENGTH = 2048
+VAD_HOP_LENGTH = 512
+VAD_SPEECH_WINDOW = 1.0  # Окно проверки, похож ли звук на речь, сек
+VAD_MIN_LOUDNESS_VARIATION = 5.0  # Речь - слоги и паузы между ними, тон и музыка звучат ровнее, дБ
+VAD_MIN_SPECTRAL_CHANGE = 3.0  # Средняя смена MFCC между кадрами, у речи тембр меняется с каждым звуком
+VAD_SILENCE_FLOOR = -60  # Кадры тише не учитываются при оценке громкости, дБ
+
+# Деление аудио на фрагменты:
+SPLIT_SEARCH_WINDOW = 30.0  # Окно поиска паузы вокруг границы фрагмента, сек
+SPLIT_MIN_SILENCE = 0.3  # Минимальная пауза, по которой можно резать, сек
+
+# Профили голоса спикеров:
+MFCC_COUNT = 20  # Количество MFCC коэффициентов
+SPEAKER_PROFILE_MAX_DURATION = 60.0  # Максимум речи спикера для построения профиля, сек
+
+# Потоковая обработка длинных записей:
+PCM_SAMPLE_WIDTH = 2  # Байт на отсчёт PCM signed 16bit
+PROCESSING_BLOCK_DURATION = 60.0  # Аудио читается с диска блоками, чтобы память не зависела от длины записи, сек
@@ -0,0 +1,110 @@
+import subprocess
+
+from .constants import (
+    SAMPLE_RATE,
+    CHANNELS_COUNT,
+    OPUS_BITRATE,
+    RAW_INPUT_OPTIONS,
+    PCM_SAMPLE_WIDTH,
+    PROCESSING_BLOCK_DURATION
+)
+
+PCM_OPTIONS = ["-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", str(CHANNELS_COUNT)]
+
+OPUS_OPTIONS = [
+    "-ac", str(CHANNELS_COUNT),
+    "-ar", str(SAMPLE_RATE),
+    "-c:a", "libopus",
+    "-b:a", OPUS_BITRATE,
+    "-application", "voip",  # Профиль кодека, оптимизированный под речь
+    "-f", "ogg"
+]
+
+
+def _run_ffmpeg(input_options: list[str], output_options: list[str], data: bytes) -> bytes:
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        *input_options,
+        "-i", "pipe:0",  # Вход из stdin
+        "-vn",           # Игнорировать видео поток
+        *output_options,
+        "pipe:1"         # Вывод в stdout
+    ]
+    process = subprocess.run(ffmpeg_cmd, input=data, capture_output=True)
+    if process.returncode != 0:
+        error = process.stderr.decode("utf-8", errors="replace")
+        raise RuntimeError(f"FFmpeg error: {error}")
+    return process.stdout
+
+
+def _run_ffmpeg_files(input_options: list[str], input_path: str, output_options: list[str], output_path: str) -> None:
+    """Запускает ffmpeg с чтением и записью на диск, запись не проходит через память процесса"""
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        *input_options,
+        "-i", input_path,
+        "-vn",
+        *output_options,
+        "-y", output_path  # Файл создаётся заранее, поэтому перезаписывается
+    ]
+    process = subprocess.run(ffmpeg_cmd, stdin=subprocess.DEVNULL, capture_output=True)
+    if process.returncode != 0:
+        error = process.stderr.decode("utf-8", errors="replace")
+        raise RuntimeError(f"FFmpeg error: {error}")
+
+
+def normalize_audio_file(input_path: str, audio_format: str, output_path: str) -> None:
+    """Перекодирует аудио в Opus (ogg), моно, 16 кГц"""
+    _run_ffmpeg_files(RAW_INPUT_OPTIONS.get(audio_format, []), input_path, OPUS_OPTIONS, output_path)
+
+
+def decode_to_pcm(audio_data: bytes, audio_format: str) -> bytes:
+    """Декодирует аудио в PCM signed 16bit little-endian, моно, 16 кГц"""
+    return _run_ffmpeg(RAW_INPUT_OPTIONS.get(audio_format, []), PCM_OPTIONS, audio_data)
+
+
+def decode_file_to_pcm(input_path: str, audio_format: str, output_path: str) -> None:
+    """Декодирует аудио из файла в файл PCM signed 16bit little-endian, моно, 16 кГц"""
+    _run_ffmpeg_files(RAW_INPUT_OPTIONS.get(audio_format, []), input_path, PCM_OPTIONS, output_path)
+
+
+def encode_pcm_to_opus(pcm_data: bytes) -> bytes:
+    return _run_ffmpeg(PCM_OPTIONS, OPUS_OPTIONS, pcm_data)
+
+
+def encode_pcm_ranges_to_opus(pcm_path: str, ranges: list[tuple[int, int]], output_path: str) -> None:
+    """Кодирует в Opus отрезки [start, end) файла PCM (в отсчётах), склеивая их подряд.
+    Отрезки передаются в ffmpeg блоками, поэтому память не зависит от длины записи.
+    """
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-loglevel", "error",
+        *PCM_OPTIONS,
+        "-i", "pipe:0",
+        *OPUS_OPTIONS,
+        "-y", output_path
+    ]
+    process = subprocess.Popen(
+        ffmpeg_cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE
+    )
+    block_size = int(PROCESSING_BLOCK_DURATION * SAMPLE_RATE) * PCM_SAMPLE_WIDTH
+    try:
+        with open(pcm_path, "rb") as pcm_file:
+            for start, end in ranges:
+                pcm_file.seek(start * PCM_SAMPLE_WIDTH)
+                remaining = (end - start) * PCM_SAMPLE_WIDTH
+                while remaining > 0 and (block := pcm_file.read(min(block_size, remaining))):
+                    process.stdin.write(block)
+                    remaining -= len(block)
+        process.stdin.close()
+    except BrokenPipeError:
+        # ffmpeg завершился раньше, ошибка будет в коде возврата
+        pass
+    error = process.stderr.read()
+    if process.wait() != 0:
+        raise RuntimeError(f"FFmpeg error: {error.decode('utf-8', errors='replace')}")
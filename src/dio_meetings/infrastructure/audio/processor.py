@@ -0,0 +1,121 @@
+from typing import Optional
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
+
+import os
+import time
+import asyncio
+import logging
+import tempfile
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from .ffmpeg import normalize_audio_file
+from .vad import trim_silence
+from .segmentation import split_on_silence, encode_chunk, get_speaker_profiles
+from .constants import SAMPLE_RATE, VAD_TOP_DB, VAD_MIN_SILENCE
+
+from ...core.base import AudioProcessor
+from ...core.domain import OffsetMap, SpeechSegment, AudioChunk
+from ...constants import PREPARED_AUDIO_FORMAT
+from ...utils import save_to_temp_file, iter_file
+
+
+class FFmpegAudioProcessor(AudioProcessor):
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            vad_enabled: bool = True,
+            vad_top_db: float = VAD_TOP_DB,
+            vad_min_silence: float = VAD_MIN_SILENCE
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._executor = ProcessPoolExecutor(max_workers=max_workers)
+        self._vad_enabled = vad_enabled
+        self._vad_top_db = vad_top_db
+        self._vad_min_silence = vad_min_silence
+
+    @asynccontextmanager
+    async def prepare_stream(
+            self,
+            audio_stream: AsyncIterable[bytes],
+            audio_format: str
+    ) -> AsyncIterator[tuple[AsyncIterator[bytes], OffsetMap]]:
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = await save_to_temp_file(audio_stream, directory=directory)
+            output_path = os.path.join(directory, f"prepared.{PREPARED_AUDIO_FORMAT}")
+            if self._vad_enabled:
+                segments, removed_duration = await loop.run_in_executor(
+                    self._executor,
+                    partial(
+                        trim_silence,
+                        input_path,
+                        audio_format,
+                        output_path,
+                        top_db=self._vad_top_db,
+                        min_silence=self._vad_min_silence
+                    )
+                )
+                offset_map = OffsetMap(
+                    segments=[
+                        SpeechSegment(start=start, end=end, original_start=original_start)
+                        for start, end, original_start in segments
+                    ],
+                    removed_duration=round(removed_duration, 3)
+                )
+            else:
+                await loop.run_in_executor(
+                    self._executor,
+                    partial(normalize_audio_file, input_path, audio_format, output_path)
+                )
+                offset_map = OffsetMap()
+            self._logger.info(
+                "Audio prepared: %d -> %d bytes, %.1fs of silence removed in %.2fs",
+                os.path.getsize(input_path),
+                os.path.getsize(output_path),
+                offset_map.removed_duration,
+                time.perf_counter() - started_at
+            )
+            yield iter_file(output_path), offset_map
+
+    @asynccontextmanager
+    async def split_stream(
+            self,
+            audio_stream: AsyncIterable[bytes],
+            audio_format: str,
+            chunk_duration: float
+    ) -> AsyncIterator[AsyncIterator[AudioChunk]]:
+        loop = asyncio.get_running_loop()
+        with tempfile.TemporaryDirectory() as directory:
+            input_path = await save_to_temp_file(audio_stream, directory=directory)
+            pcm_path = os.path.join(directory, "audio.pcm")
+            bounds = await loop.run_in_executor(
+                self._executor,
+                partial(split_on_silence, input_path, audio_format, pcm_path, chunk_duration)
+            )
+            os.remove(input_path)
+            yield self._encode_chunks(pcm_path, bounds)
+
+    async def _encode_chunks(self, pcm_path: str, bounds: list[tuple[int, int]]) -> AsyncIterator[AudioChunk]:
+        """Кодирует фрагменты по одному по мере чтения, в памяти не держатся все фрагменты сразу"""
+        loop = asyncio.get_running_loop()
+        for start, end in bounds:
+            data = await loop.run_in_executor(self._executor, partial(encode_chunk, pcm_path, start, end))
+            yield AudioChunk(data=data, offset=start / SAMPLE_RATE)
+
+    async def get_speaker_profiles(
+            self,
+            audio_data: bytes,
+            audio_format: str,
+            utterances: list[tuple[int, float, float]]
+    ) -> dict[int, list[float]]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            partial(get_speaker_profiles, audio_data, audio_format, utterances)
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
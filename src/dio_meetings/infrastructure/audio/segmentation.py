@@ -0,0 +1,89 @@
+from functools import partial
+
+import numpy as np
+import librosa
+
+from .vad import detect_speech, read_pcm_file, get_pcm_length, SampleReader, PCM_MAX_VALUE
+from .ffmpeg import decode_to_pcm, decode_file_to_pcm, encode_pcm_to_opus
+from .constants import (
+    SAMPLE_RATE,
+    PCM_SAMPLE_WIDTH,
+    SPLIT_SEARCH_WINDOW,
+    SPLIT_MIN_SILENCE,
+    MFCC_COUNT,
+    SPEAKER_PROFILE_MAX_DURATION
+)
+
+
+def _find_cut_points(read: SampleReader, length: int, chunk_duration: float) -> list[int]:
+    """Подбирает точки разреза в серединах пауз, ближайших к границам фрагментов"""
+    # Резать можно только в тишине, поэтому музыка и тоны здесь паузами не считаются
+    speech = detect_speech(read, length, min_silence=SPLIT_MIN_SILENCE, padding=0.0, skip_non_speech=False)
+    pauses = [(end + next_start) // 2 for (_, end), (next_start, _) in zip(speech, speech[1:])]
+    chunk_samples = int(chunk_duration * SAMPLE_RATE)
+    window_samples = int(SPLIT_SEARCH_WINDOW * SAMPLE_RATE)
+    cut_points: list[int] = []
+    position = 0
+    while length - position > chunk_samples + window_samples:
+        target = position + chunk_samples
+        candidates = [pause for pause in pauses if abs(pause - target) <= window_samples]
+        cut = min(candidates, key=lambda pause: abs(pause - target)) if candidates else target
+        cut_points.append(cut)
+        position = cut
+    return cut_points
+
+
+def split_on_silence(
+        input_path: str,
+        audio_format: str,
+        pcm_path: str,
+        chunk_duration: float
+) -> list[tuple[int, int]]:
+    """Декодирует аудио в файл PCM и делит его на фрагменты по паузам.
+    Возвращает границы фрагментов в отсчётах, сами фрагменты кодируются по одному encode_chunk.
+    Выполняется в отдельном процессе, поэтому должна оставаться функцией модуля.
+    """
+    decode_file_to_pcm(input_path, audio_format, pcm_path)
+    length = get_pcm_length(pcm_path)
+    cut_points = _find_cut_points(partial(read_pcm_file, pcm_path), length, chunk_duration)
+    bounds = [0, *cut_points, length]
+    return list(zip(bounds, bounds[1:]))
+
+
+def encode_chunk(pcm_path: str, start: int, end: int) -> bytes:
+    """Кодирует в Opus отрезок [start, end) файла PCM.
+    Выполняется в отдельном процессе, поэтому должна оставаться функцией модуля.
+    """
+    with open(pcm_path, "rb") as pcm_file:
+        pcm_file.seek(start * PCM_SAMPLE_WIDTH)
+        pcm_data = pcm_file.read((end - start) * PCM_SAMPLE_WIDTH)
+    return encode_pcm_to_opus(pcm_data)
+
+
+def get_speaker_profiles(
+        audio_data: bytes,
+        audio_format: str,
+        utterances: list[tuple[int, float, float]]
+) -> dict[int, list[float]]:
+    """Строит профиль голоса каждого спикера как средний вектор MFCC по его фразам.
+    Выполняется в отдельном процессе, поэтому должна оставаться функцией модуля.
+    """
+    samples = np.frombuffer(decode_to_pcm(audio_data, audio_format), dtype=np.int16)
+    samples = samples.astype(np.float32) / PCM_MAX_VALUE
+    max_samples = int(SPEAKER_PROFILE_MAX_DURATION * SAMPLE_RATE)
+    speaker_samples: dict[int, list[np.ndarray]] = {}
+    speaker_lengths: dict[int, int] = {}
+    for speaker_id, start, end in utterances:
+        if speaker_lengths.get(speaker_id, 0) >= max_samples:
+            continue
+        fragment = samples[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)]
+        if not len(fragment):
+            continue
+        speaker_samples.setdefault(speaker_id, []).append(fragment)
+        speaker_lengths[speaker_id] = speaker_lengths.get(speaker_id, 0) + len(fragment)
+    profiles: dict[int, list[float]] = {}
+    for speaker_id, fragments in speaker_samples.items():
+        mfcc = librosa.feature.mfcc(y=np.concatenate(fragments), sr=SAMPLE_RATE, n_mfcc=MFCC_COUNT)
+        # Нулевой коэффициент отражает громкость, а не голос
+        profiles[speaker_id] = mfcc[1:].mean(axis=1).tolist()
+    return profiles
@@ -0,0 +1,229 @@
+from typing import Optional
+from collections.abc import Callable
+from functools import partial
+
+import os
+import tempfile
+
+import numpy as np
+import librosa
+
+from .ffmpeg import decode_file_to_pcm, encode_pcm_ranges_to_opus
+from .constants import (
+    SAMPLE_RATE,
+    PCM_SAMPLE_WIDTH,
+    PROCESSING_BLOCK_DURATION,
+    VAD_TOP_DB,
+    VAD_MIN_SILENCE,
+    VAD_PADDING,
+    VAD_FRAME_LENGTH,
+    VAD_HOP_LENGTH,
+    VAD_SPEECH_WINDOW,
+    VAD_MIN_LOUDNESS_VARIATION,
+    VAD_MIN_SPECTRAL_CHANGE,
+    VAD_SILENCE_FLOOR,
+    MFCC_COUNT
+)
+
+PCM_MAX_VALUE = 32768.0
+
+# Отрезок речи: (начало в обрезанном аудио, конец в обрезанном аудио, начало в исходном аудио), сек
+Segment = tuple[float, float, float]
+
+# Возвращает отсчёты [start, end) в диапазоне [-1, 1]
+SampleReader = Callable[[int, int], np.ndarray]
+
+
+def read_pcm_file(path: str, start: int, end: int) -> np.ndarray:
+    """Читает отсчёты [start, end) из файла PCM, не загружая запись в память целиком"""
+    pcm = np.fromfile(path, dtype=np.int16, count=max(end - start, 0), offset=start * PCM_SAMPLE_WIDTH)
+    return pcm.astype(np.float32) / PCM_MAX_VALUE
+
+
+def get_pcm_length(path: str) -> int:
+    return os.path.getsize(path) // PCM_SAMPLE_WIDTH
+
+
+def compute_frame_features(
+        read: SampleReader,
+        length: int,
+        sample_rate: int = SAMPLE_RATE,
+        spectral: bool = True
+) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """Считает по кадрам громкость (RMS) и смену тембра (средняя разница MFCC с предыдущим кадром).
+    Аудио читается блоками по PROCESSING_BLOCK_DURATION, кадры совпадают с центрированными
+    кадрами librosa, поэтому на память влияют только сами признаки, а не длина записи.
+    """
+    frames_count = 1 + length // VAD_HOP_LENGTH
+    block_frames = max(int(PROCESSING_BLOCK_DURATION * sample_rate) // VAD_HOP_LENGTH, 1)
+    half_frame = VAD_FRAME_LENGTH // 2
+    rms = np.empty(frames_count, dtype=np.float32)
+    spectral_change = np.zeros(frames_count, dtype=np.float32) if spectral else None
+    previous_mfcc: Optional[np.ndarray] = None
+    for first_frame in range(0, frames_count, block_frames):
+        last_frame = min(first_frame + block_frames, frames_count)
+        # Кадр i центрирован на отсчёте i * VAD_HOP_LENGTH, за краями записи - тишина
+        start = first_frame * VAD_HOP_LENGTH - half_frame
+        end = (last_frame - 1) * VAD_HOP_LENGTH + half_frame
+        block = read(max(start, 0), min(end, length))
+        block = np.pad(block, (max(-start, 0), end - start - len(block) - max(-start, 0)))
+        rms[first_frame:last_frame] = librosa.feature.rms(
+            y=block,
+            frame_length=VAD_FRAME_LENGTH,
+            hop_length=VAD_HOP_LENGTH,
+            center=False
+        )[0]
+        if spectral_change is None:
+            continue
+        # Первый коэффициент отражает громкость, тембр описывают остальные
+        mfcc = librosa.feature.mfcc(
+            y=block,
+            sr=sample_rate,
+            n_mfcc=MFCC_COUNT,
+            n_fft=VAD_FRAME_LENGTH,
+            hop_length=VAD_HOP_LENGTH,
+            center=False
+        )[1:]
+        previous = mfcc[:, :1] if previous_mfcc is None else previous_mfcc
+        spectral_change[first_frame:last_frame] = np.abs(np.diff(mfcc, axis=1, prepend=previous)).mean(axis=0)
+        previous_mfcc = mfcc[:, -1:]
+    return rms, spectral_change
+
+
+def detect_speech(
+        read: SampleReader,
+        length: int,
+        sample_rate: int = SAMPLE_RATE,
+        top_db: float = VAD_TOP_DB,
+        min_silence: float = VAD_MIN_SILENCE,
+        padding: float = VAD_PADDING,
+        skip_non_speech: bool = True
+) -> list[tuple[int, int]]:
+    """Возвращает интервалы речи в отсчётах, склеивая интервалы с паузами короче min_silence.
+    С skip_non_speech громкие участки, не похожие на речь (музыка ожидания, гудки, тоны),
+    тоже считаются паузами.
+    """
+    rms, spectral_change = compute_frame_features(read, length, sample_rate, spectral=skip_non_speech)
+    # Порог тишины считается от пика всей записи, как в librosa.effects.split
+    loudness = librosa.power_to_db(rms ** 2, ref=np.max, top_db=None)
+    intervals = frames_to_intervals(loudness > -top_db, length)
+    if spectral_change is not None:
+        intervals = intersect_intervals(intervals, find_speech_windows(rms, spectral_change, length, sample_rate))
+    padding_samples = int(padding * sample_rate)
+    min_silence_samples = int(min_silence * sample_rate)
+    speech: list[tuple[int, int]] = []
+    for start, end in intervals:
+        start = max(start - padding_samples, 0)
+        end = min(end + padding_samples, length)
+        if speech and start - speech[-1][1] < min_silence_samples:
+            speech[-1] = (speech[-1][0], end)
+        else:
+            speech.append((start, end))
+    return speech
+
+
+def frames_to_intervals(mask: np.ndarray, length: int) -> list[tuple[int, int]]:
+    """Переводит маску кадров в интервалы отсчётов подряд идущих отмеченных кадров"""
+    edges = np.flatnonzero(np.diff(mask.astype(np.int8))) + 1
+    if mask[0]:
+        edges = np.insert(edges, 0, 0)
+    if mask[-1]:
+        edges = np.append(edges, len(mask))
+    edges = np.minimum(edges * VAD_HOP_LENGTH, length)
+    return [(int(start), int(end)) for start, end in edges.reshape(-1, 2)]
+
+
+def find_speech_windows(
+        rms: np.ndarray,
+        spectral_change: np.ndarray,
+        length: int,
+        sample_rate: int = SAMPLE_RATE
+) -> list[tuple[int, int]]:
+    """Делит аудио на окна по VAD_SPEECH_WINDOW секунд и возвращает окна, похожие на речь.
+    У речи громкость заметно меняется от слога к слогу, а тембр - от звука к звуку.
+    Тон и гудки не меняют тембр, у музыки ожидания громкость ровная из-за компрессии.
+    Громкость считается относительно пика окна, поэтому тихий собеседник не отбрасывается.
+    """
+    window_frames = max(int(VAD_SPEECH_WINDOW * sample_rate) // VAD_HOP_LENGTH, 2)
+    speech: list[tuple[int, int]] = []
+    for first_frame in range(0, len(rms), window_frames):
+        last_frame = first_frame + window_frames
+        window_rms = rms[first_frame:last_frame]
+        loudness = np.maximum(librosa.amplitude_to_db(window_rms, ref=np.max(window_rms)), VAD_SILENCE_FLOOR)
+        # Смена тембра оценивается между соседними звучащими кадрами: в тишине тембра нет,
+        # а на границе звука и тишины меняется только громкость
+        is_sounding = loudness > VAD_SILENCE_FLOOR
+        is_sounding[1:] &= is_sounding[:-1]
+        window_change = spectral_change[first_frame:last_frame][is_sounding]
+        is_speech = (
+            len(window_change) > 0
+            and loudness.std() >= VAD_MIN_LOUDNESS_VARIATION
+            and window_change.mean() >= VAD_MIN_SPECTRAL_CHANGE
+        )
+        if not is_speech:
+            continue
+        start = first_frame * VAD_HOP_LENGTH
+        end = min(last_frame * VAD_HOP_LENGTH, length)
+        if speech and speech[-1][1] == start:
+            speech[-1] = (speech[-1][0], end)
+        else:
+            speech.append((start, end))
+    return speech
+
+
+def intersect_intervals(
+        first: list[tuple[int, int]],
+        second: list[tuple[int, int]]
+) -> list[tuple[int, int]]:
+    """Пересечение двух отсортированных списков непересекающихся интервалов"""
+    intersection: list[tuple[int, int]] = []
+    i = j = 0
+    while i < len(first) and j < len(second):
+        start = max(first[i][0], second[j][0])
+        end = min(first[i][1], second[j][1])
+        if start < end:
+            intersection.append((start, end))
+        if first[i][1] < second[j][1]:
+            i += 1
+        else:
+            j += 1
+    return intersection
+
+
+def trim_silence(
+        input_path: str,
+        audio_format: str,
+        output_path: str,
+        top_db: float = VAD_TOP_DB,
+        min_silence: float = VAD_MIN_SILENCE
+) -> tuple[list[Segment], float]:
+    """Нормализует аудио из input_path в output_path и вырезает паузы и участки без речи
+    длиннее min_silence. Декодированный PCM хранится во временном файле и читается блоками.
+    Выполняется в отдельном процессе, поэтому должна оставаться функцией модуля.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        pcm_path = os.path.join(directory, "audio.pcm")
+        decode_file_to_pcm(input_path, audio_format, pcm_path)
+        length = get_pcm_length(pcm_path)
+        if not length:
+            encode_pcm_ranges_to_opus(pcm_path, [], output_path)
+            return [], 0.0
+        speech = detect_speech(
+            partial(read_pcm_file, pcm_path),
+            length,
+            top_db=top_db,
+            min_silence=min_silence
+        ) or [(0, length)]
+        encode_pcm_ranges_to_opus(pcm_path, speech, output_path)
+    segments: list[Segment] = []
+    trimmed_position = 0
+    for start, end in speech:
+        duration = end - start
+        segments.append((
+            trimmed_position / SAMPLE_RATE,
+            (trimmed_position + duration) / SAMPLE_RATE,
+            start / SAMPLE_RATE
+        ))
+        trimmed_position += duration
+    removed_duration = (length - trimmed_position) / SAMPLE_RATE
+    return segments, removed_duration
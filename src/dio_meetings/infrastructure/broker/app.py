@@ -1,16 +1,40 @@
+import os
+import socket
+
 from faststream import FastStream
 from faststream.redis import RedisBroker
+from redis.asyncio import Redis
 
-from dishka.integrations.faststream import setup_dishka
-
-from .router import tasks_router
+from .router import create_tasks_router
+from .queue import TaskQueue
+from .worker import TaskWorker
+from .handlers import summarize_audio, fail_task
 
 from ...ioc import container
+from ...settings import Settings
+from ...constants import TASKS_STREAM, TASKS_GROUP
 
 
 async def create_faststream_app() -> FastStream:
+    config = await container.get(Settings)
     broker = await container.get(RedisBroker)
-    broker.include_router(tasks_router)
-    app = FastStream(broker)
-    setup_dishka(app=app, container=container, auto_inject=True)
-    return app
+    redis = await container.get(Redis)
+    task_worker = TaskWorker(
+        handler=summarize_audio,
+        failure_handler=fail_task,
+        container=container,
+        queue=TaskQueue(redis=redis, stream=TASKS_STREAM, group=TASKS_GROUP),
+        # Имя потребителя уникально для процесса, записи упавшего воркера перехватят остальные
+        consumer=f"{socket.gethostname()}-{os.getpid()}",
+        concurrency=config.worker.CONCURRENCY,
+        shutdown_timeout=config.worker.SHUTDOWN_TIMEOUT,
+        visibility_timeout=config.worker.VISIBILITY_TIMEOUT,
+        max_deliveries=config.worker.MAX_DELIVERIES
+    )
+    broker.include_router(create_tasks_router(task_worker))
+    return FastStream(
+        broker,
+        after_startup=[task_worker.start],
+        on_shutdown=[task_worker.close],
+        after_shutdown=[container.close]
+    )
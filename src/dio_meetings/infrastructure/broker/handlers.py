@@ -0,0 +1,110 @@
+from typing import Optional
+
+import logging
+
+from dishka import AsyncContainer
+
+from ...core.dto import Transcription
+from ...core.enums import TaskStatus
+from ...core.domain import Task, File, PreparedAudio, OffsetMap
+from ...core.services import (
+    FileService,
+    SummarizationService,
+    TaskService,
+    AudioPreparationService,
+    TranscriptService
+)
+from ...core.exceptions import (
+    SummarizationError,
+    AudioPreparationError,
+    RepositoryError,
+    FileStoreError
+)
+
+from ...constants import SPEAKERS_COUNT, AUDIO_BUCKET
+from ...templates import SUMMARY_TEMPLATE
+
+logger = logging.getLogger(__name__)
+
+
+async def summarize_audio(task: Task, container: AsyncContainer) -> None:
+    """Обрабатывает задачу, зависимости создаются в отдельной области запроса"""
+    file_service = await container.get(FileService)
+    audio_preparation_service = await container.get(AudioPreparationService)
+    summarization_service = await container.get(SummarizationService)
+    transcript_service = await container.get(TranscriptService)
+    task_service = await container.get(TaskService)
+    # Задача может быть доставлена повторно, например, если воркер упал до подтверждения
+    saved_task = await task_service.get_status(task.id)
+    if saved_task is None or saved_task.status in (TaskStatus.DONE, TaskStatus.ERROR):
+        logger.info(f"Task {task.id} is already finished or removed, skipped")
+        return
+    logger.info("Start summarize audio")
+    transcriptions: Optional[list[Transcription]] = None
+    try:
+        transcriptions = await transcript_service.get(task.file_id)
+    except (RepositoryError, FileStoreError):
+        logger.warning("Error while reading saved transcript, audio will be transcribed again")
+    if transcriptions is not None:
+        logger.info(f"Reused saved transcript with {len(transcriptions)} utterances")
+    else:
+        transcriptions = await transcribe_audio(
+            task,
+            file_service=file_service,
+            audio_preparation_service=audio_preparation_service,
+            summarization_service=summarization_service,
+            transcript_service=transcript_service
+        )
+    document: Optional[File] = None
+    if transcriptions is not None:
+        try:
+            document = await summarization_service.summarize(
+                transcriptions,
+                prompt_template=SUMMARY_TEMPLATE,
+                stream_id=task.id
+            )
+        except SummarizationError:
+            logger.error("Error while summarize audio")
+    await task_service.update_status(task_id=task.id, document=document)
+    logger.info("Finished summarizing audio")
+
+
+async def fail_task(task: Task, container: AsyncContainer) -> None:
+    """Завершает с ошибкой задачу, которую не удалось выполнить за все попытки"""
+    task_service = await container.get(TaskService)
+    saved_task = await task_service.get_status(task.id)
+    if saved_task is None or saved_task.status in (TaskStatus.DONE, TaskStatus.ERROR):
+        return
+    await task_service.update_status(task_id=task.id, document=None)
+
+
+async def transcribe_audio(
+        task: Task,
+        file_service: FileService,
+        audio_preparation_service: AudioPreparationService,
+        summarization_service: SummarizationService,
+        transcript_service: TranscriptService
+) -> Optional[list[Transcription]]:
+    try:
+        prepared_audio = await audio_preparation_service.prepare(task.file_id, bucket=AUDIO_BUCKET)
+    except AudioPreparationError:
+        logger.warning("Error while preparing audio, original file will be transcribed")
+        prepared_audio = PreparedAudio(
+            file=await file_service.download_stream(task.file_id, bucket=AUDIO_BUCKET),
+            offset_map=OffsetMap()
+        )
+    logger.info(f"Removed {prepared_audio.offset_map.removed_duration} seconds of silence")
+    try:
+        transcriptions = await summarization_service.transcribe(
+            audio=prepared_audio.file,
+            speakers_count=SPEAKERS_COUNT,
+            offset_map=prepared_audio.offset_map
+        )
+    except SummarizationError:
+        logger.error("Error while transcribing audio")
+        return None
+    try:
+        await transcript_service.save(task.file_id, transcriptions)
+    except (RepositoryError, FileStoreError):
+        logger.warning("Error while saving transcript")
+    return transcriptions
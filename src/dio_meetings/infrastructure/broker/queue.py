@@ -0,0 +1,100 @@
+from typing import Optional, Union
+
+import logging
+
+from pydantic import BaseModel, ValidationError
+from redis.asyncio import Redis
+from faststream.redis.parser import RawMessage
+
+from ...core.domain import Task
+
+DATA_KEY = b"__data__"  # Поле записи потока, в которое FastStream кладёт сообщение
+
+
+class PendingTask(BaseModel):
+    message_id: str         # ID записи в потоке
+    task: Optional[Task]    # Задача, None - запись повреждена или удалена
+    deliveries: int         # Сколько раз запись уже выдавалась воркерам
+
+
+class TaskQueue:
+    """Операции над группой потребителей потока задач, которых нет в FastStream:
+    подтверждение, продление и перехват зависших записей.
+    """
+    def __init__(self, redis: Redis, stream: str, group: str) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._redis = redis
+        self._stream = stream
+        self._group = group
+
+    async def ack(self, message_id: str) -> None:
+        await self._redis.xack(self._stream, self._group, message_id)
+
+    async def touch(self, consumer: str, message_ids: list[str]) -> None:
+        """Сбрасывает время простоя записей, чтобы их не перехватили, пока задача выполняется"""
+        await self._redis.xclaim(
+            self._stream,
+            self._group,
+            consumer,
+            min_idle_time=0,
+            message_ids=message_ids,
+            justid=True
+        )
+
+    async def reclaim(self, consumer: str, min_idle_time: float, count: int) -> list[PendingTask]:
+        """Забирает записи, которые не подтверждались дольше min_idle_time секунд,
+        например, потому что обрабатывавший их воркер остановился.
+        """
+        min_idle_time_ms = int(min_idle_time * 1000)
+        pending = await self._redis.xpending_range(
+            self._stream,
+            self._group,
+            min="-",
+            max="+",
+            count=count,
+            idle=min_idle_time_ms
+        )
+        if not pending:
+            return []
+        deliveries = {
+            self._decode(entry["message_id"]): entry["times_delivered"]
+            for entry in pending
+        }
+        claimed = await self._redis.xclaim(
+            self._stream,
+            self._group,
+            consumer,
+            min_idle_time=min_idle_time_ms,
+            message_ids=list(deliveries)
+        )
+        return [
+            PendingTask(
+                message_id=self._decode(message_id),
+                task=self._parse(fields),
+                deliveries=deliveries.get(self._decode(message_id), 0)
+            )
+            for message_id, fields in claimed
+        ]
+
+    async def remove_idle_consumers(self, idle_time: float) -> int:
+        """Удаляет из группы потребителей без записей, которые давно не читали поток"""
+        removed_count = 0
+        for consumer in await self._redis.xinfo_consumers(self._stream, self._group):
+            if consumer["pending"] == 0 and consumer["idle"] > idle_time * 1000:
+                await self._redis.xgroup_delconsumer(self._stream, self._group, consumer["name"])
+                removed_count += 1
+        return removed_count
+
+    def _parse(self, fields: Optional[dict[bytes, bytes]]) -> Optional[Task]:
+        if not fields or DATA_KEY not in fields:
+            return None
+        try:
+            body, _ = RawMessage.parse(fields[DATA_KEY])
+            return Task.model_validate_json(body)
+        except (ValueError, ValidationError) as e:
+            self._logger.error("Error while parsing task message: %s", e)
+            return None
+
+    @staticmethod
+    def _decode(value: Union[bytes, str]) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
@@ -1,38 +1,29 @@
-from typing import Optional
+from faststream.redis import RedisRouter, StreamSub
+from faststream.redis.annotations import RedisMessage
 
-from faststream import Logger
-from faststream.redis import RedisRouter
+from .worker import TaskWorker
 
-from dishka.integrations.base import FromDishka as Depends
+from ...core.domain import Task
+from ...constants import TASKS_STREAM, TASKS_GROUP
 
-from ...core.domain import Task, File
-from ...core.services import FileService, SummarizationService, TaskService
-from ...core.exceptions import SummarizationError
 
-from ...constants import SPEAKERS_COUNT, AUDIO_BUCKET
-from ...templates import SUMMARY_TEMPLATE
+def create_tasks_router(task_worker: TaskWorker) -> RedisRouter:
+    tasks_router = RedisRouter()
 
-tasks_router = RedisRouter()
+    # Записи читаются по одной и подтверждаются воркером только после обработки задачи,
+    # группа создаётся с начала потока, чтобы не потерять задачи, опубликованные до запуска воркеров
+    @tasks_router.subscriber(
+        stream=StreamSub(
+            TASKS_STREAM,
+            group=TASKS_GROUP,
+            consumer=task_worker.consumer,
+            last_id="0",
+            max_records=1
+        ),
+        no_ack=True
+    )
+    async def receive_task(task: Task, message: RedisMessage) -> None:
+        message_id, = message.raw_message["message_ids"]
+        await task_worker.submit(task, message_id.decode("utf-8"))
 
-
-@tasks_router.subscriber("tasks")
-async def summarize_audio(
-        task: Task,
-        file_service: Depends[FileService],
-        summarization_service: Depends[SummarizationService],
-        task_service: Depends[TaskService],
-        logger: Logger
-) -> None:
-    logger.info("Start summarize audio")
-    downloaded_file = await file_service.download(task.file_id, bucket=AUDIO_BUCKET)
-    document: Optional[File] = None
-    try:
-        document = await summarization_service.summarize(
-            audio=downloaded_file,
-            speakers_count=SPEAKERS_COUNT,
-            prompt_template=SUMMARY_TEMPLATE
-        )
-    except SummarizationError:
-        logger.error("Error while summarize audio")
-    await task_service.update_status(task_id=task.id, document=document)
-    logger.info("Finished summarizing audio")
+    return tasks_router
@@ -0,0 +1,152 @@
+from typing import Optional
+from collections.abc import Awaitable, Callable
+
+import time
+import asyncio
+import logging
+
+from dishka import AsyncContainer
+from redis.exceptions import RedisError
+
+from .queue import TaskQueue
+
+from ...core.domain import Task
+from ...constants import (
+    TASK_HEARTBEAT_INTERVAL,
+    TASK_RECLAIM_INTERVAL,
+    TASK_VISIBILITY_TIMEOUT,
+    TASK_MAX_DELIVERIES,
+    TASK_CONSUMER_TTL
+)
+
+TaskHandler = Callable[[Task, AsyncContainer], Awaitable[None]]
+
+
+class TaskWorker:
+    """Выполняет задачи конкурентно, не больше concurrency одновременно.
+    Пока все слоты заняты, приём следующей задачи из брокера ожидает.
+    Запись потока подтверждается только после обработки задачи, до этого она периодически
+    продлевается. Записи, которые не продлевались дольше visibility_timeout, например,
+    из-за падения воркера, перехватываются и выполняются повторно, после max_deliveries
+    попыток задача передаётся в failure_handler.
+    """
+    def __init__(
+            self,
+            handler: TaskHandler,
+            failure_handler: TaskHandler,
+            container: AsyncContainer,
+            queue: TaskQueue,
+            consumer: str,
+            concurrency: int = 1,
+            shutdown_timeout: float = 60,
+            visibility_timeout: float = TASK_VISIBILITY_TIMEOUT,
+            max_deliveries: int = TASK_MAX_DELIVERIES
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._handler = handler
+        self._failure_handler = failure_handler
+        self._container = container
+        self._queue = queue
+        self._consumer = consumer
+        self._concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._shutdown_timeout = shutdown_timeout
+        self._visibility_timeout = visibility_timeout
+        self._max_deliveries = max_deliveries
+        self._jobs: set[asyncio.Task[None]] = set()
+        self._in_flight: set[str] = set()  # Полученные, но ещё не подтверждённые записи
+        self._maintenance: list[asyncio.Task[None]] = []
+
+    @property
+    def consumer(self) -> str:
+        return self._consumer
+
+    async def start(self) -> None:
+        self._maintenance = [
+            asyncio.create_task(self._heartbeat()),
+            asyncio.create_task(self._reclaim())
+        ]
+
+    async def submit(self, task: Task, message_id: str) -> None:
+        # Запись продлевается и пока ожидает свободного слота
+        self._in_flight.add(message_id)
+        await self._semaphore.acquire()
+        job = asyncio.create_task(self._run(task, message_id))
+        self._jobs.add(job)
+        job.add_done_callback(self._jobs.discard)
+
+    async def _run(self, task: Task, message_id: str) -> None:
+        started_at = time.perf_counter()
+        try:
+            async with self._container() as request_container:
+                await self._handler(task, request_container)
+            await self._queue.ack(message_id)
+            self._logger.info("Task %s processed in %.2fs", task.id, time.perf_counter() - started_at)
+        except Exception as e:
+            # Запись остаётся неподтверждённой и будет выполнена повторно
+            self._logger.exception("Error while processing task %s: %s", task.id, e)
+        finally:
+            self._in_flight.discard(message_id)
+            self._semaphore.release()
+
+    async def close(self) -> None:
+        """Дожидается выполняемых задач, по истечении shutdown_timeout отменяет их.
+        Записи отменённых задач не подтверждаются и будут перехвачены другими воркерами.
+        """
+        for maintenance_task in self._maintenance:
+            maintenance_task.cancel()
+        await asyncio.gather(*self._maintenance, return_exceptions=True)
+        if not self._jobs:
+            return
+        self._logger.info("Waiting for %d running tasks", len(self._jobs))
+        _, pending = await asyncio.wait(self._jobs, timeout=self._shutdown_timeout)
+        for job in pending:
+            job.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(TASK_HEARTBEAT_INTERVAL)
+            if not self._in_flight:
+                continue
+            try:
+                await self._queue.touch(self._consumer, list(self._in_flight))
+            except RedisError as e:
+                self._logger.warning("Error while extending running tasks: %s", e)
+
+    async def _reclaim(self) -> None:
+        while True:
+            await asyncio.sleep(TASK_RECLAIM_INTERVAL)
+            # Перехватывается не больше задач, чем есть свободных слотов
+            free_slots = self._concurrency - len(self._in_flight)
+            try:
+                if free_slots > 0:
+                    pending_tasks = await self._queue.reclaim(
+                        consumer=self._consumer,
+                        min_idle_time=self._visibility_timeout,
+                        count=free_slots
+                    )
+                    for pending_task in pending_tasks:
+                        await self._resubmit(pending_task.message_id, pending_task.task, pending_task.deliveries)
+                await self._queue.remove_idle_consumers(idle_time=TASK_CONSUMER_TTL)
+            except RedisError as e:
+                self._logger.warning("Error while reclaiming abandoned tasks: %s", e)
+
+    async def _resubmit(self, message_id: str, task: Optional[Task], deliveries: int) -> None:
+        if task is None:
+            self._logger.error("Dropped unreadable task message %s", message_id)
+            await self._queue.ack(message_id)
+            return
+        if deliveries >= self._max_deliveries:
+            self._logger.error("Task %s failed after %d deliveries", task.id, deliveries)
+            try:
+                async with self._container() as request_container:
+                    await self._failure_handler(task, request_container)
+            except Exception as e:
+                # Запись остаётся за воркером и будет обработана при следующей проверке
+                self._logger.exception("Error while failing task %s: %s", task.id, e)
+                return
+            await self._queue.ack(message_id)
+            return
+        self._logger.warning("Reclaimed abandoned task %s, delivery %d", task.id, deliveries + 1)
+        await self.submit(task, message_id)
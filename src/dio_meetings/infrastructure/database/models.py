@@ -1,9 +1,9 @@
 from uuid import UUID
 from datetime import datetime
 
-from sqlalchemy import CheckConstraint, DateTime
+from sqlalchemy import CheckConstraint, DateTime, String, ForeignKey, UniqueConstraint, BigInteger
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 
 from .base import Base
 
@@ -18,6 +18,7 @@ class FileMetadataOrm(Base):
     format: Mapped[str]
     type: Mapped[str]
     uploaded_date: Mapped[datetime] = mapped_column(DateTime)
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, unique=True)
 
 
 class TaskOrm(Base):
@@ -26,7 +27,48 @@ class TaskOrm(Base):
     file_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True))
     status: Mapped[str]
     result_id: Mapped[UUID | None] = mapped_column(PG_UUID(as_uuid=True), nullable=True)
+    estimate: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
 
     __table_args__ = (
         CheckConstraint("status IN ('NEW', 'RUNNING', 'DONE', 'ERROR')", "check_status"),
     )
+
+
+class TranscriptOrm(Base):
+    __tablename__ = "transcripts"
+
+    file_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("file_metadata.id", ondelete="CASCADE"),
+        unique=True
+    )
+    key: Mapped[str]
+    bucket: Mapped[str]
+    utterances_count: Mapped[int]
+    duration: Mapped[float]
+    size: Mapped[int] = mapped_column(BigInteger)
+
+
+class UploadSessionOrm(Base):
+    __tablename__ = "upload_sessions"
+
+    file_name: Mapped[str]
+    key: Mapped[str]
+    bucket: Mapped[str]
+    upload_id: Mapped[str]
+
+
+class UploadPartOrm(Base):
+    __tablename__ = "upload_parts"
+
+    session_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("upload_sessions.id", ondelete="CASCADE")
+    )
+    part_number: Mapped[int]
+    etag: Mapped[str]
+    size: Mapped[int] = mapped_column(BigInteger)
+
+    __table_args__ = (
+        UniqueConstraint("session_id", "part_number", name="uq_upload_parts_session_part"),
+    )
@@ -1,7 +1,11 @@
 __all__ = (
     "SQLTaskRepository",
-    "SQLFileMetadataRepository"
+    "SQLFileMetadataRepository",
+    "SQLUploadSessionRepository",
+    "SQLTranscriptRepository"
 )
 
 from .task import SQLTaskRepository
 from .file_metadata import SQLFileMetadataRepository
+from .upload_session import SQLUploadSessionRepository
+from .transcript import SQLTranscriptRepository
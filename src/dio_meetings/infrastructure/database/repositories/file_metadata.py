@@ -134,6 +134,8 @@ class SQLFileMetadataRepository(FileMetadataRepository):
                     )
                 )
                 .where(FileMetadataOrm.type == FileType.DOCUMENT)
+                .order_by(TaskOrm.updated_at.desc())
+                .limit(1)
             )
             result = await self.session.execute(stmt)
             file_metadata = result.scalar_one_or_none()
@@ -142,6 +144,19 @@ class SQLFileMetadataRepository(FileMetadataRepository):
             await self.session.rollback()
             raise ReadingError(f"Error while receiving result: {e}") from e
 
+    async def get_by_hash(self, sha256: str) -> Optional[FileMetadata]:
+        try:
+            stmt = (
+                select(FileMetadataOrm)
+                .where(FileMetadataOrm.sha256 == sha256)
+            )
+            result = await self.session.execute(stmt)
+            file_metadata = result.scalar_one_or_none()
+            return FileMetadata.model_validate(file_metadata) if file_metadata else None
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ReadingError(f"Error while reading file by hash: {e}") from e
+
     async def count(self, bucket: Optional[str] = None) -> int:
         try:
             stmt = (
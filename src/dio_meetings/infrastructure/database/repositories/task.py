@@ -26,7 +26,7 @@ class SQLTaskRepository(CRUDRepository[Task]):
         try:
             stmt = (
                 insert(TaskOrm)
-                .values(**task.model_dump(exclude_none=True))
+                .values(**task.model_dump(exclude_none=True, exclude={"eta"}))
                 .returning(TaskOrm)
             )
             result = await self.session.execute(stmt)
@@ -0,0 +1,72 @@
+from typing import Optional
+
+from uuid import UUID
+
+from sqlalchemy import insert, select, delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import TranscriptOrm
+
+from src.dio_meetings.core.domain import Transcript
+from src.dio_meetings.core.base import TranscriptRepository
+from src.dio_meetings.core.exceptions import CreationError, ReadingError, DeletingError
+
+
+class SQLTranscriptRepository(TranscriptRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def create(self, transcript: Transcript) -> Transcript:
+        try:
+            stmt = (
+                insert(TranscriptOrm)
+                .values(**transcript.model_dump(exclude_none=True))
+                .returning(TranscriptOrm)
+            )
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            created_transcript = result.scalar_one()
+            return Transcript.model_validate(created_transcript)
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise CreationError(f"Error while creating transcript: {e}") from e
+
+    async def read(self, id: UUID) -> Optional[Transcript]:
+        try:
+            stmt = (
+                select(TranscriptOrm)
+                .where(TranscriptOrm.id == id)
+            )
+            result = await self.session.execute(stmt)
+            transcript = result.scalar_one_or_none()
+            return Transcript.model_validate(transcript) if transcript else None
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ReadingError(f"Error while reading transcript: {e}") from e
+
+    async def delete(self, id: UUID) -> bool:
+        try:
+            stmt = (
+                delete(TranscriptOrm)
+                .where(TranscriptOrm.id == id)
+            )
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            return result.rowcount > 0
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DeletingError(f"Error while deleting transcript: {e}") from e
+
+    async def get_by_file_id(self, file_id: UUID) -> Optional[Transcript]:
+        try:
+            stmt = (
+                select(TranscriptOrm)
+                .where(TranscriptOrm.file_id == file_id)
+            )
+            result = await self.session.execute(stmt)
+            transcript = result.scalar_one_or_none()
+            return Transcript.model_validate(transcript) if transcript else None
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ReadingError(f"Error while reading transcript by file: {e}") from e
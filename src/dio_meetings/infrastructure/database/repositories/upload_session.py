@@ -0,0 +1,113 @@
+from typing import Optional
+
+from uuid import UUID
+from datetime import timedelta
+
+from sqlalchemy import insert, select, update, delete, func
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from ..models import UploadSessionOrm, UploadPartOrm
+
+from src.dio_meetings.core.domain import UploadSession, UploadPart
+from src.dio_meetings.core.base import UploadSessionRepository
+from src.dio_meetings.core.exceptions import CreationError, ReadingError, DeletingError
+
+
+class SQLUploadSessionRepository(UploadSessionRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def create(self, upload_session: UploadSession) -> UploadSession:
+        try:
+            stmt = (
+                insert(UploadSessionOrm)
+                .values(**upload_session.model_dump(exclude_none=True))
+                .returning(UploadSessionOrm)
+            )
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            created_upload_session = result.scalar_one()
+            return UploadSession.model_validate(created_upload_session)
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise CreationError(f"Error while creating upload session: {e}") from e
+
+    async def read(self, id: UUID) -> Optional[UploadSession]:
+        try:
+            stmt = (
+                select(UploadSessionOrm)
+                .where(UploadSessionOrm.id == id)
+            )
+            result = await self.session.execute(stmt)
+            upload_session = result.scalar_one_or_none()
+            return UploadSession.model_validate(upload_session) if upload_session else None
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ReadingError(f"Error while reading upload session: {e}") from e
+
+    async def delete(self, id: UUID) -> bool:
+        try:
+            stmt = (
+                delete(UploadSessionOrm)
+                .where(UploadSessionOrm.id == id)
+            )
+            result = await self.session.execute(stmt)
+            await self.session.commit()
+            return result.rowcount > 0
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DeletingError(f"Error while deleting upload session: {e}") from e
+
+    async def add_part(self, session_id: UUID, part: UploadPart) -> UploadPart:
+        try:
+            stmt = (
+                pg_insert(UploadPartOrm)
+                .values(session_id=session_id, **part.model_dump())
+                .on_conflict_do_update(
+                    constraint="uq_upload_parts_session_part",
+                    set_={"etag": part.etag, "size": part.size, "updated_at": func.now()}
+                )
+                .returning(UploadPartOrm)
+            )
+            result = await self.session.execute(stmt)
+            await self.session.execute(
+                update(UploadSessionOrm)
+                .where(UploadSessionOrm.id == session_id)
+                .values(updated_at=func.now())
+            )
+            await self.session.commit()
+            created_part = result.scalar_one()
+            return UploadPart.model_validate(created_part)
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise CreationError(f"Error while adding upload part: {e}") from e
+
+    async def get_parts(self, session_id: UUID) -> list[UploadPart]:
+        try:
+            stmt = (
+                select(UploadPartOrm)
+                .where(UploadPartOrm.session_id == session_id)
+                .order_by(UploadPartOrm.part_number)
+            )
+            results = await self.session.execute(stmt)
+            parts = results.scalars().all()
+            return [UploadPart.model_validate(part) for part in parts]
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ReadingError(f"Error while reading upload parts: {e}") from e
+
+    async def get_expired(self, ttl: timedelta) -> list[UploadSession]:
+        try:
+            # updated_at проставляется через now() базы данных, поэтому граница считается там же
+            stmt = (
+                select(UploadSessionOrm)
+                .where(UploadSessionOrm.updated_at < func.now() - ttl)
+            )
+            results = await self.session.execute(stmt)
+            upload_sessions = results.scalars().all()
+            return [UploadSession.model_validate(upload_session) for upload_session in upload_sessions]
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ReadingError(f"Error while reading expired upload sessions: {e}") from e
@@ -1,5 +1,5 @@
 __all__ = (
-    "MicrosoftWordFactory"
+    "MarkdownDocumentFactory"
 )
 
-from .microsoft_word import MicrosoftWordFactory
+from .factory import MarkdownDocumentFactory
@@ -0,0 +1,29 @@
+# Оформление протокола:
+PARAGRAPH_LINE = 50  # Длина горизонтальной линии, символов
+FONT_SIZE = 24  # Базовый размер шрифта, от него считаются размеры заголовков и текста
+HEADING_LEVELS = (1, 2, 3)
+TABLE_STYLE = "Table Grid"
+MAX_HEADING_LEVEL = 9  # Максимальный уровень заголовка в Word
+QUOTE_STYLE = "Quote"
+CODE_FONT = "Courier New"
+
+# Стили списков по уровню вложенности, глубже MAX_LIST_LEVEL используется последний:
+MAX_LIST_LEVEL = 3
+LIST_STYLES = {
+    "bullet": ("List Bullet", "List Bullet 2", "List Bullet 3"),
+    "ordered": ("List Number", "List Number 2", "List Number 3")
+}
+
+# Экспорт в HTML и PDF:
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+</head>
+<body>
+{body}</body>
+</html>
+"""
+DEFAULT_TITLE = "Протокол совещания"
+LIBREOFFICE_TIMEOUT = 120  # Максимальное время конвертации в PDF, сек
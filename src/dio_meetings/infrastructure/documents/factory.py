@@ -0,0 +1,48 @@
+from typing import Optional
+
+import time
+import asyncio
+import logging
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+
+from .rendering import RENDERERS, load_template, render
+
+from ...core.domain import File
+from ...core.base import DocumentFactory
+from ...utils import generate_file_name
+
+
+class MarkdownDocumentFactory(DocumentFactory):
+    """Собирает документы из markdown протокола в пуле процессов, не блокируя event loop.
+    Каждый DOCX создаётся из шаблона заново, поэтому фабрику можно использовать
+    из нескольких задач одновременно.
+    """
+    def __init__(self, max_workers: Optional[int] = None, template_path: Optional[str] = None) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=load_template,
+            initargs=(template_path,)
+        )
+
+    @property
+    def formats(self) -> list[str]:
+        return list(RENDERERS)
+
+    async def create_document(self, text: str, format: str) -> File:
+        if format not in RENDERERS:
+            raise ValueError(f"Unsupported document format: {format}")
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        data = await loop.run_in_executor(self._executor, partial(render, text, format))
+        self._logger.info(
+            "Document rendered to %s: %d bytes in %.2fs",
+            format,
+            len(data),
+            time.perf_counter() - started_at
+        )
+        return File(data=data, file_name=generate_file_name(format))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,28 @@
+import tempfile
+import subprocess
+from pathlib import Path
+
+from .constants import LIBREOFFICE_TIMEOUT
+
+
+def convert_docx_to_pdf(docx_data: bytes) -> bytes:
+    """Конвертирует DOCX в PDF с помощью LibreOffice без графического интерфейса"""
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "document.docx"
+        source.write_bytes(docx_data)
+        libreoffice_cmd = [
+            "soffice",
+            "--headless",
+            "--norestore",
+            # Отдельный профиль, чтобы параллельные процессы не блокировали друг друга
+            f"-env:UserInstallation=file://{directory}/profile",
+            "--convert-to", "pdf",
+            "--outdir", directory,
+            str(source)
+        ]
+        process = subprocess.run(libreoffice_cmd, capture_output=True, timeout=LIBREOFFICE_TIMEOUT)
+        target = source.with_suffix(".pdf")
+        if process.returncode != 0 or not target.exists():
+            error = process.stderr.decode("utf-8", errors="replace")
+            raise RuntimeError(f"LibreOffice error: {error}")
+        return target.read_bytes()
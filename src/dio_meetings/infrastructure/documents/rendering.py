@@ -0,0 +1,230 @@
+from typing import Optional
+
+import io
+import html
+from pathlib import Path
+
+from markdown_it import MarkdownIt
+from markdown_it.token import Token
+
+from docx.shared import Pt
+from docx import Document as WordDocument
+from docx.document import Document
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+from .libreoffice import convert_docx_to_pdf
+from .constants import (
+    HTML_TEMPLATE,
+    DEFAULT_TITLE,
+    PARAGRAPH_LINE,
+    FONT_SIZE,
+    HEADING_LEVELS,
+    MAX_HEADING_LEVEL,
+    MAX_LIST_LEVEL,
+    TABLE_STYLE,
+    QUOTE_STYLE,
+    CODE_FONT,
+    LIST_STYLES
+)
+
+# Сырой HTML из ответа LLM не переносится в документ, он выводится как текст
+MARKDOWN = MarkdownIt("commonmark", {"html": False}).enable(["table", "strikethrough"])
+
+# Шаблон документа со стилями, загружается один раз в каждом процессе
+_template: Optional[bytes] = None
+
+
+def create_template() -> bytes:
+    """Создаёт шаблон документа со стилями протокола"""
+    document = WordDocument()
+    for level in HEADING_LEVELS:
+        document.styles[f"Heading {level}"].font.size = Pt(FONT_SIZE - level * 2)
+    document.styles["Normal"].font.size = Pt(FONT_SIZE // 2)
+    file_buffer = io.BytesIO()
+    document.save(file_buffer)
+    return file_buffer.getvalue()
+
+
+def load_template(template_path: Optional[str] = None) -> None:
+    """Загружает шаблон документа, вызывается при запуске процесса пула.
+    Шаблон из файла должен содержать стили заголовков, списков и таблиц python-docx.
+    """
+    global _template
+    _template = Path(template_path).read_bytes() if template_path else create_template()
+
+
+def render_docx(text: str) -> bytes:
+    """Собирает DOCX документ из markdown текста на основе загруженного шаблона"""
+    if _template is None:
+        load_template()
+    document = WordDocument(io.BytesIO(_template))
+    WordDocumentBuilder(document).build(text)
+    file_buffer = io.BytesIO()
+    document.save(file_buffer)
+    return file_buffer.getvalue()
+
+
+def render_pdf(text: str) -> bytes:
+    """PDF получается конвертацией DOCX, поэтому совпадает с ним по оформлению"""
+    return convert_docx_to_pdf(render_docx(text))
+
+
+def render_html(text: str) -> bytes:
+    tokens = MARKDOWN.parse(text)
+    title = next(
+        (tokens[idx + 1].content for idx, token in enumerate(tokens) if token.type == "heading_open"),
+        DEFAULT_TITLE
+    )
+    body = MARKDOWN.renderer.render(tokens, MARKDOWN.options, {})
+    return HTML_TEMPLATE.format(title=html.escape(title), body=body).encode("utf-8")
+
+
+def render_markdown(text: str) -> bytes:
+    return text.encode("utf-8")
+
+
+RENDERERS = {
+    "docx": render_docx,
+    "pdf": render_pdf,
+    "html": render_html,
+    "md": render_markdown
+}
+
+
+def render(text: str, format: str) -> bytes:
+    """Собирает документ в указанном формате, вызывается в процессе пула"""
+    return RENDERERS[format](text)
+
+
+class WordDocumentBuilder:
+    """Заполняет документ за один проход по токенам markdown.
+    Стили берутся из шаблона и не изменяются.
+    """
+    def __init__(self, document: Document) -> None:
+        self.document = document
+        self._paragraph: Optional[Paragraph] = None
+        self._lists: list[str] = []         # Типы открытых списков: bullet или ordered
+        self._quote_level = 0
+        self._is_list_item_start = False    # Следующий абзац - первый в пункте списка
+        self._table_rows: Optional[list[list[tuple[Token, bool]]]] = None  # Ячейки таблицы и признак заголовка
+        self._is_header_cell = False
+        self._style_ids: dict[str, str] = {}
+
+    def build(self, text: str) -> None:
+        for token in MARKDOWN.parse(text):
+            self._handle(token)
+
+    def _handle(self, token: Token) -> None:
+        if self._table_rows is not None and token.type != "table_close":
+            self._collect_table(token)
+        elif token.type == "heading_open":
+            self._paragraph = self._add_styled_paragraph(f"Heading {min(int(token.tag[1]), MAX_HEADING_LEVEL)}")
+        elif token.type == "paragraph_open":
+            self._paragraph = self._add_paragraph()
+        elif token.type == "inline" and self._paragraph is not None:
+            self._add_inline(self._paragraph, token)
+        elif token.type in ("heading_close", "paragraph_close"):
+            self._paragraph = None
+        elif token.type in ("bullet_list_open", "ordered_list_open"):
+            self._lists.append("ordered" if token.type == "ordered_list_open" else "bullet")
+        elif token.type in ("bullet_list_close", "ordered_list_close"):
+            self._lists.pop()
+        elif token.type == "list_item_open":
+            self._is_list_item_start = True
+        elif token.type == "blockquote_open":
+            self._quote_level += 1
+        elif token.type == "blockquote_close":
+            self._quote_level -= 1
+        elif token.type in ("fence", "code_block"):
+            self._add_code(token.content)
+        elif token.type == "hr":
+            self._add_horizontal_line()
+        elif token.type == "table_open":
+            self._table_rows = []
+        elif token.type == "table_close":
+            self._add_table(self._table_rows)
+            self._table_rows = None
+
+    def _add_paragraph(self) -> Paragraph:
+        if self._lists and self._is_list_item_start:
+            self._is_list_item_start = False
+            level = min(len(self._lists), MAX_LIST_LEVEL)
+            return self._add_styled_paragraph(LIST_STYLES[self._lists[-1]][level - 1])
+        if self._quote_level:
+            return self._add_styled_paragraph(QUOTE_STYLE)
+        return self.document.add_paragraph()
+
+    def _add_styled_paragraph(self, style: str) -> Paragraph:
+        """python-docx ищет стиль по имени перебором всех стилей шаблона на каждый абзац,
+        поэтому ID стилей находятся один раз на документ
+        """
+        if style not in self._style_ids:
+            self._style_ids[style] = self.document.styles[style].style_id
+        paragraph = self.document.add_paragraph()
+        paragraph._p.style = self._style_ids[style]
+        return paragraph
+
+    @staticmethod
+    def _add_inline(paragraph: Paragraph, token: Token) -> None:
+        """Переносит текст с начертанием: жирный, курсив, зачёркнутый и моноширинный"""
+        bold = italic = strike = 0
+        for child in token.children or []:
+            if child.type == "strong_open":
+                bold += 1
+            elif child.type == "strong_close":
+                bold -= 1
+            elif child.type == "em_open":
+                italic += 1
+            elif child.type == "em_close":
+                italic -= 1
+            elif child.type == "s_open":
+                strike += 1
+            elif child.type == "s_close":
+                strike -= 1
+            elif child.type == "softbreak":
+                paragraph.add_run(" ")
+            elif child.type == "hardbreak":
+                paragraph.add_run().add_break()
+            elif child.type in ("text", "code_inline", "image") and child.content:
+                run = paragraph.add_run(child.content)
+                run.bold = bold > 0 or None
+                run.italic = italic > 0 or None
+                run.font.strike = strike > 0 or None
+                if child.type == "code_inline":
+                    run.font.name = CODE_FONT
+
+    def _add_code(self, code: str) -> None:
+        paragraph = self._add_paragraph()
+        for idx, line in enumerate(code.rstrip("\n").split("\n")):
+            if idx:
+                paragraph.add_run().add_break()
+            paragraph.add_run(line).font.name = CODE_FONT
+
+    def _add_horizontal_line(self) -> None:
+        self.document.add_paragraph().add_run().add_break()
+        self.document.add_paragraph("―" * PARAGRAPH_LINE).alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        self.document.add_paragraph().add_run().add_break()
+
+    def _collect_table(self, token: Token) -> None:
+        """Ячейки копятся до конца таблицы, так как размер таблицы DOCX задаётся при создании"""
+        if token.type == "tr_open":
+            self._table_rows.append([])
+        elif token.type == "inline":
+            self._table_rows[-1].append((token, self._is_header_cell))
+        elif token.type in ("th_open", "td_open"):
+            self._is_header_cell = token.type == "th_open"
+
+    def _add_table(self, rows: list[list[tuple[Token, bool]]]) -> None:
+        if not rows:
+            return
+        table: Table = self.document.add_table(rows=len(rows), cols=max(len(row) for row in rows))
+        table.style = TABLE_STYLE
+        for row_idx, row in enumerate(rows):
+            for column_idx, (token, is_header) in enumerate(row):
+                paragraph = table.cell(row_idx, column_idx).paragraphs[0]
+                self._add_inline(paragraph, token)
+                if is_header:
+                    for run in paragraph.runs:
+                        run.bold = True
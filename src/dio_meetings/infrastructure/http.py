@@ -0,0 +1,100 @@
+from typing import Optional
+from types import SimpleNamespace
+
+import logging
+
+import aiohttp
+from pydantic import BaseModel
+
+# Настройки пула соединений по умолчанию:
+DEFAULT_LIMIT = 100  # Максимум соединений всего
+DEFAULT_LIMIT_PER_HOST = 20  # Максимум соединений к одному хосту
+DEFAULT_KEEPALIVE_TIMEOUT = 60  # Время жизни простаивающего соединения, сек
+DEFAULT_DNS_CACHE_TTL = 300  # Время кэширования DNS, сек
+DEFAULT_CONNECT_TIMEOUT = 10  # Таймаут установки соединения, сек
+DEFAULT_READ_TIMEOUT = 120  # Таймаут чтения из сокета, сек
+
+
+class HTTPClientStats(BaseModel):
+    requests: int = 0              # Отправлено запросов
+    connections_created: int = 0   # Открыто новых соединений (TCP + TLS)
+    connections_reused: int = 0    # Запросов через уже открытое соединение
+    dns_cache_hits: int = 0        # Попаданий в DNS кэш
+    dns_cache_misses: int = 0      # Промахов DNS кэша
+
+
+class HTTPClient:
+    """Общий для всех внешних API пул HTTP соединений с keep-alive и DNS кэшем"""
+    def __init__(
+            self,
+            limit: int = DEFAULT_LIMIT,
+            limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+            keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+            dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL,
+            connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+            read_timeout: float = DEFAULT_READ_TIMEOUT
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._dns_cache_ttl = dns_cache_ttl
+        self._timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=connect_timeout,
+            sock_read=read_timeout
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._stats = HTTPClientStats()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # Сессия создаётся лениво, так как требует запущенного event loop
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                keepalive_timeout=self._keepalive_timeout,
+                ttl_dns_cache=self._dns_cache_ttl,
+                use_dns_cache=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self._timeout,
+                trace_configs=[self._create_trace_config()]
+            )
+        return self._session
+
+    @property
+    def stats(self) -> HTTPClientStats:
+        return self._stats.model_copy()
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._logger.info("HTTP client closed: %s", self._stats.model_dump())
+
+    def _create_trace_config(self) -> aiohttp.TraceConfig:
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_request_start(*_: SimpleNamespace) -> None:
+            self._stats.requests += 1
+
+        async def on_connection_create_end(*_: SimpleNamespace) -> None:
+            self._stats.connections_created += 1
+
+        async def on_connection_reuseconn(*_: SimpleNamespace) -> None:
+            self._stats.connections_reused += 1
+
+        async def on_dns_cache_hit(*_: SimpleNamespace) -> None:
+            self._stats.dns_cache_hits += 1
+
+        async def on_dns_cache_miss(*_: SimpleNamespace) -> None:
+            self._stats.dns_cache_misses += 1
+
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
@@ -0,0 +1,186 @@
+from typing import Optional
+from collections.abc import AsyncIterator
+
+import json
+import time
+import hashlib
+import logging
+
+from pydantic import BaseModel, computed_field
+from pydantic import ValidationError
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ...core.base import BaseLLM
+from ...core.dto import BaseMessage, AIMessage
+from ...single_flight import SingleFlight
+
+# Настройки кэша ответов LLM:
+CACHE_PREFIX = "llm:cache"  # Префикс ключей кэша в Redis
+CACHE_TTL = 7 * 24 * 60 * 60  # Время жизни ответа в кэше, сек
+CACHE_MAX_ENTRIES = 1000  # Максимум ответов в кэше, самые старые вытесняются
+LOCK_PREFIX = "llm:lock"  # Префикс блокировок генерации одинакового запроса
+LOCK_TIMEOUT = 10 * 60  # Время жизни блокировки генерации одинакового запроса, сек
+
+
+class CachedResponse(BaseModel):
+    text: str       # Текст ответа LLM
+    latency: float  # Время генерации ответа, сек
+
+
+class LLMCacheStats(BaseModel):
+    hits: int = 0              # Ответов из кэша
+    misses: int = 0            # Запросов к LLM
+    latency_saved: float = 0.0  # Сэкономленное время генерации, сек
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LLMCache:
+    """Хранит ответы LLM в Redis с TTL и ограничением количества записей.
+    Статистика попаданий хранится там же и общая для всех процессов.
+    """
+    def __init__(
+            self,
+            redis: Redis,
+            ttl: int = CACHE_TTL,
+            max_entries: int = CACHE_MAX_ENTRIES,
+            prefix: str = CACHE_PREFIX
+    ) -> None:
+        self._redis = redis
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._prefix = prefix
+        self._index_key = f"{prefix}:index"
+        self._stats_key = f"{prefix}:stats"
+
+    def create_key(self, model_name: str, messages: list[BaseMessage]) -> str:
+        payload = json.dumps(
+            [model_name, [message.model_dump(mode="json") for message in messages]],
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return f"{self._prefix}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        data = await self._redis.get(key)
+        return CachedResponse.model_validate_json(data) if data else None
+
+    async def set(self, key: str, response: CachedResponse) -> None:
+        now = time.time()
+        async with self._redis.pipeline(transaction=True) as pipeline:
+            pipeline.set(key, response.model_dump_json(), ex=self._ttl)
+            pipeline.zadd(self._index_key, {key: now})
+            pipeline.zremrangebyscore(self._index_key, "-inf", now - self._ttl)
+            await pipeline.execute()
+        overflow = await self._redis.zcard(self._index_key) - self._max_entries
+        if overflow > 0:
+            evicted = await self._redis.zpopmin(self._index_key, overflow)
+            await self._redis.delete(*[evicted_key for evicted_key, _ in evicted])
+
+    async def record_hit(self, latency_saved: float) -> None:
+        async with self._redis.pipeline(transaction=True) as pipeline:
+            pipeline.hincrby(self._stats_key, "hits", 1)
+            pipeline.hincrbyfloat(self._stats_key, "latency_saved", latency_saved)
+            await pipeline.execute()
+
+    async def record_miss(self) -> None:
+        await self._redis.hincrby(self._stats_key, "misses", 1)
+
+    async def get_stats(self) -> LLMCacheStats:
+        stats = await self._redis.hgetall(self._stats_key)
+        return LLMCacheStats(
+            hits=int(stats.get(b"hits", 0)),
+            misses=int(stats.get(b"misses", 0)),
+            latency_saved=round(float(stats.get(b"latency_saved", 0.0)), 3)
+        )
+
+
+class CachedLLM(BaseLLM):
+    """Кэширует ответы LLM по хэшу модели и сообщений.
+    Одинаковые одновременные запросы выполняются один раз через single_flight.
+    Кэш не обязателен для генерации: при ошибках Redis запрос уходит в LLM напрямую.
+    """
+    def __init__(
+            self,
+            llm: BaseLLM,
+            cache: LLMCache,
+            model_name: str,
+            single_flight: Optional[SingleFlight] = None
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._llm = llm
+        self._cache = cache
+        self._model_name = model_name
+        self._single_flight = single_flight or SingleFlight()
+
+    async def generate(self, messages: list[BaseMessage]) -> AIMessage:
+        key = self._cache.create_key(self._model_name, messages)
+        cached_response = await self._get(key)
+        if cached_response:
+            return await self._hit(cached_response)
+        await self._miss()
+        return await self._single_flight.run(key, lambda: self._generate(key, messages))
+
+    async def astream(self, messages: list[BaseMessage]) -> AsyncIterator[str]:
+        """Ответ из кэша отдаётся одной частью. Потоковая генерация не ждёт одинаковых запросов,
+        чтобы не задерживать первый фрагмент, готовый ответ сохраняется в кэш.
+        """
+        key = self._cache.create_key(self._model_name, messages)
+        cached_response = await self._get(key)
+        if cached_response:
+            yield (await self._hit(cached_response)).text
+            return
+        await self._miss()
+        started_at = time.perf_counter()
+        parts = []
+        async for part in self._llm.astream(messages):
+            parts.append(part)
+            yield part
+        latency = time.perf_counter() - started_at
+        await self._save(key, CachedResponse(text="".join(parts), latency=latency))
+
+    async def _generate(self, key: str, messages: list[BaseMessage]) -> AIMessage:
+        # Ответ мог сохранить процесс, державший блокировку до этого.
+        # Промах уже учтён при первом чтении кэша, поэтому попадание не записывается
+        cached_response = await self._get(key)
+        if cached_response:
+            return AIMessage(text=cached_response.text)
+        started_at = time.perf_counter()
+        ai_message = await self._llm.generate(messages)
+        latency = time.perf_counter() - started_at
+        await self._save(key, CachedResponse(text=ai_message.text, latency=latency))
+        self._logger.info("LLM response generated in %.2fs", latency)
+        return ai_message
+
+    async def _get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            return await self._cache.get(key)
+        except (RedisError, ValidationError) as e:
+            self._logger.warning("Error while reading LLM cache: %s", e)
+            return None
+
+    async def _save(self, key: str, response: CachedResponse) -> None:
+        try:
+            await self._cache.set(key, response)
+        except RedisError as e:
+            self._logger.warning("Error while saving LLM response to cache: %s", e)
+
+    async def _miss(self) -> None:
+        """Промах учитывается при чтении кэша, даже если ответ потом не удастся сохранить"""
+        try:
+            await self._cache.record_miss()
+        except RedisError as e:
+            self._logger.warning("Error while recording LLM cache miss: %s", e)
+
+    async def _hit(self, cached_response: CachedResponse) -> AIMessage:
+        try:
+            await self._cache.record_hit(cached_response.latency)
+        except RedisError as e:
+            self._logger.warning("Error while recording LLM cache hit: %s", e)
+        self._logger.info("LLM response taken from cache, saved %.2fs", cached_response.latency)
+        return AIMessage(text=cached_response.text)
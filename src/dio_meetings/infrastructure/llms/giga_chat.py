@@ -1,3 +1,5 @@
+from collections.abc import AsyncIterator
+
 from langchain_gigachat import GigaChat
 
 from src.dio_meetings.core.base import BaseLLM
@@ -20,6 +22,11 @@ class GigaChatLLM(BaseLLM):
         response = await self.giga_chat.ainvoke(self._format_messages(messages))
         return AIMessage(text=response.content)
 
+    async def astream(self, messages: list[BaseMessage]) -> AsyncIterator[str]:
+        async for chunk in self.giga_chat.astream(self._format_messages(messages)):
+            if chunk.content:
+                yield chunk.content
+
     @staticmethod
     def _format_messages(messages: list[BaseMessage]) -> list[dict[str, str]]:
         return [
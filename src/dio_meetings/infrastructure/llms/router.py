@@ -0,0 +1,269 @@
+from typing import Optional
+from collections.abc import AsyncIterator
+
+import time
+import asyncio
+import logging
+from collections import deque
+
+from pydantic import BaseModel
+
+from ...core.base import BaseLLM
+from ...core.dto import BaseMessage, AIMessage
+
+# Настройки маршрутизации запросов между LLM провайдерами:
+STATS_WINDOW = 50  # Количество последних запросов для оценки задержки и ошибок
+FAILURE_THRESHOLD = 3  # Ошибок подряд до размыкания цепи
+RECOVERY_TIMEOUT = 60  # Время до пробного запроса к отключённому провайдеру, сек
+HEDGE_MIN_DELAY = 10  # Минимальная задержка дублирующего запроса, сек
+DEFAULT_HEDGE_DELAY = 60  # Задержка дублирующего запроса, пока нет статистики, сек
+MIN_SUCCESS_RATE = 0.1  # Нижняя граница доли успешных запросов при оценке провайдера
+
+
+class ProvidersUnavailableError(Exception):
+    pass
+
+
+class ProviderStats(BaseModel):
+    name: str
+    state: str                      # Состояние цепи: closed, open, half_open
+    requests: int                   # Запросов в окне статистики
+    error_rate: float               # Доля ошибок в окне статистики
+    p50_latency: Optional[float]    # Медианная задержка ответов, сек
+    p95_latency: Optional[float]    # 95-й перцентиль задержки ответов, сек
+
+
+class CircuitBreaker:
+    """После failure_threshold ошибок подряд отключает провайдера на recovery_timeout секунд,
+    затем пропускает один пробный запрос: успех возвращает провайдера, ошибка снова отключает.
+    """
+    def __init__(
+            self,
+            failure_threshold: int = FAILURE_THRESHOLD,
+            recovery_timeout: float = RECOVERY_TIMEOUT
+    ) -> None:
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._is_probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self._recovery_timeout:
+            return "half_open"
+        return "open"
+
+    def is_available(self) -> bool:
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self._is_probing)
+
+    def acquire(self) -> bool:
+        """Занимает право на запрос, в полуоткрытом состоянии пропускается только один запрос"""
+        if not self.is_available():
+            return False
+        if self.state == "half_open":
+            self._is_probing = True
+        return True
+
+    def release(self) -> None:
+        """Освобождает право на пробный запрос, если он был отменён"""
+        self._is_probing = False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._is_probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._is_probing or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+        self._is_probing = False
+
+
+class Provider:
+    def __init__(self, name: str, llm: BaseLLM, circuit_breaker: CircuitBreaker, window: int) -> None:
+        self.name = name
+        self.llm = llm
+        self.circuit_breaker = circuit_breaker
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._results: deque[bool] = deque(maxlen=window)
+
+    def record(self, is_success: bool, latency: Optional[float] = None) -> None:
+        self._results.append(is_success)
+        if is_success:
+            self._latencies.append(latency)
+            self.circuit_breaker.record_success()
+        else:
+            self.circuit_breaker.record_failure()
+
+    def record_cancelled(self, latency: float) -> None:
+        """Запрос отменён до ответа, например, проиграл дублирующему: настоящая задержка
+        не меньше прошедшего времени. Без этого медленный провайдер оценивался бы только
+        по успевшим ответам. Оценка не учитывается, если она занизила бы медиану.
+        """
+        p50_latency = self.get_latency(0.5)
+        if p50_latency is None or latency >= p50_latency:
+            self._latencies.append(latency)
+
+    def get_latency(self, percentile: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        latencies = sorted(self._latencies)
+        return latencies[min(int(len(latencies) * percentile), len(latencies) - 1)]
+
+    @property
+    def error_rate(self) -> float:
+        if not self._results:
+            return 0.0
+        return self._results.count(False) / len(self._results)
+
+    @property
+    def score(self) -> float:
+        """Ожидаемое время получения успешного ответа. Провайдеры без статистики пробуются первыми"""
+        latency = self.get_latency(0.5) or 0.0
+        return latency / max(1 - self.error_rate, MIN_SUCCESS_RATE)
+
+    @property
+    def stats(self) -> ProviderStats:
+        p50_latency, p95_latency = self.get_latency(0.5), self.get_latency(0.95)
+        return ProviderStats(
+            name=self.name,
+            state=self.circuit_breaker.state,
+            requests=len(self._results),
+            error_rate=round(self.error_rate, 3),
+            p50_latency=round(p50_latency, 3) if p50_latency is not None else None,
+            p95_latency=round(p95_latency, 3) if p95_latency is not None else None
+        )
+
+
+class LLMRouter(BaseLLM):
+    """Отправляет запрос самому быстрому доступному провайдеру.
+    Если ответ не пришёл за p95 задержки провайдера, запрос дублируется следующему провайдеру
+    и используется первый ответ. При ошибке запрос сразу уходит следующему провайдеру.
+    """
+    def __init__(
+            self,
+            providers: dict[str, BaseLLM],
+            hedging_enabled: bool = True,
+            hedge_min_delay: float = HEDGE_MIN_DELAY,
+            failure_threshold: int = FAILURE_THRESHOLD,
+            recovery_timeout: float = RECOVERY_TIMEOUT,
+            window: int = STATS_WINDOW
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._providers = [
+            Provider(
+                name=name,
+                llm=llm,
+                circuit_breaker=CircuitBreaker(failure_threshold, recovery_timeout),
+                window=window
+            )
+            for name, llm in providers.items()
+        ]
+        self._hedging_enabled = hedging_enabled
+        self._hedge_min_delay = hedge_min_delay
+
+    @property
+    def stats(self) -> list[ProviderStats]:
+        return [provider.stats for provider in self._providers]
+
+    async def generate(self, messages: list[BaseMessage]) -> AIMessage:
+        candidates = sorted(
+            [provider for provider in self._providers if provider.circuit_breaker.is_available()],
+            key=lambda provider: provider.score
+        )
+        pending: dict[asyncio.Task[AIMessage], Provider] = {}
+        errors: list[str] = []
+        is_hedged = False
+
+        def launch() -> bool:
+            while candidates:
+                provider = candidates.pop(0)
+                if provider.circuit_breaker.acquire():
+                    pending[asyncio.create_task(self._call(provider, messages))] = provider
+                    return True
+            return False
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if self._hedging_enabled and not is_hedged and candidates and len(pending) == 1:
+                    timeout = self._get_hedge_delay(next(iter(pending.values())))
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    is_hedged = launch()
+                    if is_hedged:
+                        self._logger.info("LLM request hedged after %.1fs", timeout)
+                    continue
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    errors.append(f"{provider.name}: {task.exception()}")
+                    self._logger.warning("LLM provider %s failed: %s", provider.name, task.exception())
+                if not pending:
+                    launch()
+        finally:
+            for task, provider in pending.items():
+                task.cancel()
+                provider.circuit_breaker.release()
+        raise ProvidersUnavailableError(f"All LLM providers failed or unavailable: {errors}")
+
+    async def astream(self, messages: list[BaseMessage]) -> AsyncIterator[str]:
+        """Потоковая генерация без дублирования запросов. На другого провайдера
+        запрос переключается, только если ошибка произошла до первого фрагмента.
+        """
+        candidates = sorted(
+            [provider for provider in self._providers if provider.circuit_breaker.is_available()],
+            key=lambda provider: provider.score
+        )
+        errors: list[str] = []
+        for provider in candidates:
+            if not provider.circuit_breaker.acquire():
+                continue
+            started_at = time.perf_counter()
+            is_started = False
+            try:
+                async for part in provider.llm.astream(messages):
+                    is_started = True
+                    yield part
+            except Exception as e:
+                provider.record(is_success=False)
+                if is_started:
+                    raise
+                errors.append(f"{provider.name}: {e}")
+                self._logger.warning("LLM provider %s failed: %s", provider.name, e)
+                continue
+            except BaseException:
+                # Генерация прервана потребителем, результат провайдера неизвестен
+                provider.record_cancelled(time.perf_counter() - started_at)
+                provider.circuit_breaker.release()
+                raise
+            provider.record(is_success=True, latency=time.perf_counter() - started_at)
+            return
+        raise ProvidersUnavailableError(f"All LLM providers failed or unavailable: {errors}")
+
+    def _get_hedge_delay(self, provider: Provider) -> float:
+        p95_latency = provider.get_latency(0.95)
+        if p95_latency is None:
+            return DEFAULT_HEDGE_DELAY
+        return max(p95_latency, self._hedge_min_delay)
+
+    @staticmethod
+    async def _call(provider: Provider, messages: list[BaseMessage]) -> AIMessage:
+        started_at = time.perf_counter()
+        try:
+            ai_message = await provider.llm.generate(messages)
+        except asyncio.CancelledError:
+            provider.record_cancelled(time.perf_counter() - started_at)
+            raise
+        except Exception:
+            provider.record(is_success=False)
+            raise
+        provider.record(is_success=True, latency=time.perf_counter() - started_at)
+        return ai_message
@@ -1,6 +1,8 @@
 from typing import Any, List, Optional
+from collections.abc import AsyncIterator
 
 import time
+import json
 import logging
 import asyncio
 
@@ -10,11 +12,14 @@ import requests
 from .constants import MODELS
 from .exceptions import SendRequestError, StatusOperationError
 
+from src.dio_meetings.infrastructure.http import HTTPClient
+
 
 class YandexGPTAPI:
     def __init__(
             self,
             folder_id: str,
+            http_client: HTTPClient,
             api_key: Optional[str] = None,
             iam_token: Optional[str] = None,
             url: Optional[str] = None,
@@ -36,9 +41,10 @@ class YandexGPTAPI:
         self._tools = tools
         self._stream = stream
         self._timeout = timeout
+        self._http_client = http_client
 
     @property
-    def _model_uri(self) -> str:
+    def model_uri(self) -> str:
         return f"gpt://{self._folder_id}/{self._model}"
 
     @property
@@ -58,12 +64,13 @@ class YandexGPTAPI:
     def _payload(
             self,
             messages: List[dict[str, str]],
-            stop: Optional[List[str]] = None
+            stop: Optional[List[str]] = None,
+            stream: Optional[bool] = None
     ) -> dict[str, Any]:
         payload = {
-            "modelUri": self._model_uri,
+            "modelUri": self.model_uri,
             "completionOptions": {
-                "stream": self._stream,
+                "stream": self._stream if stream is None else stream,
                 "temperature": self._temperature,
                 "maxTokens": self._max_tokens
             },
@@ -75,6 +82,22 @@ class YandexGPTAPI:
             payload["completionOptions"]["stopSequences"] = stop
         return payload
 
+    def _request_options(self) -> dict[str, Any]:
+        """Общий таймаут запроса задаётся поверх таймаутов соединения и чтения общего клиента,
+        без него используются только они
+        """
+        if self._timeout is None:
+            return {}
+        timeout = self._http_client.session.timeout
+        return {
+            "timeout": aiohttp.ClientTimeout(
+                total=self._timeout,
+                connect=timeout.connect,
+                sock_connect=timeout.sock_connect,
+                sock_read=timeout.sock_read
+            )
+        }
+
     def complete(
             self,
             messages: List[dict[str, str]],
@@ -93,6 +116,27 @@ class YandexGPTAPI:
             return await self._asend_async_request(messages, stop)
         return await self._asend_request(messages, stop)
 
+    async def astream(
+            self,
+            messages: List[dict[str, str]],
+            stop: Optional[List[str]] = None
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Возвращает промежуточные результаты по мере генерации, текст в каждом накопительный"""
+        try:
+            async with self._http_client.session.post(
+                    url=self._url,
+                    headers=self._headers,
+                    json=self._payload(messages, stop, stream=True),
+                    **self._request_options()
+            ) as response:
+                response.raise_for_status()
+                async for line in response.content:
+                    if line.strip():
+                        yield json.loads(line)
+        except (aiohttp.ClientError, ValueError) as e:
+            self._logger.error("Error while streaming request %s", e)
+            raise SendRequestError(f"Error while streaming request: {e}") from e
+
     def _send_request(
             self,
             messages: List[dict[str, str]],
@@ -118,15 +162,14 @@ class YandexGPTAPI:
             stop: Optional[List[str]] = None
     ) -> Optional[dict[str, Any]]:
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                        url=self._url,
-                        headers=self._headers,
-                        json=self._payload(messages, stop),
-                        timeout=self._timeout
-                ) as response:
-                    response.raise_for_status()
-                    return await response.json()
+            async with self._http_client.session.post(
+                    url=self._url,
+                    headers=self._headers,
+                    json=self._payload(messages, stop),
+                    **self._request_options()
+            ) as response:
+                response.raise_for_status()
+                return await response.json()
         except aiohttp.ClientError as e:
             self._logger.error("Error while sending request %s", e)
             raise SendRequestError(f"Error while sending request: {e}") from e
@@ -168,13 +211,12 @@ class YandexGPTAPI:
         if not self._iam_token:
             raise ValueError("IAM-TOKEN is required")
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url=self._url,
-                    headers=self._headers,
-                    json=self._payload(messages, stop)
-                ) as response:
-                    data = await response.json()
+            async with self._http_client.session.post(
+                url=self._url,
+                headers=self._headers,
+                json=self._payload(messages, stop)
+            ) as response:
+                data = await response.json()
             operation_id: str = data["id"]
             while True:
                 status_operation = await self._aget_status_operation(operation_id)
@@ -202,9 +244,8 @@ class YandexGPTAPI:
         try:
             url = f"{self._url}/{operation_id}"
             headers = {"Authorization": f"Bearer {self._iam_token}"}
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url=url, headers=headers) as response:
-                    return await response.json()
+            async with self._http_client.session.get(url=url, headers=headers) as response:
+                return await response.json()
         except aiohttp.ClientError as e:
             self._logger.error("Error while received status of operation: %s", e)
             raise StatusOperationError(f"Error while received status operation: {e}") from e
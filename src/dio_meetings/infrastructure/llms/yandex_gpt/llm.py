@@ -1,8 +1,12 @@
+from typing import Optional
+from collections.abc import AsyncIterator
+
 from .api import YandexGPTAPI
 from .constants import MODELS, URL
 
 from src.dio_meetings.core.base import BaseLLM
 from src.dio_meetings.core.dto import BaseMessage, AIMessage
+from src.dio_meetings.infrastructure.http import HTTPClient
 
 
 class YandexGPT(BaseLLM):
@@ -10,18 +14,35 @@ class YandexGPT(BaseLLM):
             self,
             folder_id: str,
             api_key: str,
+            http_client: HTTPClient,
             model: MODELS = "yandexgpt"
     ) -> None:
         self.yandex_gpt_api = YandexGPTAPI(
             folder_id=folder_id,
             api_key=api_key,
             model=model,
-            url=URL
+            url=URL,
+            http_client=http_client
         )
 
+    @property
+    def model_uri(self) -> str:
+        return self.yandex_gpt_api.model_uri
+
     async def generate(self, messages: list[BaseMessage]) -> AIMessage:
         response = await self.yandex_gpt_api.acomplete(
             messages=[message.model_dump() for message in messages]
         )
         alternative = response["result"]["alternatives"][0]
         return AIMessage(text=alternative["message"]["text"])
+
+    async def astream(self, messages: list[BaseMessage]) -> AsyncIterator[str]:
+        """API возвращает накопленный текст целиком, наружу отдаётся только новая часть"""
+        generated_text = ""
+        async for response in self.yandex_gpt_api.astream(
+            messages=[message.model_dump() for message in messages]
+        ):
+            text = response["result"]["alternatives"][0]["message"]["text"]
+            if len(text) > len(generated_text):
+                yield text[len(generated_text):]
+                generated_text = text
@@ -1,17 +1,21 @@
-from typing import Any
-from collections.abc import AsyncGenerator
+from typing import Any, Optional, Union
+from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
 from contextlib import asynccontextmanager
 
+import asyncio
 import logging
 
 from aiobotocore.session import get_session
 from aiobotocore.client import AioBaseClient
+from botocore.exceptions import ClientError
 
 from ..core.base import FileStorage
 from ..core.exceptions import FileStoreError, UploadingError, DownloadingError
+from ..constants import MULTIPART_PART_SIZE, UPLOAD_CHUNK_SIZE
 
 
 SERVICE_NAME = "s3"
+NOT_FOUND_CODES = ("404", "NoSuchKey", "NotFound")
 
 
 class S3Client(FileStorage):
@@ -47,13 +51,121 @@ class S3Client(FileStorage):
             self.logger.error(f"Error while creating bucket: {e}")
             raise FileStoreError(f"Error while creating bucket: {e}") from e
 
-    async def upload_file(self, data: bytes, key: str, bucket: str) -> None:
+    async def upload_file(
+            self,
+            data: bytes,
+            key: str,
+            bucket: str,
+            metadata: Optional[dict[str, str]] = None
+    ) -> None:
         try:
             async with self._get_client() as client:
-                await client.put_object(Bucket=bucket, Key=key, Body=data)
+                await client.put_object(Bucket=bucket, Key=key, Body=data, Metadata=metadata or {})
         except Exception as e:
             raise UploadingError(f"Error while uploading file: {e}") from e
 
+    async def upload_stream(self, stream: AsyncIterable[bytes], key: str, bucket: str) -> int:
+        upload_id = await self.create_multipart_upload(key=key, bucket=bucket)
+        parts: list[dict[str, Union[int, str]]] = []
+        buffer = bytearray()
+        size = 0
+        try:
+            async for chunk in stream:
+                buffer.extend(chunk)
+                size += len(chunk)
+                while len(buffer) >= MULTIPART_PART_SIZE:
+                    part_number = len(parts) + 1
+                    etag = await self.upload_part(
+                        data=bytes(buffer[:MULTIPART_PART_SIZE]),
+                        key=key,
+                        bucket=bucket,
+                        upload_id=upload_id,
+                        part_number=part_number
+                    )
+                    parts.append({"PartNumber": part_number, "ETag": etag})
+                    del buffer[:MULTIPART_PART_SIZE]
+            if buffer or not parts:
+                part_number = len(parts) + 1
+                etag = await self.upload_part(
+                    data=bytes(buffer),
+                    key=key,
+                    bucket=bucket,
+                    upload_id=upload_id,
+                    part_number=part_number
+                )
+                parts.append({"PartNumber": part_number, "ETag": etag})
+            await self.complete_multipart_upload(
+                key=key,
+                bucket=bucket,
+                upload_id=upload_id,
+                parts=parts
+            )
+            return size
+        except Exception as e:
+            self.logger.error(f"Error while uploading stream: {e}")
+            await self.abort_multipart_upload(key=key, bucket=bucket, upload_id=upload_id)
+            raise UploadingError(f"Error while uploading stream: {e}") from e
+        except BaseException:
+            # Отмена задачи, например, при обрыве соединения клиента, тоже не должна оставлять
+            # незавершённую загрузку, части которой занимают место в S3. Повторная отмена
+            # во время abort не прерывает его
+            await asyncio.shield(self.abort_multipart_upload(key=key, bucket=bucket, upload_id=upload_id))
+            raise
+
+    async def create_multipart_upload(self, key: str, bucket: str) -> str:
+        try:
+            async with self._get_client() as client:
+                response = await client.create_multipart_upload(Bucket=bucket, Key=key)
+            return response["UploadId"]
+        except Exception as e:
+            raise UploadingError(f"Error while creating multipart upload: {e}") from e
+
+    async def upload_part(
+            self,
+            data: bytes,
+            key: str,
+            bucket: str,
+            upload_id: str,
+            part_number: int
+    ) -> str:
+        try:
+            async with self._get_client() as client:
+                response = await client.upload_part(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=data
+                )
+            return response["ETag"]
+        except Exception as e:
+            raise UploadingError(f"Error while uploading part {part_number}: {e}") from e
+
+    async def complete_multipart_upload(
+            self,
+            key: str,
+            bucket: str,
+            upload_id: str,
+            parts: list[dict[str, Union[int, str]]]
+    ) -> None:
+        try:
+            async with self._get_client() as client:
+                await client.complete_multipart_upload(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": parts}
+                )
+        except Exception as e:
+            raise UploadingError(f"Error while completing multipart upload: {e}") from e
+
+    async def abort_multipart_upload(self, key: str, bucket: str, upload_id: str) -> None:
+        try:
+            async with self._get_client() as client:
+                await client.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        except Exception as e:
+            self.logger.error(f"Error while aborting multipart upload: {e}")
+
     async def download_file(self, key: str, bucket: str) -> bytes:
         try:
             async with self._get_client() as client:
@@ -64,6 +176,29 @@ class S3Client(FileStorage):
             self.logger.error(f"Error while receiving file: {e}")
             raise DownloadingError(f"Error while receiving file: {e}") from e
 
+    async def download_stream(self, key: str, bucket: str) -> AsyncIterator[bytes]:
+        try:
+            async with self._get_client() as client:
+                response = await client.get_object(Bucket=bucket, Key=key)
+                async with response["Body"] as body:
+                    async for chunk in body.iter_chunks(UPLOAD_CHUNK_SIZE):
+                        yield chunk
+        except Exception as e:
+            self.logger.error(f"Error while streaming file: {e}")
+            raise DownloadingError(f"Error while streaming file: {e}") from e
+
+    async def file_exists(self, key: str, bucket: str) -> bool:
+        try:
+            async with self._get_client() as client:
+                await client.head_object(Bucket=bucket, Key=key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in NOT_FOUND_CODES:
+                return False
+            raise DownloadingError(f"Error while checking file: {e}") from e
+        except Exception as e:
+            raise DownloadingError(f"Error while checking file: {e}") from e
+
     async def remove_file(self, key: str, bucket: str) -> str:
         try:
             async with self._get_client() as client:
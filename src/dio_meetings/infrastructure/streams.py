@@ -0,0 +1,107 @@
+from typing import Optional, Union
+from collections.abc import AsyncIterator
+
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from ..core.base import TextStream
+from ..core.dto import ProtocolEvent
+from ..core.enums import TaskStatus
+from ..core.exceptions import TextStreamError
+
+# Настройки потоков текста в Redis Streams:
+STREAM_PREFIX = "protocol:stream"  # Префикс ключей потоков в Redis
+STREAM_TTL = 60 * 60  # Время жизни потока после последнего события, сек
+STREAM_MAX_LENGTH = 10_000  # Максимум событий в одном потоке
+READ_BLOCK_TIMEOUT = 15  # Ожидание новых событий перед пустым ответом, сек
+READ_COUNT = 100  # Событий за одно чтение
+START_ID = "0-0"  # Чтение потока с начала
+
+
+class RedisTextStream(TextStream):
+    """Хранит фрагменты текста в Redis Streams, поэтому читатель, подключившийся позже
+    или переподключившийся с Last-Event-ID, получает весь текст без пропусков.
+    """
+    def __init__(
+            self,
+            redis: Redis,
+            ttl: int = STREAM_TTL,
+            block_timeout: float = READ_BLOCK_TIMEOUT,
+            prefix: str = STREAM_PREFIX
+    ) -> None:
+        self._redis = redis
+        self._ttl = ttl
+        self._block_timeout = block_timeout
+        self._prefix = prefix
+
+    def _key(self, stream_id: UUID) -> str:
+        return f"{self._prefix}:{stream_id}"
+
+    async def publish(self, stream_id: UUID, text: str) -> None:
+        await self._add(stream_id, {"text": text})
+
+    async def reset(self, stream_id: UUID) -> None:
+        """Добавляет событие сброса и удаляет события до него: подключённые читатели
+        получат сброс, а подключившиеся позже - только текст новой попытки
+        """
+        entry_id = await self._add(stream_id, {"reset": "1"})
+        try:
+            await self._redis.xtrim(self._key(stream_id), minid=entry_id, approximate=False)
+        except RedisError as e:
+            raise TextStreamError(f"Error while resetting text stream: {e}") from e
+
+    async def finish(self, stream_id: UUID, status: TaskStatus) -> None:
+        await self._add(stream_id, {"status": status.value})
+
+    async def read(
+            self,
+            stream_id: UUID,
+            last_event_id: Optional[str] = None,
+            wait: bool = True
+    ) -> AsyncIterator[Optional[ProtocolEvent]]:
+        key, last_id = self._key(stream_id), last_event_id or START_ID
+        while True:
+            try:
+                response = await self._redis.xread(
+                    {key: last_id},
+                    count=READ_COUNT,
+                    block=int(self._block_timeout * 1000) if wait else None
+                )
+            except RedisError as e:
+                raise TextStreamError(f"Error while reading text stream: {e}") from e
+            entries = response[0][1] if response else []
+            if not entries:
+                if not wait:
+                    return
+                yield None
+                continue
+            for entry_id, fields in entries:
+                last_id = self._decode(entry_id)
+                fields = {self._decode(name): self._decode(value) for name, value in fields.items()}
+                status = fields.get("status")
+                yield ProtocolEvent(
+                    id=last_id,
+                    text=fields.get("text", ""),
+                    status=TaskStatus(status) if status else None,
+                    reset="reset" in fields
+                )
+                if status:
+                    return
+
+    async def _add(self, stream_id: UUID, fields: dict[str, str]) -> str:
+        """Добавляет событие в поток и возвращает его ID"""
+        key = self._key(stream_id)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                pipeline.xadd(key, fields, maxlen=STREAM_MAX_LENGTH, approximate=True)
+                pipeline.expire(key, self._ttl)
+                entry_id, _ = await pipeline.execute()
+        except RedisError as e:
+            raise TextStreamError(f"Error while publishing to text stream: {e}") from e
+        return self._decode(entry_id)
+
+    @staticmethod
+    def _decode(value: Union[bytes, str]) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else value
@@ -0,0 +1,164 @@
+from collections.abc import AsyncIterable
+
+import asyncio
+import logging
+
+import numpy as np
+
+from ...core.base import BaseSTT, AudioProcessor
+from ...core.dto import Transcription
+from ...core.domain import AudioChunk
+from ...constants import PREPARED_AUDIO_FORMAT
+from ...utils import iter_bytes
+
+# Минимальное косинусное сходство профилей голоса для объединения спикеров
+SPEAKER_SIMILARITY_THRESHOLD = 0.9
+
+
+def reconcile_speakers(
+        profiles: list[dict[int, list[float]]],
+        threshold: float = SPEAKER_SIMILARITY_THRESHOLD
+) -> list[dict[int, int]]:
+    """Сопоставляет локальные ID спикеров каждого фрагмента глобальным ID.
+    Спикеры жадно объединяются по косинусному сходству профилей голоса,
+    несопоставленные спикеры получают новый глобальный ID.
+    """
+    global_profiles: list[np.ndarray] = []
+    global_counts: list[int] = []
+    mappings: list[dict[int, int]] = []
+    for chunk_profiles in profiles:
+        mapping: dict[int, int] = {}
+        pairs = []
+        for speaker_id, profile in chunk_profiles.items():
+            vector = np.asarray(profile)
+            for global_id, global_profile in enumerate(global_profiles):
+                norm = np.linalg.norm(vector) * np.linalg.norm(global_profile)
+                similarity = float(vector @ global_profile / norm) if norm else 0.0
+                if similarity >= threshold:
+                    pairs.append((similarity, speaker_id, global_id))
+        used_global_ids: set[int] = set()
+        for _, speaker_id, global_id in sorted(pairs, reverse=True):
+            if speaker_id in mapping or global_id in used_global_ids:
+                continue
+            mapping[speaker_id] = global_id
+            used_global_ids.add(global_id)
+        for speaker_id, profile in chunk_profiles.items():
+            vector = np.asarray(profile)
+            if speaker_id not in mapping:
+                mapping[speaker_id] = len(global_profiles)
+                global_profiles.append(vector)
+                global_counts.append(1)
+                continue
+            global_id = mapping[speaker_id]
+            global_counts[global_id] += 1
+            global_profiles[global_id] += (vector - global_profiles[global_id]) / global_counts[global_id]
+        mappings.append(mapping)
+    return mappings
+
+
+class ChunkedSTT(BaseSTT):
+    """Параллельно транскрибирует длинное аудио фрагментами и склеивает результат"""
+    def __init__(
+            self,
+            stt: BaseSTT,
+            audio_processor: AudioProcessor,
+            chunk_duration: float,
+            max_concurrency: int
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._stt = stt
+        self._audio_processor = audio_processor
+        self._chunk_duration = chunk_duration
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def transcribe(
+            self,
+            audio_data: bytes,
+            audio_format: str,
+            speakers_count: int
+    ) -> list[Transcription]:
+        return await self.transcribe_stream(iter_bytes(audio_data), audio_format, speakers_count)
+
+    async def transcribe_stream(
+            self,
+            audio_stream: AsyncIterable[bytes],
+            audio_format: str,
+            speakers_count: int
+    ) -> list[Transcription]:
+        """Фрагменты кодируются по мере освобождения слотов, поэтому в памяти одновременно
+        не больше max_concurrency фрагментов, независимо от длины записи
+        """
+        async with self._audio_processor.split_stream(
+            audio_stream,
+            audio_format=audio_format,
+            chunk_duration=self._chunk_duration
+        ) as chunks:
+            first_chunk = await anext(chunks, None)
+            if first_chunk is None:
+                return []
+            second_chunk = await anext(chunks, None)
+            if second_chunk is None:
+                return await self._stt.transcribe(first_chunk.data, PREPARED_AUDIO_FORMAT, speakers_count)
+            jobs: list[asyncio.Task[tuple[list[Transcription], dict[int, list[float]]]]] = []
+            try:
+                for chunk in (first_chunk, second_chunk):
+                    jobs.append(await self._start_chunk(chunk, speakers_count))
+                async for chunk in chunks:
+                    jobs.append(await self._start_chunk(chunk, speakers_count))
+                self._logger.info("Transcribing audio in %d chunks", len(jobs))
+                results = await asyncio.gather(*jobs)
+            except BaseException:
+                for job in jobs:
+                    job.cancel()
+                await asyncio.gather(*jobs, return_exceptions=True)
+                raise
+        mappings = reconcile_speakers([profiles for _, profiles in results])
+        stitched_transcriptions: list[Transcription] = []
+        for (transcriptions, _), mapping in zip(results, mappings):
+            for transcription in transcriptions:
+                if transcription.speaker_id in mapping:
+                    transcription.speaker_id = mapping[transcription.speaker_id]
+                stitched_transcriptions.append(transcription)
+        return stitched_transcriptions
+
+    async def _start_chunk(
+            self,
+            chunk: AudioChunk,
+            speakers_count: int
+    ) -> asyncio.Task[tuple[list[Transcription], dict[int, list[float]]]]:
+        """Ждёт свободного слота и запускает обработку фрагмента, слот освобождается по её завершении.
+        Следующий фрагмент не кодируется, пока слот не освободится.
+        """
+        await self._semaphore.acquire()
+        job = asyncio.create_task(self._transcribe_chunk(chunk, speakers_count))
+        job.add_done_callback(lambda _: self._semaphore.release())
+        return job
+
+    async def _transcribe_chunk(
+            self,
+            chunk: AudioChunk,
+            speakers_count: int
+    ) -> tuple[list[Transcription], dict[int, list[float]]]:
+        """Транскрибирует фрагмент и строит профили голоса его спикеров.
+        После этого аудио фрагмента больше не нужно и освобождается вместе со слотом.
+        """
+        transcriptions = await self._stt.transcribe(
+            audio_data=chunk.data,
+            audio_format=PREPARED_AUDIO_FORMAT,
+            speakers_count=speakers_count
+        )
+        profiles = await self._audio_processor.get_speaker_profiles(
+            chunk.data,
+            audio_format=PREPARED_AUDIO_FORMAT,
+            utterances=[
+                (transcription.speaker_id, transcription.start, transcription.end)
+                for transcription in transcriptions
+                if transcription.start is not None and transcription.end is not None
+            ]
+        )
+        for transcription in transcriptions:
+            if transcription.start is not None:
+                transcription.start += chunk.offset
+            if transcription.end is not None:
+                transcription.end += chunk.offset
+        return transcriptions, profiles
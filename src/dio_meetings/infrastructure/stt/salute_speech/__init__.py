@@ -1,5 +1,7 @@
 __all__ = (
-    "SaluteSpeech"
+    "SaluteSpeech",
+    "PollingStrategy"
 )
 
 from .stt import SaluteSpeech
+from .polling import PollingStrategy
@@ -1,13 +1,18 @@
 from typing import Optional, Union
+from collections.abc import AsyncIterable, AsyncIterator
 
 import json
 import base64
+import hashlib
 import logging
 from uuid import UUID, uuid4
 
 import aiohttp
+from redis.asyncio import Redis
 
-from .schemas import TaskResult, FinishedTaskResult, RecognizedResult
+from .auth import TokenManager
+from .schemas import AccessToken, TaskResult, FinishedTaskResult
+from .parser import iter_json_array, to_transcription
 from .exceptions import AuthorizationError, UploadError, TaskError, DownloadError
 from .constants import (
     SCOPE,
@@ -22,20 +27,27 @@ from .constants import (
     # MAX_SPEECH_TIMEOUT,
     # NO_SPEECH_TIMEOUT,
     # HYPOTHESES_COUNT,
+    TOKEN_CACHE_PREFIX,
+    DOWNLOAD_CHUNK_SIZE,
     STATUS_200_OK,
     STATUS_401_UNAUTHORIZED
 )
 from .utils import get_content_type, get_audio_encoding
 
+from src.dio_meetings.core.dto import Transcription
+from src.dio_meetings.infrastructure.http import HTTPClient
+
 
 class SberDevicesAPI:
     def __init__(
             self,
+            http_client: HTTPClient,
             api_key: Optional[str] = None,
             client_id: Optional[str] = None,
             client_secret: Optional[str] = None,
             scope: SCOPE = "SALUTE_SPEECH_PERS",
-            ssl_check: bool = False
+            ssl_check: bool = False,
+            redis: Optional[Redis] = None
     ) -> None:
         self._api_key = api_key
         self._client_id = client_id
@@ -43,12 +55,32 @@ class SberDevicesAPI:
         self._scope = scope
         self._rq_uuid = str(uuid4())
         self._ssl_check = ssl_check
+        self._http_client = http_client
+        self._token_manager = TokenManager(
+            authorize=self._authorize,
+            cache_key=self.__create_cache_key(),
+            redis=redis
+        )
 
     def __create_api_key(self) -> str:
         credentials = f"{self._client_id}:{self._client_secret}"
         return base64.b64encode(credentials.encode("utf-8")).decode("utf-8")
 
-    async def _authorize(self) -> Optional[str]:
+    def __create_cache_key(self) -> str:
+        credentials = self._api_key if self._api_key else self.__create_api_key()
+        credentials_hash = hashlib.sha256(credentials.encode("utf-8")).hexdigest()[:16]
+        return f"{TOKEN_CACHE_PREFIX}:{self._scope}:{credentials_hash}"
+
+    async def _get_access_token(self) -> str:
+        """Возвращает закэшированный access token, при необходимости обновляя его"""
+        return await self._token_manager.get_token()
+
+    async def _handle_unauthorized(self, status: int) -> None:
+        """Сбрасывает кэш токена, если API отклонило его"""
+        if status == STATUS_401_UNAUTHORIZED:
+            await self._token_manager.invalidate()
+
+    async def _authorize(self) -> Optional[AccessToken]:
         """Возвращает access token для авторизации"""
         url = f"{SBER_DEVICES_URL}/oauth"
         headers = {
@@ -59,19 +91,18 @@ class SberDevicesAPI:
         }
         payload = {"scope": self._scope}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                        url=url,
-                        headers=headers,
-                        data=payload,
-                        ssl=self._ssl_check
-                ) as response:
-                    if response.status == STATUS_401_UNAUTHORIZED:
-                        return None
-                    if response.status != STATUS_200_OK:
-                        raise AuthorizationError(f"Auth failed with status {response.status}")
-                    data = await response.json()
-            return data["access_token"]
+            async with self._http_client.session.post(
+                    url=url,
+                    headers=headers,
+                    data=payload,
+                    ssl=self._ssl_check
+            ) as response:
+                if response.status == STATUS_401_UNAUTHORIZED:
+                    return None
+                if response.status != STATUS_200_OK:
+                    raise AuthorizationError(f"Auth failed with status {response.status}")
+                data = await response.json()
+            return AccessToken.model_validate(data)
         except aiohttp.ClientError as e:
             raise AuthorizationError(f"Error while authorizations: {e}") from e
 
@@ -79,6 +110,7 @@ class SberDevicesAPI:
 class SaluteSpeechAPI(SberDevicesAPI):
     def __init__(
             self,
+            http_client: HTTPClient,
             api_key: Optional[str] = None,
             client_id: Optional[str] = None,
             client_secret: Optional[str] = None,
@@ -86,42 +118,50 @@ class SaluteSpeechAPI(SberDevicesAPI):
             ssl_check: bool = False,
             model: MODEL = "general",
             profanity_check: bool = False,
+            redis: Optional[Redis] = None
     ) -> None:
         super().__init__(
+            http_client=http_client,
             api_key=api_key,
             client_id=client_id,
             client_secret=client_secret,
             scope=scope,
-            ssl_check=ssl_check
+            ssl_check=ssl_check,
+            redis=redis
         )
         self._logger = logging.getLogger(self.__class__.__name__)
         self._base_url = SALUTE_SPEECH_URL
         self._model = model
         self._profanity_check = profanity_check
 
-    async def upload_file(self, audio_file: bytes, file_format: str) -> Optional[UUID]:
+    async def upload_file(
+            self,
+            audio_file: Union[bytes, AsyncIterable[bytes]],
+            file_format: str
+    ) -> Optional[UUID]:
+        """Загружает аудио, поток байтов передаётся частями без буферизации всего файла"""
         url = f"{self._base_url}/data:upload"
-        access_token = await self._authorize()
+        access_token = await self._get_access_token()
         content_type = get_content_type(file_format)
         headers = {
             "Authorization": f"Bearer {access_token}",
             "Content-Type": content_type,
         }
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                        url=url,
-                        headers=headers,
-                        data=audio_file,
-                        ssl=self._ssl_check
-                ) as response:
-                    if response.status != STATUS_200_OK:
-                        error_data = await response.json()
-                        raise UploadError(
-                            f"File upload failed. Status: {response.status}."
-                            f"Error: {error_data}"
-                        )
-                    data = await response.json()
+            async with self._http_client.session.post(
+                    url=url,
+                    headers=headers,
+                    data=audio_file,
+                    ssl=self._ssl_check
+            ) as response:
+                if response.status != STATUS_200_OK:
+                    await self._handle_unauthorized(response.status)
+                    error_data = await response.json()
+                    raise UploadError(
+                        f"File upload failed. Status: {response.status}."
+                        f"Error: {error_data}"
+                    )
+                data = await response.json()
             return UUID(data["result"]["request_file_id"])
         except aiohttp.ClientError as e:
             self._logger.error(f"Error while uploading file: {e}")
@@ -137,7 +177,7 @@ class SaluteSpeechAPI(SberDevicesAPI):
             words: Optional[list[str]] = None
     ) -> Optional[TaskResult]:
         url = f"{self._base_url}/speech:async_recognize"
-        access_token = await self._authorize()
+        access_token = await self._get_access_token()
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json",
@@ -170,22 +210,22 @@ class SaluteSpeechAPI(SberDevicesAPI):
                 "eou_timeout": EOU_TIMEOUT
             }
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                        url=url,
-                        headers=headers,
-                        data=json.dumps(payload),
-                        ssl=self._ssl_check
-                ) as response:
-                    data = await response.json()
-                    if response.status != STATUS_200_OK:
-                        error_message = data.get("error", {}).get("message", "Unknown error")
-                        raise TaskError(
-                            f"Task Error. Status: {response.status}. "
-                            f"Error: {error_message}. "
-                            f"Full response: {data}"
-                        )
-                    return TaskResult.model_validate(data["result"])
+            async with self._http_client.session.post(
+                    url=url,
+                    headers=headers,
+                    data=json.dumps(payload),
+                    ssl=self._ssl_check
+            ) as response:
+                data = await response.json()
+                if response.status != STATUS_200_OK:
+                    await self._handle_unauthorized(response.status)
+                    error_message = data.get("error", {}).get("message", "Unknown error")
+                    raise TaskError(
+                        f"Task Error. Status: {response.status}. "
+                        f"Error: {error_message}. "
+                        f"Full response: {data}"
+                    )
+                return TaskResult.model_validate(data["result"])
         except aiohttp.ClientError as e:
             self._logger.error(f"Error while async recognizing: {e}")
             raise TaskError(f"Error while async recognizing: {e}") from e
@@ -195,7 +235,7 @@ class SaluteSpeechAPI(SberDevicesAPI):
             task_id: UUID
     ) -> Optional[Union[TaskResult, FinishedTaskResult]]:
         url = f"{self._base_url}/task:get"
-        access_token = await self._authorize()
+        access_token = await self._get_access_token()
         headers = {
             "Accept": "application/json",
             "Authorization": f"Bearer {access_token}"
@@ -203,15 +243,15 @@ class SaluteSpeechAPI(SberDevicesAPI):
         params = {"id": str(task_id)}
         payload = {}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                        url=url,
-                        params=params,
-                        headers=headers,
-                        data=json.dumps(payload),
-                        ssl=self._ssl_check
-                ) as response:
-                    data = await response.json()
+            async with self._http_client.session.get(
+                    url=url,
+                    params=params,
+                    headers=headers,
+                    data=json.dumps(payload),
+                    ssl=self._ssl_check
+            ) as response:
+                await self._handle_unauthorized(response.status)
+                data = await response.json()
             if data["status"] != STATUS_200_OK:
                 status = data["status"]
                 raise TaskError(f"Task Error. Status: {status}")
@@ -222,9 +262,36 @@ class SaluteSpeechAPI(SberDevicesAPI):
             self._logger.error(f"Error while receiving task: {e}")
             raise TaskError(f"Error while receiving task: {e}") from e
 
-    async def download_file(self, response_file_id: UUID) -> Optional[list[RecognizedResult]]:
+    async def cancel_task(self, task_id: UUID) -> None:
+        url = f"{self._base_url}/task:cancel"
+        access_token = await self._get_access_token()
+        headers = {
+            "Accept": "application/json",
+            "Authorization": f"Bearer {access_token}"
+        }
+        params = {"id": str(task_id)}
+        try:
+            async with self._http_client.session.post(
+                    url=url,
+                    params=params,
+                    headers=headers,
+                    ssl=self._ssl_check
+            ) as response:
+                if response.status != STATUS_200_OK:
+                    await self._handle_unauthorized(response.status)
+                    error_data = await response.json()
+                    raise TaskError(
+                        f"Task cancel Error. Status: {response.status}. "
+                        f"Error: {error_data}"
+                    )
+        except aiohttp.ClientError as e:
+            self._logger.error(f"Error while canceling task: {e}")
+            raise TaskError(f"Error while canceling task: {e}") from e
+
+    async def download_file(self, response_file_id: UUID) -> AsyncIterator[Transcription]:
+        """Скачивает результат распознавания, разбирая фразы по мере получения ответа"""
         url = f"{SALUTE_SPEECH_URL}/data:download"
-        access_token = await self._authorize()
+        access_token = await self._get_access_token()
         headers = {
             "Accept": "application/octet-stream",
             "Authorization": f"Bearer {access_token}"
@@ -232,23 +299,22 @@ class SaluteSpeechAPI(SberDevicesAPI):
         params = {"response_file_id": str(response_file_id)}
         payload = {}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                        url=url,
-                        headers=headers,
-                        params=params,
-                        data=payload,
-                        ssl=self._ssl_check
-                ) as response:
-                    if response.status != STATUS_200_OK:
-                        error_data = await response.json()
-                        raise DownloadError(
-                            f"Download Error. Status: {response.status}. "
-                            f"Error: {error_data}"
-                        )
-                    data = await response.text()
-            results = json.loads(data)
-            return [RecognizedResult.from_response(result) for result in results]
-        except aiohttp.ClientError as e:
+            async with self._http_client.session.get(
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    data=payload,
+                    ssl=self._ssl_check
+            ) as response:
+                if response.status != STATUS_200_OK:
+                    await self._handle_unauthorized(response.status)
+                    error_data = await response.json()
+                    raise DownloadError(
+                        f"Download Error. Status: {response.status}. "
+                        f"Error: {error_data}"
+                    )
+                async for result in iter_json_array(response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE)):
+                    yield to_transcription(result)
+        except (aiohttp.ClientError, ValueError) as e:
             self._logger.error(f"Error while downloading file: {e}")
             raise DownloadError(f"Error while downloading file: {e}") from e
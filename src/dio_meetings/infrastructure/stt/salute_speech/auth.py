@@ -0,0 +1,85 @@
+from typing import Optional
+from collections.abc import Awaitable, Callable
+
+import time
+import asyncio
+import logging
+
+from redis.asyncio import Redis
+
+from .schemas import AccessToken
+from .exceptions import AuthorizationError
+from .constants import TOKEN_REFRESH_MARGIN, TOKEN_LOCK_TIMEOUT
+
+MS = 1000
+
+
+class TokenManager:
+    """Кэширует access token до его истечения и обновляет его один раз при конкурентных запросах.
+    Если передан Redis, токен разделяется между процессами.
+    """
+    def __init__(
+            self,
+            authorize: Callable[[], Awaitable[Optional[AccessToken]]],
+            cache_key: str,
+            redis: Optional[Redis] = None,
+            refresh_margin: float = TOKEN_REFRESH_MARGIN
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._authorize = authorize
+        self._cache_key = cache_key
+        self._redis = redis
+        self._refresh_margin = refresh_margin
+        self._token: Optional[AccessToken] = None
+        self._lock = asyncio.Lock()
+
+    async def get_token(self) -> str:
+        if self._is_fresh(self._token):
+            return self._token.access_token
+        async with self._lock:
+            if self._is_fresh(self._token):
+                return self._token.access_token
+            token = await self._load_shared()
+            if not self._is_fresh(token):
+                token = await self._refresh()
+            self._token = token
+            return token.access_token
+
+    async def invalidate(self) -> None:
+        self._token = None
+        if self._redis:
+            await self._redis.delete(self._cache_key)
+
+    def _is_fresh(self, token: Optional[AccessToken]) -> bool:
+        return token is not None and token.expires_at / MS - time.time() > self._refresh_margin
+
+    async def _load_shared(self) -> Optional[AccessToken]:
+        if not self._redis:
+            return None
+        data = await self._redis.get(self._cache_key)
+        return AccessToken.model_validate_json(data) if data else None
+
+    async def _refresh(self) -> AccessToken:
+        if not self._redis:
+            return await self._fetch()
+        async with self._redis.lock(f"{self._cache_key}:lock", timeout=TOKEN_LOCK_TIMEOUT):
+            token = await self._load_shared()
+            if self._is_fresh(token):
+                return token
+            token = await self._fetch()
+            ttl = int(token.expires_at - time.time() * MS - self._refresh_margin * MS)
+            if ttl > 0:
+                await self._redis.set(self._cache_key, token.model_dump_json(), px=ttl)
+            return token
+
+    async def _fetch(self) -> AccessToken:
+        try:
+            token = await self._authorize()
+        except AuthorizationError:
+            await self.invalidate()
+            raise
+        if not token:
+            await self.invalidate()
+            raise AuthorizationError("Invalid credentials")
+        self._logger.info("Access token refreshed")
+        return token
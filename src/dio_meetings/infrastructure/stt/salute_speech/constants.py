@@ -78,8 +78,27 @@ EOU_TIMEOUT = 1  # Настройка распознавания конца фр
 # Используется в паре с WORDS
 
 
-# Таймаут для получения статуса задачи:
-DEFAULT_ASYNC_TIMEOUT = 1
+# Кэширование access token:
+TOKEN_REFRESH_MARGIN = 60  # Токен обновляется за столько секунд до истечения
+TOKEN_CACHE_PREFIX = "salute_speech:access_token"  # Префикс ключей токена в Redis
+TOKEN_LOCK_TIMEOUT = 30  # Время жизни блокировки обновления токена в Redis, сек
+
+
+# Опрос статуса задачи распознавания:
+REALTIME_FACTOR = 0.05  # Ожидаемое время распознавания относительно длительности аудио
+MIN_POLL_DELAY = 1  # Минимальная пауза между запросами статуса, сек
+MAX_POLL_DELAY = 30  # Максимальная пауза между запросами статуса, сек
+POLL_BACKOFF_MULTIPLIER = 2  # Множитель экспоненциального роста паузы
+POLL_JITTER = 0.2  # Доля случайного отклонения паузы
+MIN_TASK_DEADLINE = 300  # Минимальное время ожидания результата задачи, сек
+DEADLINE_FACTOR = 1  # Время ожидания результата относительно длительности аудио
+
+# Размер части ответа при скачивании результата распознавания, байт:
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Статусы завершённых задач:
+TASK_DONE = "DONE"
+TASK_FAILED_STATUSES = ("ERROR", "CANCELED")
 
 # Значения по умолчанию:
 ENABLE_SPEAKERS_DIARIZATION = True  # Разделение по спикерам
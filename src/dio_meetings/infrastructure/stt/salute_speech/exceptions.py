@@ -14,3 +14,7 @@ class TaskError(Exception):
 
 class DownloadError(Exception):
     pass
+
+
+class TaskTimeoutError(TaskError):
+    pass
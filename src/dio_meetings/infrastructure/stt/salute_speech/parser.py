@@ -0,0 +1,84 @@
+from typing import Any, Optional
+from collections.abc import AsyncIterable, AsyncIterator
+
+import json
+import codecs
+
+from .constants import EMOTION
+
+from src.dio_meetings.core.dto import Transcription
+from src.dio_meetings.core.enums import Emotion
+
+WHITESPACE = " \t\n\r"
+ARRAY_START = "["
+ARRAY_END = "]"
+SEPARATOR = ","
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """Инкрементально разбирает JSON массив объектов из потока байтов, отдавая элементы по мере получения"""
+    decoder = json.JSONDecoder()
+    utf8_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    position = 0
+    is_started = False
+    is_finished = False
+    iterator = aiter(chunks)
+    while True:
+        while position < len(buffer) and buffer[position] in WHITESPACE:
+            position += 1
+        if position < len(buffer):
+            if not is_started:
+                if buffer[position] != ARRAY_START:
+                    raise ValueError("Recognition result must be a JSON array")
+                is_started = True
+                position += 1
+                continue
+            if buffer[position] == ARRAY_END:
+                return
+            if buffer[position] == SEPARATOR:
+                position += 1
+                continue
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if is_finished:
+                    raise
+            else:
+                # Элементы - объекты, поэтому успешный разбор означает, что элемент получен целиком
+                yield item
+                position = end
+                continue
+        elif is_finished:
+            raise ValueError("Unexpected end of recognition result")
+        try:
+            chunk = await anext(iterator)
+            text = utf8_decoder.decode(chunk)
+        except StopAsyncIteration:
+            text = utf8_decoder.decode(b"", final=True)
+            is_finished = True
+        buffer = buffer[position:] + text
+        position = 0
+
+
+def parse_duration(duration: Optional[str]) -> Optional[float]:
+    """Переводит длительность формата '1.520s' в секунды"""
+    if not duration:
+        return None
+    return float(duration.rstrip("s"))
+
+
+def get_emotion(emotions: dict[EMOTION, float]) -> Emotion:
+    return Emotion(max(emotions.items(), key=lambda x: x[1])[0])
+
+
+def to_transcription(response: dict[str, Any]) -> Transcription:
+    """Собирает фразу из ответа SaluteSpeech без промежуточных моделей и повторной валидации"""
+    result = response["results"][0]
+    return Transcription.model_construct(
+        text=result["normalized_text"],
+        speaker_id=response["speaker_info"]["speaker_id"],
+        emotion=get_emotion(response["emotions_result"]),
+        start=parse_duration(result.get("start")),
+        end=parse_duration(result.get("end"))
+    )
@@ -0,0 +1,53 @@
+from collections.abc import Iterator
+
+import random
+
+from .constants import (
+    REALTIME_FACTOR,
+    MIN_POLL_DELAY,
+    MAX_POLL_DELAY,
+    POLL_BACKOFF_MULTIPLIER,
+    POLL_JITTER,
+    MIN_TASK_DEADLINE,
+    DEADLINE_FACTOR
+)
+
+
+class PollingStrategy:
+    """Расписание опроса статуса задачи: первая пауза оценивается по длительности аудио,
+    далее пауза растёт экспоненциально со случайным отклонением.
+    """
+    def __init__(
+            self,
+            realtime_factor: float = REALTIME_FACTOR,
+            min_delay: float = MIN_POLL_DELAY,
+            max_delay: float = MAX_POLL_DELAY,
+            multiplier: float = POLL_BACKOFF_MULTIPLIER,
+            jitter: float = POLL_JITTER,
+            min_deadline: float = MIN_TASK_DEADLINE,
+            deadline_factor: float = DEADLINE_FACTOR
+    ) -> None:
+        self._realtime_factor = realtime_factor
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._multiplier = multiplier
+        self._jitter = jitter
+        self._min_deadline = min_deadline
+        self._deadline_factor = deadline_factor
+
+    def get_deadline(self, audio_duration: float) -> float:
+        """Максимальное время ожидания результата задачи, сек"""
+        return max(self._min_deadline, audio_duration * self._deadline_factor)
+
+    def delays(self, audio_duration: float) -> Iterator[float]:
+        """Паузы перед каждым запросом статуса: сначала ожидаемое время распознавания,
+        затем экспоненциально растущие паузы от min_delay до max_delay.
+        """
+        yield self._with_jitter(max(audio_duration * self._realtime_factor, self._min_delay))
+        delay = self._min_delay
+        while True:
+            yield self._with_jitter(delay)
+            delay = min(delay * self._multiplier, self._max_delay)
+
+    def _with_jitter(self, delay: float) -> float:
+        return delay * random.uniform(1 - self._jitter, 1 + self._jitter)
@@ -1,11 +1,15 @@
-from typing import Any, Literal, Optional, Union
+from typing import Literal, Union
 
 from uuid import UUID
 from datetime import datetime
 
 from pydantic import BaseModel
 
-from .constants import EMOTION
+
+class AccessToken(BaseModel):
+    """Access token SberDevices"""
+    access_token: str  # Токен доступа
+    expires_at: int    # Время истечения токена, unix time в миллисекундах
 
 
 class TaskResult(BaseModel):
@@ -35,22 +39,3 @@ class FinishedTaskResult(BaseModel):
         "ERROR"
     ]  # статус задачи
     response_file_id: UUID
-
-
-class RecognizedResult(BaseModel):
-    """Результат распознавания части аудио"""
-    text: str
-    speaker_id: Optional[int]
-    emotion: EMOTION
-
-    @classmethod
-    def from_response(cls, response: dict[str, Any]) -> "RecognizedResult":
-        return cls(
-            text=response["results"][0]["normalized_text"],
-            speaker_id=response["speaker_info"]["speaker_id"],
-            emotion=cls._get_emotion(response["emotions_result"])
-        )
-
-    @staticmethod
-    def _get_emotion(emotions: dict[EMOTION, float]) -> EMOTION:
-        return max(emotions.items(), key=lambda x: x[1])[0]
@@ -1,9 +1,22 @@
+from typing import Optional, Union
+from collections.abc import AsyncIterable, AsyncIterator
+
+import time
 import asyncio
+import logging
+from uuid import UUID
+
+from redis.asyncio import Redis
 
 from .api import SaluteSpeechAPI
-from .constants import SCOPE, DEFAULT_ASYNC_TIMEOUT
+from .polling import PollingStrategy
+from .schemas import TaskResult, FinishedTaskResult
+from .exceptions import TaskError, TaskTimeoutError
+from .utils import estimate_audio_duration
+from .constants import SCOPE, TASK_DONE, TASK_FAILED_STATUSES
 
 from src.dio_meetings.core.base import BaseSTT
+from src.dio_meetings.infrastructure.http import HTTPClient
 from src.dio_meetings.core.dto import Transcription
 
 
@@ -12,10 +25,18 @@ class SaluteSpeech(BaseSTT):
             self,
             api_key: str,
             scope: SCOPE,
-            async_timeout: int = DEFAULT_ASYNC_TIMEOUT
+            http_client: HTTPClient,
+            polling_strategy: Optional[PollingStrategy] = None,
+            redis: Optional[Redis] = None
     ) -> None:
-        self._salute_speech_api = SaluteSpeechAPI(api_key=api_key, scope=scope)
-        self._async_timeout = async_timeout
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._salute_speech_api = SaluteSpeechAPI(
+            api_key=api_key,
+            scope=scope,
+            redis=redis,
+            http_client=http_client
+        )
+        self._polling_strategy = polling_strategy or PollingStrategy()
 
     async def transcribe(
             self,
@@ -27,16 +48,81 @@ class SaluteSpeech(BaseSTT):
             audio_file=audio_data,
             file_format=audio_format
         )
+        return await self._recognize(request_file_id, audio_format, audio_size=len(audio_data))
+
+    async def transcribe_stream(
+            self,
+            audio_stream: AsyncIterable[bytes],
+            audio_format: str,
+            speakers_count: int
+    ) -> list[Transcription]:
+        audio_size = 0
+
+        async def count_size() -> AsyncIterator[bytes]:
+            nonlocal audio_size
+            async for chunk in audio_stream:
+                audio_size += len(chunk)
+                yield chunk
+
+        request_file_id = await self._salute_speech_api.upload_file(
+            audio_file=count_size(),
+            file_format=audio_format
+        )
+        return await self._recognize(request_file_id, audio_format, audio_size=audio_size)
+
+    async def _recognize(
+            self,
+            request_file_id: UUID,
+            audio_format: str,
+            audio_size: int
+    ) -> list[Transcription]:
         task_result = await self._salute_speech_api.async_recognize(
             request_file_id=request_file_id,
             file_format=audio_format
         )
-        while task_result.status != "DONE":
-            await asyncio.sleep(self._async_timeout)
-            task_result = await self._salute_speech_api.get_task_status(task_result.id)
+        task_result = await self._wait_for_result(
+            task_result,
+            audio_duration=estimate_audio_duration(audio_size, audio_format)
+        )
         response_file_id = task_result.response_file_id
-        recognized_results = await self._salute_speech_api.download_file(response_file_id)
         return [
-            Transcription.model_validate(recognized_result.model_dump())
-            for recognized_result in recognized_results
+            transcription
+            async for transcription in self._salute_speech_api.download_file(response_file_id)
         ]
+
+    async def _wait_for_result(
+            self,
+            task_result: Union[TaskResult, FinishedTaskResult],
+            audio_duration: float
+    ) -> FinishedTaskResult:
+        """Опрашивает статус задачи до её завершения, ошибки или истечения дедлайна"""
+        started_at = time.monotonic()
+        deadline = started_at + self._polling_strategy.get_deadline(audio_duration)
+        polls_count = 0
+        delays = self._polling_strategy.delays(audio_duration)
+        while task_result.status != TASK_DONE:
+            if task_result.status in TASK_FAILED_STATUSES:
+                raise TaskError(f"Recognition task {task_result.id} finished with status {task_result.status}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                await self._cancel_task(task_result.id)
+                raise TaskTimeoutError(
+                    f"Recognition task {task_result.id} not finished "
+                    f"in {time.monotonic() - started_at:.0f} seconds"
+                )
+            await asyncio.sleep(min(next(delays), remaining))
+            task_result = await self._salute_speech_api.get_task_status(task_result.id)
+            polls_count += 1
+        self._logger.info(
+            "Recognition task %s finished in %.1fs after %d status requests",
+            task_result.id,
+            time.monotonic() - started_at,
+            polls_count
+        )
+        return task_result
+
+    async def _cancel_task(self, task_id: Union[UUID, str]) -> None:
+        try:
+            await self._salute_speech_api.cancel_task(task_id)
+        except TaskError as e:
+            self._logger.warning("Failed to cancel recognition task %s: %s", task_id, e)
@@ -1,5 +1,7 @@
 from .constants import CONTENT_TYPE, AUDIO_ENCODING
 
+from src.dio_meetings.constants import ESTIMATED_BITRATES, DEFAULT_ESTIMATED_BITRATE
+
 
 CONTENT_TYPES_DICT: dict[str, CONTENT_TYPE] = {
     "mp3": "audio/mpeg",
@@ -26,3 +28,9 @@ def get_audio_encoding(file_format: str) -> AUDIO_ENCODING:
     if not audio_encoding:
         raise ValueError("Unsupported file type")
     return audio_encoding
+
+
+def estimate_audio_duration(size: int, file_format: str) -> float:
+    """Грубо оценивает длительность аудио в секундах по размеру в байтах и типичному битрейту"""
+    bitrate = ESTIMATED_BITRATES.get(file_format, DEFAULT_ESTIMATED_BITRATE)
+    return size * 8 / bitrate
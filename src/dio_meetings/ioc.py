@@ -1,34 +1,65 @@
-from collections.abc import AsyncIterable
+from collections.abc import AsyncIterable, Iterable
 
 from dishka import Provider, provide, Scope, from_context, make_async_container
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from redis.asyncio import Redis
+
 from faststream.redis import RedisBroker
 
-from .core.services import SummarizationService, TaskService, FileService
-from .core.domain import Task
+from .core.services import (
+    SummarizationService,
+    TaskService,
+    FileService,
+    UploadService,
+    AudioPreparationService,
+    TranscriptService,
+    DocumentService
+)
+from .core.domain import Task, LLMThroughput
 from .core.base import (
+    AudioProcessor,
     BaseLLM,
     BaseSTT,
     DocumentFactory,
     FileStorage,
     CRUDRepository,
-    FileMetadataRepository
+    FileMetadataRepository,
+    UploadSessionRepository,
+    TranscriptRepository,
+    TextStream
 )
 
-from .infrastructure.documents import MicrosoftWordFactory
+from .infrastructure.audio import FFmpegAudioProcessor
+from .infrastructure.documents import MarkdownDocumentFactory
 from .infrastructure.llms.yandex_gpt import YandexGPT
 from .infrastructure.llms.giga_chat import GigaChatLLM
-from .infrastructure.stt.salute_speech import SaluteSpeech
+from .infrastructure.llms.cache import (
+    LLMCache,
+    CachedLLM,
+    LOCK_PREFIX as LLM_LOCK_PREFIX,
+    LOCK_TIMEOUT as LLM_LOCK_TIMEOUT
+)
+from .infrastructure.llms.router import LLMRouter
+from .infrastructure.stt.salute_speech import SaluteSpeech, PollingStrategy
+from .infrastructure.stt.chunked import ChunkedSTT
 from src.dio_meetings.infrastructure.s3 import S3Client
+from .infrastructure.http import HTTPClient
+from .infrastructure.streams import RedisTextStream
 from .infrastructure.database.session import create_session_maker
 from src.dio_meetings.infrastructure.database.repositories import (
     SQLTaskRepository,
-    SQLFileMetadataRepository
+    SQLFileMetadataRepository,
+    SQLUploadSessionRepository,
+    SQLTranscriptRepository
 )
 
+from .transcoding import TranscodingScheduler
+from .estimation import TaskEstimator
+from .single_flight import SingleFlight
 from .settings import Settings
+from .constants import RENDERING_LOCK_TIMEOUT, LLM_THROUGHPUT, SUMMARY_OUTPUT_TOKENS
 
 
 class AppProvider(Provider):
@@ -38,6 +69,25 @@ class AppProvider(Provider):
     def get_broker(self, config: Settings) -> RedisBroker:
         return RedisBroker(config.redis.redis_url)
 
+    @provide(scope=Scope.APP)
+    async def get_redis(self, config: Settings) -> AsyncIterable[Redis]:
+        redis = Redis.from_url(config.redis.redis_url)
+        yield redis
+        await redis.aclose()
+
+    @provide(scope=Scope.APP)
+    async def get_http_client(self, config: Settings) -> AsyncIterable[HTTPClient]:
+        http_client = HTTPClient(
+            limit=config.http_client.LIMIT,
+            limit_per_host=config.http_client.LIMIT_PER_HOST,
+            keepalive_timeout=config.http_client.KEEPALIVE_TIMEOUT,
+            dns_cache_ttl=config.http_client.DNS_CACHE_TTL,
+            connect_timeout=config.http_client.CONNECT_TIMEOUT,
+            read_timeout=config.http_client.READ_TIMEOUT
+        )
+        yield http_client
+        await http_client.close()
+
     @provide(scope=Scope.APP)
     def get_session_maker(self, config: Settings) -> async_sessionmaker[AsyncSession]:
         return create_session_maker(config.postgres)
@@ -51,27 +101,126 @@ class AppProvider(Provider):
             yield session
 
     @provide(scope=Scope.APP)
-    def get_stt(self, config: Settings) -> BaseSTT:
-        return SaluteSpeech(
+    def get_stt(
+            self,
+            config: Settings,
+            audio_processor: AudioProcessor,
+            redis: Redis,
+            http_client: HTTPClient
+    ) -> BaseSTT:
+        salute_speech = SaluteSpeech(
             api_key=config.salute_speech.API_KEY,
-            scope=config.salute_speech.SCOPE
+            scope=config.salute_speech.SCOPE,
+            polling_strategy=PollingStrategy(
+                max_delay=config.salute_speech.MAX_POLL_DELAY,
+                min_deadline=config.salute_speech.TASK_DEADLINE
+            ),
+            redis=redis if config.salute_speech.SHARED_TOKEN else None,
+            http_client=http_client
+        )
+        if not config.salute_speech.CHUNK_DURATION:
+            return salute_speech
+        return ChunkedSTT(
+            stt=salute_speech,
+            audio_processor=audio_processor,
+            chunk_duration=config.salute_speech.CHUNK_DURATION * 60,
+            max_concurrency=config.salute_speech.MAX_CONCURRENCY
         )
 
     @provide(scope=Scope.APP)
-    def get_llm(self, config: Settings) -> BaseLLM:
-        # return YandexGPT(
-        #    folder_id=config.yandex_gpt.FOLDER_ID,
-        #    api_key=config.yandex_gpt.API_KEY
-        # )
-        return GigaChatLLM(
-            api_key=config.giga_chat.API_KEY,
-            scope=config.giga_chat.SCOPE,
-            model=config.giga_chat.MODEL_NAME
+    def get_llm_cache(self, config: Settings, redis: Redis) -> LLMCache:
+        return LLMCache(
+            redis=redis,
+            ttl=config.llm_cache.TTL,
+            max_entries=config.llm_cache.MAX_ENTRIES
         )
 
-    @provide(scope=Scope.REQUEST)
-    def get_document_factory(self) -> DocumentFactory:
-        return MicrosoftWordFactory()
+    @provide(scope=Scope.APP)
+    def get_llm(self, config: Settings, redis: Redis, http_client: HTTPClient, llm_cache: LLMCache) -> BaseLLM:
+        providers: dict[str, BaseLLM] = {
+            "giga_chat": GigaChatLLM(
+                api_key=config.giga_chat.API_KEY,
+                scope=config.giga_chat.SCOPE,
+                model=config.giga_chat.MODEL_NAME
+            )
+        }
+        models = {"giga_chat": config.giga_chat.MODEL_NAME}
+        if config.yandex_gpt.enabled:
+            yandex_gpt = YandexGPT(
+                folder_id=config.yandex_gpt.FOLDER_ID,
+                api_key=config.yandex_gpt.API_KEY,
+                http_client=http_client
+            )
+            providers["yandex_gpt"] = yandex_gpt
+            models["yandex_gpt"] = yandex_gpt.model_uri
+        llm = providers["giga_chat"] if len(providers) == 1 else LLMRouter(
+            providers=providers,
+            hedging_enabled=config.llm_router.HEDGING_ENABLED,
+            hedge_min_delay=config.llm_router.HEDGE_MIN_DELAY,
+            failure_threshold=config.llm_router.FAILURE_THRESHOLD,
+            recovery_timeout=config.llm_router.RECOVERY_TIMEOUT
+        )
+        if not config.llm_cache.ENABLED:
+            return llm
+        # Ответы разных провайдеров взаимозаменяемы, поэтому кэш общий для их набора,
+        # а модели провайдеров входят в ключ, чтобы после смены модели не отдавать старые ответы
+        model_name = ",".join(f"{provider}:{model}" for provider, model in models.items())
+        return CachedLLM(
+            llm=llm,
+            cache=llm_cache,
+            model_name=model_name,
+            single_flight=SingleFlight(redis=redis, prefix=LLM_LOCK_PREFIX, lock_timeout=LLM_LOCK_TIMEOUT)
+        )
+
+    @provide(scope=Scope.APP)
+    def get_text_stream(self, redis: Redis) -> TextStream:
+        return RedisTextStream(redis=redis)
+
+    @provide(scope=Scope.APP)
+    def get_audio_processor(self, config: Settings) -> Iterable[AudioProcessor]:
+        audio_processor = FFmpegAudioProcessor(
+            max_workers=config.audio_processing.PROCESS_POOL_SIZE,
+            vad_enabled=config.audio_processing.VAD_ENABLED,
+            vad_top_db=config.audio_processing.VAD_TOP_DB,
+            vad_min_silence=config.audio_processing.VAD_MIN_SILENCE
+        )
+        yield audio_processor
+        audio_processor.close()
+
+    @provide(scope=Scope.APP)
+    def get_document_factory(self, config: Settings) -> Iterable[DocumentFactory]:
+        document_factory = MarkdownDocumentFactory(
+            max_workers=config.documents.PROCESS_POOL_SIZE,
+            template_path=config.documents.TEMPLATE_PATH
+        )
+        yield document_factory
+        document_factory.close()
+
+    @provide(scope=Scope.APP)
+    def get_single_flight(self, redis: Redis) -> SingleFlight:
+        return SingleFlight(redis=redis, prefix="documents:rendering", lock_timeout=RENDERING_LOCK_TIMEOUT)
+
+    @provide(scope=Scope.APP)
+    def get_transcoding_scheduler(self, config: Settings) -> TranscodingScheduler:
+        return TranscodingScheduler(
+            max_concurrency=config.transcoding.MAX_CONCURRENCY,
+            max_queue_size=config.transcoding.MAX_QUEUE_SIZE,
+            retry_after=config.transcoding.RETRY_AFTER
+        )
+
+    @provide(scope=Scope.APP)
+    def get_task_estimator(self, config: Settings) -> TaskEstimator:
+        providers = ["giga_chat", "yandex_gpt"] if config.yandex_gpt.enabled else ["giga_chat"]
+        # Маршрутизатор отправляет запросы самому быстрому доступному провайдеру
+        llm_throughput = min(
+            [LLMThroughput.model_validate(LLM_THROUGHPUT[provider]) for provider in providers],
+            key=lambda throughput: throughput.get_latency(config.summarization.MAX_CHUNK_TOKENS, SUMMARY_OUTPUT_TOKENS)
+        )
+        return TaskEstimator(
+            max_chunk_tokens=config.summarization.MAX_CHUNK_TOKENS,
+            max_concurrency=config.summarization.MAX_CONCURRENCY,
+            llm_throughput=llm_throughput
+        )
 
     @provide(scope=Scope.APP)
     def get_file_storage(self, config: Settings) -> FileStorage:
@@ -89,32 +238,48 @@ class AppProvider(Provider):
     def get_file_metadata_repository(self, session: AsyncSession) -> FileMetadataRepository:
         return SQLFileMetadataRepository(session)
 
+    @provide(scope=Scope.REQUEST)
+    def get_upload_session_repository(self, session: AsyncSession) -> UploadSessionRepository:
+        return SQLUploadSessionRepository(session)
+
+    @provide(scope=Scope.REQUEST)
+    def get_transcript_repository(self, session: AsyncSession) -> TranscriptRepository:
+        return SQLTranscriptRepository(session)
+
     @provide(scope=Scope.REQUEST)
     def get_task_service(
             self,
             task_repository: CRUDRepository[Task],
             file_metadata_repository: FileMetadataRepository,
             file_storage: FileStorage,
-            broker: RedisBroker
+            broker: RedisBroker,
+            task_estimator: TaskEstimator,
+            text_stream: TextStream
     ) -> TaskService:
         return TaskService(
             task_repository=task_repository,
             file_metadata_repository=file_metadata_repository,
             file_storage=file_storage,
-            broker=broker
+            broker=broker,
+            task_estimator=task_estimator,
+            text_stream=text_stream
         )
 
     @provide(scope=Scope.REQUEST)
     def get_summarization_service(
             self,
+            config: Settings,
             stt: BaseSTT,
             llm: BaseLLM,
-            document_factory: DocumentFactory
+            text_stream: TextStream
     ) -> SummarizationService:
         return SummarizationService(
             stt=stt,
             llm=llm,
-            document_factory=document_factory
+            max_chunk_tokens=config.summarization.MAX_CHUNK_TOKENS,
+            max_concurrency=config.summarization.MAX_CONCURRENCY,
+            max_transcript_tokens=config.summarization.MAX_TRANSCRIPT_TOKENS,
+            text_stream=text_stream
         )
 
     @provide(scope=Scope.REQUEST)
@@ -128,6 +293,60 @@ class AppProvider(Provider):
             file_storage=file_storage
         )
 
+    @provide(scope=Scope.REQUEST)
+    def get_document_service(
+            self,
+            file_metadata_repository: FileMetadataRepository,
+            file_storage: FileStorage,
+            document_factory: DocumentFactory,
+            single_flight: SingleFlight
+    ) -> DocumentService:
+        return DocumentService(
+            file_metadata_repository=file_metadata_repository,
+            file_storage=file_storage,
+            document_factory=document_factory,
+            single_flight=single_flight
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_upload_service(
+            self,
+            upload_session_repository: UploadSessionRepository,
+            file_metadata_repository: FileMetadataRepository,
+            file_storage: FileStorage
+    ) -> UploadService:
+        return UploadService(
+            upload_session_repository=upload_session_repository,
+            file_metadata_repository=file_metadata_repository,
+            file_storage=file_storage
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_audio_preparation_service(
+            self,
+            file_metadata_repository: FileMetadataRepository,
+            file_storage: FileStorage,
+            audio_processor: AudioProcessor
+    ) -> AudioPreparationService:
+        return AudioPreparationService(
+            file_metadata_repository=file_metadata_repository,
+            file_storage=file_storage,
+            audio_processor=audio_processor
+        )
+
+
+    @provide(scope=Scope.REQUEST)
+    def get_transcript_service(
+            self,
+            transcript_repository: TranscriptRepository,
+            file_metadata_repository: FileMetadataRepository,
+            file_storage: FileStorage
+    ) -> TranscriptService:
+        return TranscriptService(
+            transcript_repository=transcript_repository,
+            file_metadata_repository=file_metadata_repository,
+            file_storage=file_storage
+        )
 
 settings = Settings()
 
@@ -1,9 +1,21 @@
+from typing import Optional
+
 import os
 from dotenv import load_dotenv
 
 from pydantic_settings import BaseSettings
 
-from .constants import ENV_PATH, PG_DRIVER
+from .constants import (
+    ENV_PATH,
+    PG_DRIVER,
+    MAX_CHUNK_TOKENS,
+    SUMMARIZATION_MAX_CONCURRENCY,
+    MAX_TRANSCRIPT_TOKENS,
+    TASK_VISIBILITY_TIMEOUT,
+    TASK_MAX_DELIVERIES
+)
+from .infrastructure.llms.cache import CACHE_TTL, CACHE_MAX_ENTRIES
+from .infrastructure.llms.router import HEDGE_MIN_DELAY, FAILURE_THRESHOLD, RECOVERY_TIMEOUT
 
 load_dotenv(ENV_PATH)
 
@@ -36,8 +48,12 @@ class MinioSettings(BaseSettings):
 
 
 class YandexGPTSettings(BaseSettings):
-    FOLDER_ID: str = os.getenv("YANDEX_FOLDER_ID")
-    API_KEY: str = os.getenv("YANDEX_GPT_API_KEY")
+    FOLDER_ID: Optional[str] = os.getenv("YANDEX_FOLDER_ID")  # Без ключей используется только GigaChat
+    API_KEY: Optional[str] = os.getenv("YANDEX_GPT_API_KEY")
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.FOLDER_ID and self.API_KEY)
 
 
 class GigaChatSettings(BaseSettings):
@@ -49,6 +65,64 @@ class GigaChatSettings(BaseSettings):
 class SaluteSpeechSettings(BaseSettings):
     SCOPE: str = os.getenv("SALUTE_SPEECH_SCOPE")
     API_KEY: str = os.getenv("SALUTE_SPEECH_API_KEY")
+    CHUNK_DURATION: float = os.getenv("SALUTE_SPEECH_CHUNK_DURATION", 10)  # Минуты, 0 - без деления
+    MAX_CONCURRENCY: int = os.getenv("SALUTE_SPEECH_MAX_CONCURRENCY", 4)
+    SHARED_TOKEN: bool = os.getenv("SALUTE_SPEECH_SHARED_TOKEN", False)  # Общий токен для процессов через Redis
+    MAX_POLL_DELAY: float = os.getenv("SALUTE_SPEECH_MAX_POLL_DELAY", 30)  # Максимальная пауза опроса статуса, сек
+    TASK_DEADLINE: float = os.getenv("SALUTE_SPEECH_TASK_DEADLINE", 300)  # Минимальный дедлайн задачи, сек
+
+
+class TranscodingSettings(BaseSettings):
+    MAX_CONCURRENCY: int = os.getenv("TRANSCODING_MAX_CONCURRENCY", os.cpu_count())
+    MAX_QUEUE_SIZE: int = os.getenv("TRANSCODING_MAX_QUEUE_SIZE", 16)
+    RETRY_AFTER: int = os.getenv("TRANSCODING_RETRY_AFTER", 30)
+
+
+class AudioProcessingSettings(BaseSettings):
+    PROCESS_POOL_SIZE: int = os.getenv("AUDIO_PROCESS_POOL_SIZE", os.cpu_count())
+    VAD_ENABLED: bool = os.getenv("AUDIO_VAD_ENABLED", True)
+    VAD_TOP_DB: float = os.getenv("AUDIO_VAD_TOP_DB", 40)
+    VAD_MIN_SILENCE: float = os.getenv("AUDIO_VAD_MIN_SILENCE", 2.0)
+
+
+class DocumentSettings(BaseSettings):
+    PROCESS_POOL_SIZE: int = os.getenv("DOCUMENT_PROCESS_POOL_SIZE", 2)  # Процессов для сборки документов
+    TEMPLATE_PATH: Optional[str] = os.getenv("DOCUMENT_TEMPLATE_PATH")  # DOCX шаблон со стилями, по умолчанию встроенный
+
+
+class SummarizationSettings(BaseSettings):
+    MAX_CHUNK_TOKENS: int = os.getenv("SUMMARIZATION_MAX_CHUNK_TOKENS", MAX_CHUNK_TOKENS)  # Размер части транскрипта для LLM
+    MAX_CONCURRENCY: int = os.getenv("SUMMARIZATION_MAX_CONCURRENCY", SUMMARIZATION_MAX_CONCURRENCY)  # Одновременных запросов к LLM
+    MAX_TRANSCRIPT_TOKENS: int = os.getenv("SUMMARIZATION_MAX_TRANSCRIPT_TOKENS", MAX_TRANSCRIPT_TOKENS)  # 0 - без ограничения
+
+
+class WorkerSettings(BaseSettings):
+    CONCURRENCY: int = os.getenv("WORKER_CONCURRENCY", 2)  # Задач, обрабатываемых одним воркером одновременно
+    SHUTDOWN_TIMEOUT: float = os.getenv("WORKER_SHUTDOWN_TIMEOUT", 60)  # Ожидание выполняемых задач при остановке, сек
+    VISIBILITY_TIMEOUT: float = os.getenv("WORKER_VISIBILITY_TIMEOUT", TASK_VISIBILITY_TIMEOUT)  # Задача без продления считается брошенной, сек
+    MAX_DELIVERIES: int = os.getenv("WORKER_MAX_DELIVERIES", TASK_MAX_DELIVERIES)  # Попыток выполнения задачи
+
+
+class LLMCacheSettings(BaseSettings):
+    ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", True)
+    TTL: int = os.getenv("LLM_CACHE_TTL", CACHE_TTL)  # Время жизни ответа в кэше, сек
+    MAX_ENTRIES: int = os.getenv("LLM_CACHE_MAX_ENTRIES", CACHE_MAX_ENTRIES)  # Максимум ответов в кэше
+
+
+class LLMRouterSettings(BaseSettings):
+    HEDGING_ENABLED: bool = os.getenv("LLM_HEDGING_ENABLED", False)  # Дублировать медленный запрос другому провайдеру
+    HEDGE_MIN_DELAY: float = os.getenv("LLM_HEDGE_MIN_DELAY", HEDGE_MIN_DELAY)  # Минимальная задержка дублирующего запроса, сек
+    FAILURE_THRESHOLD: int = os.getenv("LLM_FAILURE_THRESHOLD", FAILURE_THRESHOLD)  # Ошибок подряд до отключения провайдера
+    RECOVERY_TIMEOUT: float = os.getenv("LLM_RECOVERY_TIMEOUT", RECOVERY_TIMEOUT)  # Время отключения провайдера, сек
+
+
+class HTTPClientSettings(BaseSettings):
+    LIMIT: int = os.getenv("HTTP_POOL_LIMIT", 100)  # Максимум соединений всего
+    LIMIT_PER_HOST: int = os.getenv("HTTP_POOL_LIMIT_PER_HOST", 20)  # Максимум соединений к одному хосту
+    KEEPALIVE_TIMEOUT: float = os.getenv("HTTP_KEEPALIVE_TIMEOUT", 60)  # Время жизни простаивающего соединения, сек
+    DNS_CACHE_TTL: int = os.getenv("HTTP_DNS_CACHE_TTL", 300)  # Время кэширования DNS, сек
+    CONNECT_TIMEOUT: float = os.getenv("HTTP_CONNECT_TIMEOUT", 10)  # Таймаут установки соединения, сек
+    READ_TIMEOUT: float = os.getenv("HTTP_READ_TIMEOUT", 120)  # Таймаут чтения из сокета, сек
 
 
 class Settings(BaseSettings):
@@ -57,4 +131,12 @@ class Settings(BaseSettings):
     minio: MinioSettings = MinioSettings()
     yandex_gpt: YandexGPTSettings = YandexGPTSettings()
     giga_chat: GigaChatSettings = GigaChatSettings()
-    salute_speech: SaluteSpeechSettings = SaluteSpeechSettings()
\ No newline at end of file
+    salute_speech: SaluteSpeechSettings = SaluteSpeechSettings()
+    transcoding: TranscodingSettings = TranscodingSettings()
+    audio_processing: AudioProcessingSettings = AudioProcessingSettings()
+    http_client: HTTPClientSettings = HTTPClientSettings()
+    summarization: SummarizationSettings = SummarizationSettings()
+    documents: DocumentSettings = DocumentSettings()
+    llm_cache: LLMCacheSettings = LLMCacheSettings()
+    llm_router: LLMRouterSettings = LLMRouterSettings()
+    worker: WorkerSettings = WorkerSettings()
@@ -0,0 +1,77 @@
+from typing import Optional, TypeVar
+from collections.abc import Awaitable, Callable
+
+import asyncio
+import logging
+
+from redis.asyncio import Redis
+from redis.asyncio.lock import Lock
+from redis.exceptions import RedisError
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Выполняет одинаковые одновременные операции один раз.
+    В процессе ожидающие получают результат через общий Future, между процессами
+    операции упорядочиваются блокировкой в Redis. Операция должна сама проверять,
+    не сохранил ли результат процесс, державший блокировку до неё.
+    Блокировка - только оптимизация: если Redis недоступен или блокировку не удалось
+    получить за lock_timeout, операция выполняется без неё.
+    """
+    def __init__(self, redis: Optional[Redis] = None, prefix: str = "single_flight", lock_timeout: float = 60) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._redis = redis
+        self._prefix = prefix
+        self._lock_timeout = lock_timeout
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    async def run(self, key: str, operation: Callable[[], Awaitable[T]]) -> T:
+        if key in self._in_flight:
+            return await asyncio.shield(self._in_flight[key])
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._run_locked(key, operation) if self._redis else await operation()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Исключение получают ожидающие, здесь оно пробрасывается напрямую
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _run_locked(self, key: str, operation: Callable[[], Awaitable[T]]) -> T:
+        lock = self._redis.lock(
+            f"{self._prefix}:{key}",
+            timeout=self._lock_timeout,
+            blocking_timeout=self._lock_timeout
+        )
+        is_locked = await self._acquire(key, lock)
+        try:
+            return await operation()
+        finally:
+            if is_locked:
+                await self._release(key, lock)
+
+    async def _acquire(self, key: str, lock: Lock) -> bool:
+        try:
+            is_locked = await lock.acquire()
+        except RedisError as e:
+            self._logger.warning("Error while acquiring lock %s, running without it: %s", key, e)
+            return False
+        if not is_locked:
+            self._logger.warning("Lock %s was not acquired in %ss, running without it", key, self._lock_timeout)
+        return is_locked
+
+    async def _release(self, key: str, lock: Lock) -> None:
+        # Блокировка могла истечь, пока выполнялась операция, результат при этом уже получен
+        try:
+            await lock.release()
+        except RedisError as e:
+            self._logger.warning("Error while releasing lock %s: %s", key, e)
@@ -69,3 +69,37 @@ SUMMARY_TEMPLATE = """Задача: На основе транскрибации
 
 Транскрибация совещания:
 """
+
+
+PARTIAL_SUMMARY_TEMPLATE = """Задача: Ниже приведена часть транскрибации (текстовой расшифровки) совещания.
+Составь краткий конспект этой части, он будет объединён с конспектами остальных частей в протокол.
+
+Сохрани:
+ * Участников, которые упоминаются или выступают, и их роли;
+
+ * Обсуждаемые вопросы;
+
+ * Ключевые тезисы, мнения и предложения выступающих, включая разногласия;
+
+ * Принятые решения и поручения с ответственными и сроками;
+
+ * Название компании, вид совещания, дату и место, если они упоминаются.
+
+Не додумывай отсутствующие сведения. Пиши кратко, официально-деловым стилем, списками.
+
+
+Часть транскрибации совещания:
+"""
+
+COMBINE_SUMMARIES_TEMPLATE = """Задача: Ниже приведены конспекты последовательных частей одного совещания.
+Объедини их в один краткий конспект: убери повторы, сохрани всех участников, обсуждаемые вопросы,
+ключевые тезисы, разногласия, решения и поручения с ответственными и сроками.
+
+
+Конспекты частей совещания:
+"""
+
+SUMMARIES_HEADER = "Транскрибация совещания слишком длинная, поэтому приведены конспекты её последовательных частей:"
+
+TRANSCRIPT_LEGEND = "Формат транскрибации: каждая строка - реплика спикера S<номер>, в скобках указана эмоция, " \
+                    "если она у спикера изменилась (изначально - нейтрально)."
@@ -0,0 +1,127 @@
+from typing import Optional, TypeVar
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+import os
+import time
+import asyncio
+import logging
+
+from pydantic import BaseModel
+
+from .core.exceptions import TranscodingQueueFullError
+from .utils import SpooledStream
+
+T = TypeVar("T")
+
+
+class TranscodingJob(BaseModel):
+    queue_wait: float = 0.0            # Время ожидания в очереди, сек
+    wall_time: float = 0.0             # Время выполнения, сек
+    cpu_time: Optional[float] = None   # Процессорное время ffmpeg, сек
+
+    def set_cpu_time(self, cpu_time: Optional[float]) -> None:
+        self.cpu_time = cpu_time
+
+
+class TranscodingStats(BaseModel):
+    max_concurrency: int          # Максимум одновременно работающих ffmpeg процессов
+    max_queue_size: int           # Максимальная длина очереди ожидания
+    running: int                  # Выполняемые задачи
+    queue_depth: int              # Задачи в очереди
+    completed: int                # Завершённые задачи
+    rejected: int                 # Отклонённые из-за переполнения очереди задачи
+    wall_time_total: float        # Суммарное время выполнения, сек
+    cpu_time_total: float         # Суммарное процессорное время, сек
+
+
+class TranscodingScheduler:
+    def __init__(
+            self,
+            max_concurrency: Optional[int] = None,
+            max_queue_size: int = 0,
+            retry_after: int = 30
+    ) -> None:
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self._max_concurrency = max_concurrency or os.cpu_count() or 1
+        self._max_queue_size = max_queue_size
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        self._running = 0
+        self._waiting = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wall_time_total = 0.0
+        self._cpu_time_total = 0.0
+
+    @property
+    def stats(self) -> TranscodingStats:
+        return TranscodingStats(
+            max_concurrency=self._max_concurrency,
+            max_queue_size=self._max_queue_size,
+            running=self._running,
+            queue_depth=self._waiting,
+            completed=self._completed,
+            rejected=self._rejected,
+            wall_time_total=round(self._wall_time_total, 3),
+            cpu_time_total=round(self._cpu_time_total, 3)
+        )
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[TranscodingJob]:
+        """Занимает слот транскодирования, при переполненной очереди сразу отклоняет задачу"""
+        if self._running + self._waiting >= self._max_concurrency + self._max_queue_size:
+            self._rejected += 1
+            raise TranscodingQueueFullError(
+                f"Transcoding queue is full: running {self._running}, waiting {self._waiting}"
+            )
+        job = TranscodingJob()
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._running += 1
+        started_at = time.perf_counter()
+        job.queue_wait = started_at - queued_at
+        try:
+            yield job
+        finally:
+            self._running -= 1
+            self._semaphore.release()
+            job.wall_time = time.perf_counter() - started_at
+            self._completed += 1
+            self._wall_time_total += job.wall_time
+            self._cpu_time_total += job.cpu_time or 0.0
+            self._logger.info(
+                "Transcoding job finished: queue_wait=%.2fs wall=%.2fs cpu=%s queue_depth=%d",
+                job.queue_wait,
+                job.wall_time,
+                f"{job.cpu_time:.2f}s" if job.cpu_time is not None else "n/a",
+                self._waiting
+            )
+
+    async def run(
+            self,
+            transcode: Callable[[TranscodingJob], AsyncIterator[bytes]],
+            consume: Callable[[AsyncIterator[bytes]], Awaitable[T]]
+    ) -> T:
+        """Транскодирует в слоте и передаёт результат потребителю через временный файл.
+        Слот освобождается, как только транскодирование завершилось, а потребитель,
+        например, загрузка в S3, дочитывает остаток уже вне слота.
+        """
+        spooled_stream: Optional[SpooledStream] = None
+        consuming: Optional[asyncio.Task[T]] = None
+        try:
+            async with self.acquire() as job:
+                spooled_stream = SpooledStream(transcode(job))
+                consuming = asyncio.create_task(consume(spooled_stream.read()))
+                await spooled_stream.fill()
+            return await consuming
+        finally:
+            if consuming is not None and not consuming.done():
+                consuming.cancel()
+                await asyncio.gather(consuming, return_exceptions=True)
+            if spooled_stream is not None:
+                spooled_stream.close()
@@ -0,0 +1,101 @@
+from typing import Optional
+from collections.abc import Iterator
+
+import math
+import struct
+
+from .core.dto import Transcription
+from .core.enums import Emotion
+
+# Формат файла транскрипта:
+# заголовок - сигнатура, версия формата, количество фраз;
+# далее фразы по порядку - начало и конец (float32, NaN если неизвестно),
+# ID спикера (int16), код эмоции (uint8), длина текста (uint32) и текст в UTF-8.
+MAGIC = b"DIOT"
+VERSION = 1
+HEADER = struct.Struct("<4sBI")
+RECORD = struct.Struct("<ffhBI")
+
+EMOTIONS = list(Emotion)
+EMOTION_CODES = {emotion: code for code, emotion in enumerate(EMOTIONS)}
+
+
+def _pack_time(time: Optional[float]) -> float:
+    return math.nan if time is None else time
+
+
+def _unpack_time(time: float) -> Optional[float]:
+    return None if math.isnan(time) else round(time, 3)
+
+
+def encode_transcript(transcriptions: list[Transcription]) -> bytes:
+    """Кодирует фразы в компактный бинарный формат с префиксами длины"""
+    buffer = bytearray(HEADER.pack(MAGIC, VERSION, len(transcriptions)))
+    for transcription in transcriptions:
+        text = transcription.text.encode("utf-8")
+        buffer += RECORD.pack(
+            _pack_time(transcription.start),
+            _pack_time(transcription.end),
+            transcription.speaker_id,
+            EMOTION_CODES[Emotion(transcription.emotion)],
+            len(text)
+        )
+        buffer += text
+    return bytes(buffer)
+
+
+def get_utterances_count(data: bytes) -> int:
+    magic, version, count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Unsupported transcript format")
+    return count
+
+
+def _iter_records(
+        data: bytes,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+) -> Iterator[tuple[float, float, int, int, int, int]]:
+    """Перебирает заголовки фраз, начинающихся в диапазоне [start, end), не декодируя текст"""
+    count = get_utterances_count(data)
+    offset = HEADER.size
+    is_filtered = start is not None or end is not None
+    for _ in range(count):
+        phrase_start, phrase_end, speaker_id, emotion_code, text_size = RECORD.unpack_from(data, offset)
+        text_offset = offset + RECORD.size
+        offset = text_offset + text_size
+        if is_filtered:
+            if math.isnan(phrase_start):
+                continue
+            if start is not None and phrase_start < start:
+                continue
+            if end is not None and phrase_start >= end:
+                continue
+        yield phrase_start, phrase_end, speaker_id, emotion_code, text_offset, offset
+
+
+def _decode_record(data: bytes, record: tuple[float, float, int, int, int, int]) -> Transcription:
+    phrase_start, phrase_end, speaker_id, emotion_code, text_offset, text_end = record
+    return Transcription.model_construct(
+        text=data[text_offset:text_end].decode("utf-8"),
+        speaker_id=speaker_id,
+        emotion=EMOTIONS[emotion_code],
+        start=_unpack_time(phrase_start),
+        end=_unpack_time(phrase_end)
+    )
+
+
+def decode_transcript(data: bytes) -> list[Transcription]:
+    return [_decode_record(data, record) for record in _iter_records(data)]
+
+
+def read_transcript_page(
+        data: bytes,
+        start: Optional[float],
+        end: Optional[float],
+        offset: int,
+        limit: int
+) -> tuple[int, list[Transcription]]:
+    """Возвращает количество фраз в диапазоне времени и декодированную страницу из них"""
+    records = list(_iter_records(data, start, end))
+    return len(records), [_decode_record(data, record) for record in records[offset:offset + limit]]
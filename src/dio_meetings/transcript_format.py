@@ -0,0 +1,72 @@
+from typing import Optional
+
+from .core.dto import Transcription
+from .core.enums import Emotion
+from .utils import estimate_tokens
+
+SPEAKER_PREFIX = "S"
+EMOTION_LABELS = {
+    Emotion.POSITIVE: "позитив",
+    Emotion.NEUTRAL: "нейтрально",
+    Emotion.NEGATIVE: "негатив"
+}
+OMITTED_TURNS = "[... пропущено реплик: {count} ...]"
+
+
+def format_transcript_turns(transcriptions: list[Transcription]) -> list[str]:
+    """Кодирует транскрипт репликами вида 'S1: текст'.
+    Подряд идущие фразы одного спикера с одной эмоцией объединяются,
+    эмоция указывается только когда она у спикера меняется (начальная - нейтральная).
+    """
+    turns: list[str] = []
+    speaker_emotions: dict[int, Emotion] = {}
+    current_speaker: Optional[int] = None
+    current_emotion: Optional[Emotion] = None
+    texts: list[str] = []
+    for transcription in transcriptions:
+        text = transcription.text.strip()
+        if not text:
+            continue
+        emotion = Emotion(transcription.emotion)
+        if transcription.speaker_id == current_speaker and emotion == current_emotion:
+            texts.append(text)
+            continue
+        if texts:
+            turns.append(_format_turn(current_speaker, current_emotion, texts, speaker_emotions))
+        current_speaker, current_emotion, texts = transcription.speaker_id, emotion, [text]
+    if texts:
+        turns.append(_format_turn(current_speaker, current_emotion, texts, speaker_emotions))
+    return turns
+
+
+def _format_turn(
+        speaker_id: int,
+        emotion: Emotion,
+        texts: list[str],
+        speaker_emotions: dict[int, Emotion]
+) -> str:
+    label = f"{SPEAKER_PREFIX}{speaker_id}"
+    if speaker_emotions.get(speaker_id, Emotion.NEUTRAL) != emotion:
+        label = f"{label} ({EMOTION_LABELS[emotion]})"
+    speaker_emotions[speaker_id] = emotion
+    return f"{label}: {' '.join(texts)}"
+
+
+def fit_token_budget(turns: list[str], max_tokens: int) -> list[str]:
+    """Сокращает реплики до max_tokens токенов: сохраняются начало и конец совещания
+    поровну, середина заменяется отметкой о пропуске. Результат зависит только от входа.
+    """
+    tokens = [estimate_tokens(turn) for turn in turns]
+    if sum(tokens) <= max_tokens:
+        return turns
+    budget = max_tokens - estimate_tokens(OMITTED_TURNS.format(count=len(turns)))
+    head_count, head_tokens = 0, 0
+    while head_count < len(turns) and head_tokens + tokens[head_count] <= budget / 2:
+        head_tokens += tokens[head_count]
+        head_count += 1
+    tail_start, tail_tokens = len(turns), 0
+    while tail_start > head_count and head_tokens + tail_tokens + tokens[tail_start - 1] <= budget:
+        tail_tokens += tokens[tail_start - 1]
+        tail_start -= 1
+    omitted_count = tail_start - head_count
+    return [*turns[:head_count], OMITTED_TURNS.format(count=omitted_count), *turns[tail_start:]]
@@ -1,7 +1,11 @@
-from typing import Union
+from typing import Optional, Union, Protocol
+from collections.abc import AsyncGenerator, AsyncIterator, AsyncIterable, Callable
 
-import io
-import subprocess
+import os
+import math
+import asyncio
+import hashlib
+import tempfile
 from io import BytesIO
 from uuid import uuid4
 from pathlib import Path
@@ -9,10 +13,31 @@ from datetime import datetime
 
 from pydub import AudioSegment
 
+from .core.enums import FileType
+from .constants import (
+    AUDIO_FORMATS,
+    DOCUMENT_FORMATS,
+    UPLOAD_CHUNK_SIZE,
+    MP4_FORMATS,
+    MP4_PROBE_SIZE,
+    PREPARED_AUDIO_FORMAT,
+    PREPARED_AUDIO_SUFFIX,
+    TRANSCRIPT_SUFFIX,
+    TRANSCRIPT_FORMAT,
+    RENDERED_DOCUMENT_SUFFIX,
+    DOCUMENT_RENDERER_VERSION,
+    CHARS_PER_TOKEN
+)
+
 MS = 1000
+MB = 1024 * 1024
 DOCUMENT_PREFIX = "Протокол_совещания_"
 
 
+class AsyncReadable(Protocol):
+    async def read(self, size: int = -1) -> bytes: pass
+
+
 def generate_file_name(format: str) -> str:
     return f"{uuid4()}.{format}"
 
@@ -21,42 +46,304 @@ def get_document_file_name(format: str) -> str:
     return f"{DOCUMENT_PREFIX}{datetime.now()}.{format}"
 
 
+def get_prepared_file_name(key: str) -> str:
+    return f"{key.rsplit('.', 1)[0]}{PREPARED_AUDIO_SUFFIX}.{PREPARED_AUDIO_FORMAT}"
+
+
+def get_offset_map_file_name(key: str) -> str:
+    return f"{key.rsplit('.', 1)[0]}{PREPARED_AUDIO_SUFFIX}.json"
+
+
+def get_transcript_file_name(key: str) -> str:
+    return f"{key.rsplit('.', 1)[0]}{TRANSCRIPT_SUFFIX}.{TRANSCRIPT_FORMAT}"
+
+
+def get_rendered_file_name(key: str, format: str) -> str:
+    return f"{key.rsplit('.', 1)[0]}{RENDERED_DOCUMENT_SUFFIX}.v{DOCUMENT_RENDERER_VERSION}.{format}"
+
+
 def get_file_format(file_path: Union[Path, str]) -> str:
     return file_path.split(".")[-1]
 
 
+def get_file_type(format: str) -> FileType:
+    if format in AUDIO_FORMATS:
+        return FileType.AUDIO
+    elif format in DOCUMENT_FORMATS:
+        return FileType.DOCUMENT
+    else:
+        raise ValueError("Unsupported file format")
+
+
+def get_file_size(size_in_bytes: int) -> float:
+    return round(size_in_bytes / MB, 2)
+
+
+async def iter_chunks(
+        file: AsyncReadable,
+        chunk_size: int = UPLOAD_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def iter_file(path: str, chunk_size: int = UPLOAD_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Читает файл по частям в отдельном потоке, не блокируя event loop"""
+    with open(path, "rb") as file:
+        while chunk := await asyncio.to_thread(file.read, chunk_size):
+            yield chunk
+
+
+async def iter_bytes(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+
+def estimate_tokens(text: str) -> int:
+    """Грубая оценка количества токенов текста без обращения к токенизатору модели"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def split_by_tokens(texts: list[str], max_tokens: int) -> list[list[str]]:
+    """Группирует тексты по порядку в части не больше max_tokens токенов.
+    Текст, который сам превышает лимит, попадает в отдельную часть.
+    """
+    chunks: list[list[str]] = []
+    chunk: list[str] = []
+    chunk_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if chunk and chunk_tokens + tokens > max_tokens:
+            chunks.append(chunk)
+            chunk, chunk_tokens = [], 0
+        chunk.append(text)
+        chunk_tokens += tokens
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
 def get_audio_duration(audio_bytes: bytes, format: str) -> float:
     audio_segment = AudioSegment.from_file(BytesIO(audio_bytes), format=format)
     return len(audio_segment) / MS
 
 
-def convert_video_to_audio(video_bytes: bytes) -> bytes:
-    video_stream = io.BytesIO(video_bytes)
-    audio_stream = io.BytesIO()
+async def iter_with_hash(stream: AsyncIterable[bytes], hasher: "hashlib._Hash") -> AsyncIterator[bytes]:
+    async for chunk in stream:
+        hasher.update(chunk)
+        yield chunk
+
+
+def get_process_cpu_time(pid: int) -> Optional[float]:
+    """Возвращает процессорное время (user + system) процесса в секундах по данным /proc"""
+    try:
+        with open(f"/proc/{pid}/stat") as file:
+            stat = file.read()
+    except OSError:
+        return None
+    # Имя процесса в скобках может содержать пробелы, поэтому поля считаются после него
+    fields = stat[stat.rfind(")") + 2:].split()
+    utime, stime = int(fields[11]), int(fields[12])
+    return (utime + stime) / os.sysconf("SC_CLK_TCK")
+
+
+def is_faststart(header: bytes) -> Optional[bool]:
+    """Проверяет по верхнеуровневым атомам MP4/MOV, лежит ли индекс moov перед данными mdat.
+    None - в прочитанном начале файла ещё нет ни того, ни другого.
+    """
+    offset = 0
+    while offset + 8 <= len(header):
+        size = int.from_bytes(header[offset:offset + 4], "big")
+        box_type = header[offset + 4:offset + 8]
+        if box_type == b"moov":
+            return True
+        if box_type == b"mdat" or size == 0:
+            # Размер 0 - атом до конца файла, moov после него уже не встретится
+            return False
+        if size == 1:
+            if offset + 16 > len(header):
+                return None
+            size = int.from_bytes(header[offset + 8:offset + 16], "big")
+        if size < 8:
+            return False
+        offset += size
+    return None
+
+
+async def probe_faststart(video_stream: AsyncIterable[bytes]) -> tuple[bool, AsyncIterator[bytes]]:
+    """Читает начало MP4/MOV, пока не найдётся moov или mdat, но не больше MP4_PROBE_SIZE.
+    Возвращает, можно ли читать файл последовательно, и поток вместе с прочитанным началом.
+    """
+    iterator = aiter(video_stream)
+    header = bytearray()
+    faststart: Optional[bool] = None
+    async for chunk in iterator:
+        header += chunk
+        faststart = is_faststart(header)
+        if faststart is not None or len(header) >= MP4_PROBE_SIZE:
+            break
+
+    async def replay() -> AsyncIterator[bytes]:
+        yield bytes(header)
+        async for next_chunk in iterator:
+            yield next_chunk
+
+    return bool(faststart), replay()
+
+
+async def save_to_temp_file(
+        stream: AsyncIterable[bytes],
+        suffix: str = "",
+        directory: Optional[str] = None
+) -> str:
+    """Сохраняет поток во временный файл и возвращает путь, удалить файл должен вызывающий"""
+    file = tempfile.NamedTemporaryFile(suffix=suffix, dir=directory, delete=False)
+    try:
+        async for chunk in stream:
+            await asyncio.to_thread(file.write, chunk)
+    except BaseException:
+        file.close()
+        os.remove(file.name)
+        raise
+    file.close()
+    return file.name
+
+
+class SpooledStream:
+    """Буферизует поток во временном файле: источник читается со своей скоростью,
+    а потребитель получает данные из файла по мере записи и может отставать от источника"""
+    def __init__(self, stream: AsyncIterator[bytes], chunk_size: int = UPLOAD_CHUNK_SIZE) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._file = tempfile.NamedTemporaryFile(delete=False)
+        self._updated = asyncio.Event()
+        self._is_filled = False
+        self._is_abandoned = False
+        self._error: Optional[Exception] = None
+
+    def _write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+        self._file.flush()
+
+    async def fill(self) -> None:
+        """Читает источник до конца, ошибка источника передаётся потребителю через read"""
+        try:
+            async for chunk in self._stream:
+                if self._is_abandoned:
+                    break
+                await asyncio.to_thread(self._write, chunk)
+                self._updated.set()
+        except Exception as e:
+            self._error = e
+        finally:
+            if isinstance(self._stream, AsyncGenerator):
+                await self._stream.aclose()
+            self._file.close()
+            self._is_filled = True
+            self._updated.set()
+
+    async def read(self) -> AsyncIterator[bytes]:
+        try:
+            with open(self._file.name, "rb") as file:
+                while True:
+                    self._updated.clear()
+                    is_filled = self._is_filled
+                    chunk = await asyncio.to_thread(file.read, self._chunk_size)
+                    if chunk:
+                        yield chunk
+                    elif is_filled:
+                        break
+                    else:
+                        await self._updated.wait()
+            if self._error is not None:
+                raise self._error
+        finally:
+            # Потребитель больше не читает, дальше заполнять файл незачем
+            self._is_abandoned = True
+
+    def close(self) -> None:
+        self._file.close()
+        if os.path.exists(self._file.name):
+            os.remove(self._file.name)
+
+
+async def convert_video_to_audio(
+        video_stream: AsyncIterable[bytes],
+        video_format: Optional[str] = None,
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+        on_finish: Optional[Callable[[Optional[float]], None]] = None
+) -> AsyncIterator[bytes]:
+    """Потоково конвертирует видео в аудио через ffmpeg, не блокируя event loop.
+    MP4/MOV с индексом moov в конце файла (обычно так пишут телефоны и камеры) ffmpeg
+    не может читать из pipe без перемотки, поэтому такие файлы сначала сохраняются на диск.
+    """
+    input_path: Optional[str] = None
+    if video_format in MP4_FORMATS:
+        faststart, video_stream = await probe_faststart(video_stream)
+        if not faststart:
+            input_path = await save_to_temp_file(video_stream, suffix=f".{video_format}")
+    try:
+        async for chunk in _transcode_to_audio(video_stream, input_path, chunk_size, on_finish):
+            yield chunk
+    finally:
+        if input_path:
+            os.remove(input_path)
+
+
+async def _transcode_to_audio(
+        video_stream: AsyncIterable[bytes],
+        input_path: Optional[str],
+        chunk_size: int,
+        on_finish: Optional[Callable[[Optional[float]], None]]
+) -> AsyncIterator[bytes]:
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-loglevel", "error",         # Выводить в stderr только ошибки
+        "-i", input_path or "pipe:0",  # Вход из файла или из stdin
+        "-f", "mp3",                  # Формат вывода - MP3
+        "-ac", "2",                   # 2 аудиоканала (стерео)
+        "-ar", "44100",               # Частота дискретизации 44.1 kHz
+        "-b:a", "192k",               # Бит-рейт 192 kbps
+        "-vn",                        # Игнорировать видео поток
+        "pipe:1"                      # Вывод в stdout
+    ]
+    process = await asyncio.create_subprocess_exec(
+        *ffmpeg_cmd,
+        stdin=asyncio.subprocess.DEVNULL if input_path else asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+    async def write_stdin() -> None:
+        if input_path:
+            return
+        try:
+            async for chunk in video_stream:
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg завершился раньше, ошибка будет в коде возврата
+            pass
+        finally:
+            process.stdin.close()
+
+    stdin_task = asyncio.create_task(write_stdin())
+    stderr_task = asyncio.create_task(process.stderr.read())
+    cpu_time: Optional[float] = None
     try:
-        ffmpeg_cmd = [
-            "ffmpeg",
-            "-i", "pipe:0",  # Вход из stdin
-            "-f", "mp3",     # Формат вывода - MP3
-            "-ac", "2",      # 2 аудиоканала (стерео)
-            "-ar", "44100",  # Частота дискретизации 44.1 kHz
-            "-b:a", "192k",  # Бит-рейт 192 kbps
-            "-vn",           # Игнорировать видео поток
-            "pipe:1"         # Вывод в stdout
-        ]
-        process = subprocess.Popen(
-            ffmpeg_cmd,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        audio_bytes, stderr = process.communicate(input=video_bytes)
-        if process.returncode != 0:
-            error = stderr.decode("utf-8")
+        while chunk := await process.stdout.read(chunk_size):
+            cpu_time = get_process_cpu_time(process.pid) or cpu_time
+            yield chunk
+        cpu_time = get_process_cpu_time(process.pid) or cpu_time
+        await stdin_task
+        return_code = await process.wait()
+        if return_code != 0:
+            error = (await stderr_task).decode("utf-8", errors="replace")
             raise RuntimeError(f"FFmpeg error: {error}")
-        return audio_bytes
-    except Exception as e:
-        raise RuntimeError(f"Audio conversion failed: {e}") from e
     finally:
-        video_stream.close()
-        audio_stream.close()
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        stdin_task.cancel()
+        stderr_task.cancel()
+        if on_finish:
+            on_finish(cpu_time)
@@ -0,0 +1,23 @@
+import os
+
+# Настройки читаются из окружения при импорте модулей, внешние сервисы в тестах не используются
+TEST_ENVIRONMENT = {
+    "REDIS_HOST": "localhost",
+    "REDIS_PORT": "6379",
+    "POSTGRES_HOST": "localhost",
+    "POSTGRES_PORT": "5432",
+    "POSTGRES_USER": "test",
+    "POSTGRES_PASSWORD": "test",
+    "POSTGRES_DB": "test",
+    "MINIO_URL": "http://localhost:9000",
+    "MINIO_USER": "test",
+    "MINIO_PASSWORD": "test",
+    "GIGACHAT_API_KEY": "test",
+    "GIGACHAT_SCOPE": "test",
+    "GIGACHAT_MODEL_NAME": "GigaChat",
+    "SALUTE_SPEECH_SCOPE": "test",
+    "SALUTE_SPEECH_API_KEY": "test"
+}
+
+for name, value in TEST_ENVIRONMENT.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,139 @@
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
+
+import shutil
+import asyncio
+import subprocess
+
+import numpy as np
+import pytest
+
+from src.dio_meetings.core.base import BaseSTT, AudioProcessor
+from src.dio_meetings.core.dto import Transcription
+from src.dio_meetings.core.enums import Emotion
+from src.dio_meetings.core.domain import AudioChunk, OffsetMap
+from src.dio_meetings.infrastructure.audio import vad, FFmpegAudioProcessor
+from src.dio_meetings.infrastructure.stt.chunked import ChunkedSTT
+from src.dio_meetings.utils import iter_bytes
+
+SAMPLE_RATE = 16000
+
+
+def make_speech(duration: float, seed: int = 0) -> np.ndarray:
+    """Слоги с плавающим тоном и паузами между ними"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(rng.uniform(100, 300) * (1 + 0.3 * np.sin(2 * np.pi * 3 * t))) / SAMPLE_RATE
+    overtone = np.repeat(rng.uniform(1.5, 4.0, len(t) // 2000 + 1), 2000)[:len(t)]
+    envelope = np.clip(np.sin(2 * np.pi * 3 * t), 0, None)
+    noise = 0.2 * rng.standard_normal(len(t))
+    return (0.3 * envelope * (np.sin(phase) + 0.5 * np.sin(phase * overtone) + noise)).astype(np.float32)
+
+
+def make_recording() -> np.ndarray:
+    silence = np.zeros(10 * SAMPLE_RATE, dtype=np.float32)
+    t = np.arange(8 * SAMPLE_RATE) / SAMPLE_RATE
+    tone = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    return np.concatenate([make_speech(20, seed=1), silence, tone, make_speech(15, seed=2), silence])
+
+
+def test_block_size_does_not_change_detected_speech(monkeypatch: pytest.MonkeyPatch) -> None:
+    samples = make_recording()
+    expected = vad.detect_speech(lambda start, end: samples[start:end], len(samples))
+    # Блоки не кратны ни окну проверки речи, ни длине кадра
+    monkeypatch.setattr(vad, "PROCESSING_BLOCK_DURATION", 1.37)
+    assert vad.detect_speech(lambda start, end: samples[start:end], len(samples)) == expected
+    speech_duration = sum(end - start for start, end in expected) / SAMPLE_RATE
+    assert 35 <= speech_duration <= 37
+
+
+class FakeSTT(BaseSTT):
+    def __init__(self, on_finish) -> None:
+        self._on_finish = on_finish
+
+    async def transcribe(self, audio_data: bytes, audio_format: str, speakers_count: int) -> list[Transcription]:
+        await asyncio.sleep(0.01)
+        self._on_finish()
+        return [Transcription(text=audio_data.decode(), speaker_id=0, emotion=Emotion.NEUTRAL, start=1.0, end=2.0)]
+
+
+class LazyAudioProcessor(AudioProcessor):
+    """Отдаёт фрагменты по одному и считает, сколько из них ещё не распознано"""
+    def __init__(self, chunks_count: int) -> None:
+        self._chunks_count = chunks_count
+        self.alive = 0
+        self.max_alive = 0
+
+    def finish_chunk(self) -> None:
+        self.alive -= 1
+
+    def prepare_stream(self, audio_stream: AsyncIterable[bytes], audio_format: str):
+        raise NotImplementedError
+
+    @asynccontextmanager
+    async def split_stream(
+            self,
+            audio_stream: AsyncIterable[bytes],
+            audio_format: str,
+            chunk_duration: float
+    ) -> AsyncIterator[AsyncIterator[AudioChunk]]:
+        async for _ in audio_stream:
+            pass
+        yield self._chunks(chunk_duration)
+
+    async def _chunks(self, chunk_duration: float) -> AsyncIterator[AudioChunk]:
+        for index in range(self._chunks_count):
+            self.alive += 1
+            self.max_alive = max(self.max_alive, self.alive)
+            yield AudioChunk(data=str(index).encode(), offset=index * chunk_duration)
+
+    async def get_speaker_profiles(self, audio_data, audio_format, utterances) -> dict[int, list[float]]:
+        return {0: [1.0, 0.0]}
+
+
+def test_chunked_stt_keeps_only_running_chunks_in_memory() -> None:
+    audio_processor = LazyAudioProcessor(chunks_count=20)
+    stt = ChunkedSTT(
+        FakeSTT(on_finish=audio_processor.finish_chunk),
+        audio_processor,
+        chunk_duration=600,
+        max_concurrency=3
+    )
+    transcriptions = asyncio.run(stt.transcribe_stream(iter_bytes(b"audio"), "ogg", speakers_count=2))
+    assert [transcription.text for transcription in transcriptions] == [str(index) for index in range(20)]
+    assert [transcription.start for transcription in transcriptions] == [index * 600 + 1.0 for index in range(20)]
+    assert {transcription.speaker_id for transcription in transcriptions} == {0}
+    # Запущенные фрагменты и один, ожидающий свободного слота
+    assert audio_processor.max_alive <= 4
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_prepare_and_split_stream() -> None:
+    samples = make_recording()
+    pcm_data = (samples * 32767).astype(np.int16).tobytes()
+
+    async def prepare_and_split() -> tuple[bytes, OffsetMap, list[AudioChunk]]:
+        audio_processor = FFmpegAudioProcessor(max_workers=1)
+        try:
+            async with audio_processor.prepare_stream(iter_bytes(pcm_data), audio_format="pcm") as (stream, offset_map):
+                prepared_data = b"".join([chunk async for chunk in stream])
+            async with audio_processor.split_stream(iter_bytes(pcm_data), "pcm", chunk_duration=20) as chunks:
+                return prepared_data, offset_map, [chunk async for chunk in chunks]
+        finally:
+            audio_processor.close()
+
+    prepared_data, offset_map, chunks = asyncio.run(prepare_and_split())
+    decoded = subprocess.run(
+        ["ffmpeg", "-i", "pipe:0", "-f", "null", "-"],
+        input=prepared_data,
+        capture_output=True
+    )
+    assert decoded.returncode == 0
+    assert 26 <= offset_map.removed_duration <= 28
+    # Вторая фраза после тишины и тона сдвигается к своему месту в исходной записи
+    second_phrase = offset_map.segments[-1]
+    assert offset_map.to_original(second_phrase.start + 1.0) == pytest.approx(second_phrase.original_start + 1.0)
+    assert second_phrase.original_start == pytest.approx(38 - 0.3, abs=0.5)
+    assert [chunk.offset for chunk in chunks][0] == 0.0
+    assert len(chunks) == 2
+    assert all(chunk.data.startswith(b"OggS") for chunk in chunks)
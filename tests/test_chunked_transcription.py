@@ -0,0 +1,198 @@
+from collections.abc import AsyncIterable, AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime
+from uuid import uuid4
+
+import json
+import time
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.dio_meetings.core.base import AudioProcessor
+from src.dio_meetings.core.domain import AudioChunk
+from src.dio_meetings.infrastructure.http import HTTPClient
+from src.dio_meetings.infrastructure.stt.chunked import ChunkedSTT
+from src.dio_meetings.infrastructure.stt.salute_speech import api as salute_speech_api
+from src.dio_meetings.infrastructure.stt.salute_speech.stt import SaluteSpeech
+from src.dio_meetings.infrastructure.stt.salute_speech.polling import PollingStrategy
+
+# Сервер распознаёт секунду записи за SERVER_REALTIME_FACTOR секунд
+SERVER_REALTIME_FACTOR = 0.0025
+PHRASE_DURATION = 5.0
+PHRASES_COUNT = 96  # 8 минут записи
+CHUNK_DURATION = 60.0
+MAX_CONCURRENCY = 4
+# Голоса трёх участников, по ним сопоставляются спикеры разных фрагментов
+VOICES = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+
+
+def make_recording() -> tuple[bytes, list[dict]]:
+    """Фиктивная запись: фразы с таймингами и голосом участника вместо звука"""
+    phrases = [
+        {
+            "text": f"phrase {index}",
+            "voice": (index * 7 // 3) % len(VOICES),
+            "start": index * PHRASE_DURATION,
+            "end": (index + 1) * PHRASE_DURATION - 1.0
+        }
+        for index in range(PHRASES_COUNT)
+    ]
+    return json.dumps({"phrases": phrases}).encode(), phrases
+
+
+def encode_chunk(phrases: list[dict], offset: float) -> bytes:
+    """Фрагмент с локальными таймингами и локальными ID спикеров, как их вернёт распознавание.
+    Локальные ID назначаются в порядке, обратном первому появлению голоса, чтобы в разных
+    фрагментах один голос получал разные ID.
+    """
+    voices = list(dict.fromkeys(phrase["voice"] for phrase in phrases))[::-1]
+    return json.dumps({
+        "duration": max(phrase["end"] for phrase in phrases) - offset,
+        "phrases": [
+            {
+                "text": phrase["text"],
+                "speaker_id": voices.index(phrase["voice"]),
+                "start": phrase["start"] - offset,
+                "end": phrase["end"] - offset
+            }
+            for phrase in phrases
+        ],
+        "profiles": {str(speaker_id): VOICES[voice] for speaker_id, voice in enumerate(voices)}
+    }).encode()
+
+
+class FakeAudioProcessor(AudioProcessor):
+    """Делит фиктивную запись на фрагменты по CHUNK_DURATION секунд"""
+    def prepare_stream(self, audio_stream: AsyncIterable[bytes], audio_format: str):
+        raise NotImplementedError
+
+    @asynccontextmanager
+    async def split_stream(
+            self,
+            audio_stream: AsyncIterable[bytes],
+            audio_format: str,
+            chunk_duration: float
+    ) -> AsyncIterator[AsyncIterator[AudioChunk]]:
+        data = b"".join([chunk async for chunk in audio_stream])
+        phrases = json.loads(data)["phrases"]
+        yield self._chunks(phrases, chunk_duration)
+
+    @staticmethod
+    async def _chunks(phrases: list[dict], chunk_duration: float) -> AsyncIterator[AudioChunk]:
+        chunks: dict[int, list[dict]] = {}
+        for phrase in phrases:
+            chunks.setdefault(int(phrase["start"] // chunk_duration), []).append(phrase)
+        for index, chunk_phrases in sorted(chunks.items()):
+            offset = index * chunk_duration
+            yield AudioChunk(data=encode_chunk(chunk_phrases, offset), offset=offset)
+
+    async def get_speaker_profiles(self, audio_data, audio_format, utterances) -> dict[int, list[float]]:
+        profiles = json.loads(audio_data)["profiles"]
+        return {int(speaker_id): profile for speaker_id, profile in profiles.items()}
+
+
+def create_fake_salute_speech() -> web.Application:
+    """Минимальная реализация API SaluteSpeech: задача завершается через время,
+    пропорциональное длительности загруженного аудио
+    """
+    files: dict[str, bytes] = {}
+    tasks: dict[str, tuple[float, str]] = {}
+
+    def task_result(task_id: str, status: str, **kwargs) -> dict:
+        now = datetime.now().isoformat()
+        return {"id": task_id, "created_at": now, "updated_at": now, "status": status, **kwargs}
+
+    async def oauth(request: web.Request) -> web.Response:
+        return web.json_response({"access_token": "token", "expires_at": int((time.time() + 1800) * 1000)})
+
+    async def upload(request: web.Request) -> web.Response:
+        file_id = str(uuid4())
+        files[file_id] = await request.read()
+        return web.json_response({"status": 200, "result": {"request_file_id": file_id}})
+
+    async def recognize(request: web.Request) -> web.Response:
+        payload = await request.json()
+        duration = json.loads(files[payload["request_file_id"]])["duration"]
+        task_id = str(uuid4())
+        tasks[task_id] = (time.monotonic() + duration * SERVER_REALTIME_FACTOR, payload["request_file_id"])
+        return web.json_response({"status": 200, "result": task_result(task_id, "NEW")})
+
+    async def get_task(request: web.Request) -> web.Response:
+        task_id = request.query["id"]
+        finish_at, file_id = tasks[task_id]
+        if time.monotonic() < finish_at:
+            return web.json_response({"status": 200, "result": task_result(task_id, "RUNNING")})
+        result = task_result(task_id, "DONE", response_file_id=file_id)
+        return web.json_response({"status": 200, "result": result})
+
+    async def download(request: web.Request) -> web.Response:
+        phrases = json.loads(files[request.query["response_file_id"]])["phrases"]
+        return web.json_response([
+            {
+                "results": [{
+                    "normalized_text": phrase["text"],
+                    "start": f"{phrase['start']:.3f}s",
+                    "end": f"{phrase['end']:.3f}s"
+                }],
+                "speaker_info": {"speaker_id": phrase["speaker_id"]},
+                "emotions_result": {"positive": 0.1, "neutral": 0.8, "negative": 0.1}
+            }
+            for phrase in phrases
+        ])
+
+    app = web.Application(client_max_size=1024 ** 3)
+    app.router.add_post("/api/v2/oauth", oauth)
+    app.router.add_post("/rest/v1/data:upload", upload)
+    app.router.add_post("/rest/v1/speech:async_recognize", recognize)
+    app.router.add_get("/rest/v1/task:get", get_task)
+    app.router.add_get("/rest/v1/data:download", download)
+    return app
+
+
+def test_chunked_transcription_is_faster_and_stitched(monkeypatch: pytest.MonkeyPatch) -> None:
+    recording, phrases = make_recording()
+
+    async def transcribe() -> tuple[float, float, list]:
+        server = TestServer(create_fake_salute_speech())
+        await server.start_server()
+        monkeypatch.setattr(salute_speech_api, "SBER_DEVICES_URL", str(server.make_url("/api/v2")))
+        monkeypatch.setattr(salute_speech_api, "SALUTE_SPEECH_URL", str(server.make_url("/rest/v1")))
+        http_client = HTTPClient()
+        try:
+            salute_speech = SaluteSpeech(
+                api_key="key",
+                scope="SALUTE_SPEECH_PERS",
+                http_client=http_client,
+                polling_strategy=PollingStrategy(realtime_factor=0.0, min_delay=0.01, max_delay=0.02)
+            )
+            chunked_stt = ChunkedSTT(
+                salute_speech,
+                FakeAudioProcessor(),
+                chunk_duration=CHUNK_DURATION,
+                max_concurrency=MAX_CONCURRENCY
+            )
+            whole_recording = encode_chunk(phrases, offset=0.0)
+            started_at = time.perf_counter()
+            await salute_speech.transcribe(whole_recording, "ogg", speakers_count=len(VOICES))
+            whole_time = time.perf_counter() - started_at
+            started_at = time.perf_counter()
+            transcriptions = await chunked_stt.transcribe(recording, "ogg", speakers_count=len(VOICES))
+            chunked_time = time.perf_counter() - started_at
+            return whole_time, chunked_time, transcriptions
+        finally:
+            await http_client.close()
+            await server.close()
+
+    whole_time, chunked_time, transcriptions = asyncio.run(transcribe())
+    # 8 фрагментов по 4 одновременно: распознавание идёт в 4 раза быстрее, с запасом на накладные расходы
+    assert chunked_time < whole_time / 2
+    assert [transcription.text for transcription in transcriptions] == [phrase["text"] for phrase in phrases]
+    assert [transcription.start for transcription in transcriptions] == [phrase["start"] for phrase in phrases]
+    assert [transcription.end for transcription in transcriptions] == [phrase["end"] for phrase in phrases]
+    # Один голос во всех фрагментах получает один глобальный ID, разные голоса - разные
+    speakers = {(phrase["voice"], transcription.speaker_id) for phrase, transcription in zip(phrases, transcriptions)}
+    assert len(speakers) == len(VOICES)
+    assert len({speaker_id for _, speaker_id in speakers}) == len(VOICES)
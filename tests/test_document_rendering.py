@@ -0,0 +1,74 @@
+import io
+import os
+from pathlib import Path
+
+from docx import Document as WordDocument
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+from src.dio_meetings.infrastructure.documents.rendering import render_docx, render_html
+from src.dio_meetings.infrastructure.documents.constants import CODE_FONT
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+# UPDATE_GOLDEN=1 перезаписывает эталоны, изменения нужно проверить в diff
+UPDATE_GOLDEN = os.getenv("UPDATE_GOLDEN") == "1"
+
+
+def dump_paragraph(paragraph: Paragraph) -> str:
+    """Текст абзаца с разметкой начертания: **жирный**, *курсив*, ~~зачёркнутый~~, `код`"""
+    text = ""
+    for run in paragraph.runs:
+        run_text = run.text
+        if run.font.name == CODE_FONT:
+            run_text = f"`{run_text}`"
+        if run.font.strike:
+            run_text = f"~~{run_text}~~"
+        if run.italic:
+            run_text = f"*{run_text}*"
+        if run.bold:
+            run_text = f"**{run_text}**"
+        text += run_text
+    return text.replace("\n", "\\n")
+
+
+def dump_docx(data: bytes) -> str:
+    """Стиль и содержимое каждого абзаца и таблицы документа по порядку"""
+    lines: list[str] = []
+    for block in WordDocument(io.BytesIO(data)).iter_inner_content():
+        if isinstance(block, Table):
+            lines.append(f"[Table: {block.style.name}]")
+            for row in block.rows:
+                lines.append("| " + " | ".join(dump_paragraph(cell.paragraphs[0]) for cell in row.cells) + " |")
+        else:
+            lines.append(f"[{block.style.name}] {dump_paragraph(block)}")
+    return "\n".join(lines) + "\n"
+
+
+def check_golden(name: str, actual: str) -> None:
+    path = GOLDEN_DIR / name
+    if UPDATE_GOLDEN:
+        path.write_text(actual, encoding="utf-8")
+    assert actual == path.read_text(encoding="utf-8")
+
+
+def read_protocol() -> str:
+    return (GOLDEN_DIR / "protocol.md").read_text(encoding="utf-8")
+
+
+def test_docx_matches_golden() -> None:
+    check_golden("protocol.docx.txt", dump_docx(render_docx(read_protocol())))
+
+
+def test_html_matches_golden() -> None:
+    check_golden("protocol.html", render_html(read_protocol()).decode("utf-8"))
+
+
+def test_raw_html_is_rendered_as_text() -> None:
+    text = "<script>alert(1)</script>\n\nТекст с <b>тегом</b>"
+    html = render_html(text).decode("utf-8")
+    assert "<script>" not in html and "<b>" not in html
+    assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+    assert dump_docx(render_docx(text)) == (
+        "[Normal] <script>alert(1)</script>\n"
+        "[Normal] Текст с <b>тегом</b>\n"
+    )
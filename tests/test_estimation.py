@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from src.dio_meetings.core.domain import FileMetadata, LLMThroughput
+from src.dio_meetings.core.enums import FileType
+from src.dio_meetings.constants import LLM_THROUGHPUT
+from src.dio_meetings.estimation import TaskEstimator
+
+GIGA_CHAT = LLMThroughput.model_validate(LLM_THROUGHPUT["giga_chat"])
+YANDEX_GPT = LLMThroughput.model_validate(LLM_THROUGHPUT["yandex_gpt"])
+
+
+def make_file_metadata(size: float) -> FileMetadata:
+    return FileMetadata(
+        file_name="meeting.mp3",
+        key="meeting.mp3",
+        bucket="audio",
+        size=size,
+        format="mp3",
+        type=FileType.AUDIO,
+        uploaded_date=datetime.now()
+    )
+
+
+def test_estimate_depends_on_llm_throughput() -> None:
+    file_metadata = make_file_metadata(size=60)  # ~1 час MP3 128 кбит/с
+    slow_estimate = TaskEstimator(llm_throughput=GIGA_CHAT).estimate(file_metadata)
+    fast_estimate = TaskEstimator(llm_throughput=YANDEX_GPT).estimate(file_metadata)
+    assert fast_estimate.processing_time < slow_estimate.processing_time
+    # Размер промптов не зависит от провайдера
+    assert fast_estimate.prompt_tokens == slow_estimate.prompt_tokens
+    assert fast_estimate.llm_calls == slow_estimate.llm_calls
+
+
+def test_long_recording_is_estimated_as_map_reduce() -> None:
+    short_estimate = TaskEstimator(max_chunk_tokens=6000).estimate(make_file_metadata(size=1))
+    assert short_estimate.llm_calls == 1
+    file_metadata = make_file_metadata(size=60)
+    estimate = TaskEstimator(max_chunk_tokens=6000, max_concurrency=4).estimate(file_metadata)
+    assert estimate.llm_calls > 2
+    # Части обрабатываются одновременно, поэтому меньший параллелизм увеличивает время
+    serial_estimate = TaskEstimator(max_chunk_tokens=6000, max_concurrency=1).estimate(file_metadata)
+    assert serial_estimate.processing_time > estimate.processing_time
+    assert serial_estimate.llm_calls == estimate.llm_calls
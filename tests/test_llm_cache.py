@@ -0,0 +1,51 @@
+import asyncio
+
+from fakeredis import FakeAsyncRedis
+from redis.exceptions import RedisError
+
+from src.dio_meetings.core.dto import UserMessage
+from src.dio_meetings.infrastructure.llms.cache import CachedLLM, LLMCache, CachedResponse
+
+from tests.test_llm_router import FakeLLM
+
+MESSAGES = [UserMessage(text="Сделай протокол встречи")]
+
+
+class BrokenLLMCache(LLMCache):
+    """Кэш, в который не удаётся сохранить ответ"""
+    async def set(self, key: str, response: CachedResponse) -> None:
+        raise RedisError("Connection reset")
+
+
+def test_stats_count_every_lookup() -> None:
+    llm = FakeLLM("protocol", latency=0.05)
+    cache = LLMCache(FakeAsyncRedis())
+    cached_llm = CachedLLM(llm, cache, model_name="fake")
+
+    async def scenario() -> None:
+        # Одинаковые одновременные запросы - промахи, но LLM вызывается один раз
+        answers = await asyncio.gather(*[cached_llm.generate(MESSAGES) for _ in range(3)])
+        assert {answer.text for answer in answers} == {"protocol"}
+        assert llm.calls == 1
+        assert (await cached_llm.generate(MESSAGES)).text == "protocol"
+        assert [part async for part in cached_llm.astream(MESSAGES)] == ["protocol"]
+        assert llm.calls == 1
+        stats = await cache.get_stats()
+        assert (stats.hits, stats.misses) == (2, 3)
+        assert stats.latency_saved >= 0.1
+
+    asyncio.run(scenario())
+
+
+def test_miss_is_counted_when_response_is_not_saved() -> None:
+    llm = FakeLLM("protocol", latency=0.0)
+    cache = BrokenLLMCache(FakeAsyncRedis())
+    cached_llm = CachedLLM(llm, cache, model_name="fake")
+
+    async def scenario() -> None:
+        assert (await cached_llm.generate(MESSAGES)).text == "protocol"
+        assert [part async for part in cached_llm.astream(MESSAGES)] == ["protocol"]
+        stats = await cache.get_stats()
+        assert (stats.hits, stats.misses) == (0, 2)
+
+    asyncio.run(scenario())
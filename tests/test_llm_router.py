@@ -0,0 +1,118 @@
+from collections.abc import AsyncIterator
+
+import time
+import asyncio
+
+import pytest
+
+from src.dio_meetings.core.base import BaseLLM
+from src.dio_meetings.core.dto import BaseMessage, UserMessage, AIMessage
+from src.dio_meetings.infrastructure.llms.router import LLMRouter, ProvidersUnavailableError
+
+MESSAGES = [UserMessage(text="Сделай протокол встречи")]
+
+
+class FakeLLM(BaseLLM):
+    """Провайдер с заданной задержкой ответа, может отвечать ошибкой"""
+    def __init__(self, name: str, latency: float, is_failing: bool = False) -> None:
+        self.name = name
+        self.latency = latency
+        self.is_failing = is_failing
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, messages: list[BaseMessage]) -> AIMessage:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.is_failing:
+            raise RuntimeError(f"{self.name} is down")
+        return AIMessage(text=self.name)
+
+    async def astream(self, messages: list[BaseMessage]) -> AsyncIterator[str]:
+        ai_message = await self.generate(messages)
+        for word in ai_message.text.split("-"):
+            yield word
+
+
+def test_failover_opens_circuit_and_recovers() -> None:
+    primary = FakeLLM("primary", latency=0.01, is_failing=True)
+    secondary = FakeLLM("secondary", latency=0.05)
+    router = LLMRouter(
+        {"primary": primary, "secondary": secondary},
+        hedging_enabled=False,
+        failure_threshold=2,
+        recovery_timeout=0.2
+    )
+
+    async def scenario() -> None:
+        # Без статистики первым пробуется провайдер из начала списка, ошибка сразу уходит второму
+        for _ in range(2):
+            assert (await router.generate(MESSAGES)).text == "secondary"
+        assert primary.calls == 2
+        assert router.stats[0].state == "open"
+        # Отключённый провайдер не вызывается
+        assert (await router.generate(MESSAGES)).text == "secondary"
+        assert primary.calls == 2
+        # После recovery_timeout уходит один пробный запрос, успех возвращает провайдера
+        await asyncio.sleep(0.25)
+        primary.is_failing = False
+        assert router.stats[0].state == "half_open"
+        assert (await router.generate(MESSAGES)).text == "primary"
+        assert router.stats[0].state == "closed"
+        # Быстрый провайдер снова выбирается первым
+        assert (await router.generate(MESSAGES)).text == "primary"
+        assert primary.calls == 4
+
+    asyncio.run(scenario())
+    primary_stats, secondary_stats = router.stats
+    assert primary_stats.requests == 4 and primary_stats.error_rate == 0.5
+    assert secondary_stats.requests == 3 and secondary_stats.error_rate == 0.0
+
+
+def test_all_providers_failing() -> None:
+    router = LLMRouter({
+        "primary": FakeLLM("primary", latency=0.01, is_failing=True),
+        "secondary": FakeLLM("secondary", latency=0.01, is_failing=True)
+    })
+    with pytest.raises(ProvidersUnavailableError, match="primary is down.*secondary is down"):
+        asyncio.run(router.generate(MESSAGES))
+
+
+def test_slow_request_is_hedged() -> None:
+    primary = FakeLLM("primary", latency=0.05)
+    secondary = FakeLLM("secondary", latency=0.1)
+    router = LLMRouter({"primary": primary, "secondary": secondary}, hedge_min_delay=0.05)
+
+    async def scenario() -> float:
+        # Статистика задержки обоих провайдеров: первым выбирается более быстрый,
+        # дублирующий запрос уйдёт примерно через его p95
+        answers = [(await router.generate(MESSAGES)).text for _ in range(5)]
+        assert answers == ["primary", "secondary", "primary", "primary", "primary"]
+        primary.latency = 2.0
+        started_at = time.perf_counter()
+        ai_message = await router.generate(MESSAGES)
+        assert ai_message.text == "secondary"
+        return time.perf_counter() - started_at
+
+    elapsed = asyncio.run(scenario())
+    assert elapsed < 1.0
+    assert secondary.calls == 2
+    # Проигравший запрос отменён, а его задержка учтена в статистике
+    assert primary.cancelled == 1
+    assert router.stats[0].p95_latency >= 0.1
+
+
+def test_stream_switches_provider_before_first_part() -> None:
+    primary = FakeLLM("primary", latency=0.01, is_failing=True)
+    secondary = FakeLLM("secondary-answer", latency=0.01)
+    router = LLMRouter({"primary": primary, "secondary": secondary})
+
+    async def collect() -> list[str]:
+        return [part async for part in router.astream(MESSAGES)]
+
+    assert asyncio.run(collect()) == ["secondary", "answer"]
+    assert router.stats[0].error_rate == 1.0
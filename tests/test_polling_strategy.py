@@ -0,0 +1,116 @@
+from typing import Union
+from uuid import UUID, uuid4
+from datetime import datetime
+from itertools import islice
+
+import time
+import asyncio
+
+import pytest
+
+from src.dio_meetings.infrastructure.http import HTTPClient
+from src.dio_meetings.infrastructure.stt.salute_speech.stt import SaluteSpeech
+from src.dio_meetings.infrastructure.stt.salute_speech.polling import PollingStrategy
+from src.dio_meetings.infrastructure.stt.salute_speech.schemas import TaskResult, FinishedTaskResult
+from src.dio_meetings.infrastructure.stt.salute_speech.exceptions import TaskError, TaskTimeoutError
+from src.dio_meetings.infrastructure.stt.salute_speech.constants import (
+    REALTIME_FACTOR,
+    MIN_POLL_DELAY,
+    MAX_POLL_DELAY,
+    POLL_JITTER,
+    MIN_TASK_DEADLINE
+)
+
+TASK_ID = uuid4()
+
+
+def make_task_result(task_id: UUID, status: str) -> Union[TaskResult, FinishedTaskResult]:
+    now = datetime.now()
+    if status == "DONE":
+        return FinishedTaskResult(id=task_id, created_at=now, updated_at=now, status=status, response_file_id=uuid4())
+    return TaskResult(id=task_id, created_at=now, updated_at=now, status=status)
+
+
+class FakeSaluteSpeechAPI:
+    """Возвращает заданную последовательность статусов задачи, последний повторяется"""
+    def __init__(self, statuses: list[str]) -> None:
+        self.statuses = statuses
+        self.polls: list[float] = []
+        self.canceled: list[UUID] = []
+
+    async def get_task_status(self, task_id: UUID) -> Union[TaskResult, FinishedTaskResult]:
+        self.polls.append(time.monotonic())
+        return make_task_result(task_id, self.statuses[min(len(self.polls), len(self.statuses)) - 1])
+
+    async def cancel_task(self, task_id: UUID) -> None:
+        self.canceled.append(task_id)
+
+
+async def wait_for_result(
+        salute_speech_api: FakeSaluteSpeechAPI,
+        polling_strategy: PollingStrategy,
+        audio_duration: float
+) -> FinishedTaskResult:
+    http_client = HTTPClient()
+    try:
+        stt = SaluteSpeech(
+            api_key="key",
+            scope="SALUTE_SPEECH_PERS",
+            http_client=http_client,
+            polling_strategy=polling_strategy
+        )
+        stt._salute_speech_api = salute_speech_api
+        return await stt._wait_for_result(make_task_result(TASK_ID, "NEW"), audio_duration=audio_duration)
+    finally:
+        await http_client.close()
+
+
+def test_first_delay_depends_on_audio_duration() -> None:
+    polling_strategy = PollingStrategy()
+    for _ in range(100):
+        first_delay = next(polling_strategy.delays(3600))
+        assert 3600 * REALTIME_FACTOR * (1 - POLL_JITTER) <= first_delay <= 3600 * REALTIME_FACTOR * (1 + POLL_JITTER)
+    # Короткая запись не опрашивается чаще min_delay
+    assert next(PollingStrategy(jitter=0).delays(1)) == MIN_POLL_DELAY
+
+
+def test_delays_grow_exponentially_up_to_max_delay() -> None:
+    delays = list(islice(PollingStrategy(jitter=0).delays(600), 9))
+    assert delays == [600 * REALTIME_FACTOR, 1, 2, 4, 8, 16, MAX_POLL_DELAY, MAX_POLL_DELAY, MAX_POLL_DELAY]
+
+
+@pytest.mark.parametrize("audio_duration, deadline", [(60, MIN_TASK_DEADLINE), (3600, 3600)])
+def test_deadline_is_not_shorter_than_audio(audio_duration: float, deadline: float) -> None:
+    assert PollingStrategy().get_deadline(audio_duration) == deadline
+
+
+def test_task_is_polled_until_done() -> None:
+    polling_strategy = PollingStrategy(realtime_factor=0.1, min_delay=0.01, max_delay=0.04, jitter=0)
+    salute_speech_api = FakeSaluteSpeechAPI(["RUNNING"] * 5 + ["DONE"])
+    task_result = asyncio.run(wait_for_result(salute_speech_api, polling_strategy, audio_duration=1))
+    assert task_result.status == "DONE"
+    assert len(salute_speech_api.polls) == 6
+    assert salute_speech_api.canceled == []
+
+
+@pytest.mark.parametrize("audio_duration, deadline", [(0.05, 0.2), (0.4, 0.4)])
+def test_deadline_cancels_task(audio_duration: float, deadline: float) -> None:
+    # Дедлайн max(min_deadline, длительность аудио): min_deadline для короткой записи, длительность для длинной
+    polling_strategy = PollingStrategy(realtime_factor=0, min_delay=0.01, max_delay=0.02, min_deadline=0.2)
+    salute_speech_api = FakeSaluteSpeechAPI(["RUNNING"])
+    started_at = time.monotonic()
+    with pytest.raises(TaskTimeoutError):
+        asyncio.run(wait_for_result(salute_speech_api, polling_strategy, audio_duration=audio_duration))
+    assert deadline <= time.monotonic() - started_at < deadline + 0.2
+    assert salute_speech_api.canceled == [TASK_ID]
+
+
+@pytest.mark.parametrize("status", ["ERROR", "CANCELED"])
+def test_failed_task_stops_polling(status: str) -> None:
+    polling_strategy = PollingStrategy(realtime_factor=0, min_delay=0.01, max_delay=0.02)
+    salute_speech_api = FakeSaluteSpeechAPI(["RUNNING", status, "DONE"])
+    with pytest.raises(TaskError, match=status) as exc_info:
+        asyncio.run(wait_for_result(salute_speech_api, polling_strategy, audio_duration=1))
+    assert not isinstance(exc_info.value, TaskTimeoutError)
+    assert len(salute_speech_api.polls) == 2
+    assert salute_speech_api.canceled == []
@@ -0,0 +1,129 @@
+from typing import Optional
+from collections.abc import AsyncIterator
+from uuid import UUID, uuid4
+
+import asyncio
+
+from fakeredis import FakeAsyncRedis
+
+from src.dio_meetings.core.base import BaseLLM
+from src.dio_meetings.core.dto import BaseMessage, AIMessage, Transcription, ProtocolEvent
+from src.dio_meetings.core.enums import TaskStatus, Emotion
+from src.dio_meetings.core.domain import Task
+from src.dio_meetings.core.services import SummarizationService, TaskService
+from src.dio_meetings.core.exceptions import SummarizationError
+from src.dio_meetings.infrastructure.streams import RedisTextStream
+
+BLOCK_TIMEOUT = 0.05
+TRANSCRIPTIONS = [Transcription(text="Обсудили релиз", speaker_id=0, emotion=Emotion.NEUTRAL, start=0.0, end=2.0)]
+# Фрагменты не меньше PROTOCOL_STREAM_FLUSH_SIZE, каждый публикуется отдельным событием
+FIRST_ATTEMPT = ["а" * 200, "б" * 200]
+SECOND_ATTEMPT = ["в" * 200, "г" * 200, "д" * 200]
+
+
+class FlakyLLM(BaseLLM):
+    """Первая генерация обрывается, как при падении воркера, следующие завершаются"""
+    def __init__(self) -> None:
+        self.attempts = 0
+
+    async def generate(self, messages: list[BaseMessage]) -> AIMessage:
+        raise NotImplementedError
+
+    async def astream(self, messages: list[BaseMessage]) -> AsyncIterator[str]:
+        self.attempts += 1
+        parts = FIRST_ATTEMPT if self.attempts == 1 else SECOND_ATTEMPT
+        for part in parts:
+            yield part
+            await asyncio.sleep(BLOCK_TIMEOUT)
+        if self.attempts == 1:
+            raise RuntimeError("Worker died")
+
+
+class FakeTaskRepository:
+    def __init__(self, task: Task) -> None:
+        self.task = task
+
+    async def read(self, id: UUID) -> Optional[Task]:
+        return self.task.model_copy()
+
+
+def create_task_service(redis: FakeAsyncRedis, task: Task, **kwargs) -> tuple[TaskService, FakeTaskRepository]:
+    task_repository = FakeTaskRepository(task)
+    task_service = TaskService(
+        task_repository=task_repository,
+        file_metadata_repository=None,
+        file_storage=None,
+        broker=None,
+        text_stream=RedisTextStream(redis, block_timeout=BLOCK_TIMEOUT),
+        **kwargs
+    )
+    return task_service, task_repository
+
+
+async def collect_text(events: AsyncIterator[Optional[ProtocolEvent]]) -> tuple[str, list[ProtocolEvent]]:
+    """Собирает текст так же, как клиент SSE: событие сброса отбрасывает полученный текст"""
+    text, received = "", []
+    async for event in events:
+        if event is None:
+            continue
+        received.append(event)
+        text = "" if event.reset else text + event.text
+    return text, received
+
+
+def test_redelivered_task_resets_stream() -> None:
+    async def scenario() -> None:
+        redis = FakeAsyncRedis()
+        task = Task(id=uuid4(), file_id=uuid4(), status=TaskStatus.RUNNING)
+        text_stream = RedisTextStream(redis, block_timeout=BLOCK_TIMEOUT)
+        task_service, task_repository = create_task_service(redis, task)
+        summarization_service = SummarizationService(stt=None, llm=FlakyLLM(), text_stream=text_stream)
+        reader = asyncio.create_task(collect_text(task_service.stream_protocol(task)))
+        try:
+            await summarization_service.summarize(TRANSCRIPTIONS, prompt_template="", stream_id=task.id)
+        except SummarizationError:
+            pass
+        document = await summarization_service.summarize(TRANSCRIPTIONS, prompt_template="", stream_id=task.id)
+        task_repository.task.status = TaskStatus.DONE
+        await text_stream.finish(task.id, TaskStatus.DONE)
+        text, received = await reader
+        assert document.data.decode("utf-8") == text == "".join(SECOND_ATTEMPT)
+        assert [event.reset for event in received].count(True) == 2
+        assert received[-1].status == TaskStatus.DONE
+        # Подключившийся позже читатель не видит текст прерванной попытки
+        _, late_received = await collect_text(task_service.stream_protocol(task_repository.task))
+        assert late_received[0].reset
+        assert [event.text for event in late_received[1:-1]] == SECOND_ATTEMPT
+
+    asyncio.run(scenario())
+
+
+def test_reader_stops_when_task_finished_without_stream_status() -> None:
+    async def scenario() -> None:
+        redis = FakeAsyncRedis()
+        task = Task(id=uuid4(), file_id=uuid4(), status=TaskStatus.RUNNING)
+        text_stream = RedisTextStream(redis, block_timeout=BLOCK_TIMEOUT)
+        task_service, task_repository = create_task_service(redis, task)
+        await text_stream.publish(task.id, "Начало протокола")
+        reader = asyncio.create_task(collect_text(task_service.stream_protocol(task)))
+        await asyncio.sleep(BLOCK_TIMEOUT * 3)
+        # Задача переведена в ERROR после всех попыток, событие завершения потока потеряно
+        task_repository.task.status = TaskStatus.ERROR
+        await text_stream.publish(task.id, ", конец")
+        text, received = await asyncio.wait_for(reader, timeout=1)
+        assert text == "Начало протокола, конец"
+        assert received[-1].status == TaskStatus.ERROR
+
+    asyncio.run(scenario())
+
+
+def test_reader_stops_after_idle_timeout() -> None:
+    async def scenario() -> None:
+        redis = FakeAsyncRedis()
+        task = Task(id=uuid4(), file_id=uuid4(), status=TaskStatus.RUNNING)
+        # Воркер упал, задачу никто не выполняет и её статус не меняется
+        task_service, _ = create_task_service(redis, task, stream_idle_timeout=BLOCK_TIMEOUT * 4)
+        _, received = await asyncio.wait_for(collect_text(task_service.stream_protocol(task)), timeout=1)
+        assert [event.status for event in received] == [TaskStatus.RUNNING]
+
+    asyncio.run(scenario())
@@ -0,0 +1,89 @@
+from typing import Union
+from collections.abc import AsyncIterator
+
+import asyncio
+
+import pytest
+
+from src.dio_meetings.core.exceptions import UploadingError
+from src.dio_meetings.infrastructure.s3 import S3Client
+from src.dio_meetings.constants import MULTIPART_PART_SIZE
+
+UPLOAD_ID = "upload-1"
+
+
+class FakeS3Client(S3Client):
+    """Multipart загрузка в памяти вместо запросов к S3"""
+    def __init__(self, abort_delay: float = 0.0) -> None:
+        super().__init__(url="http://s3", access_key="key", secret_key="secret")
+        self.abort_delay = abort_delay
+        self.parts: list[bytes] = []
+        self.completed: list[str] = []
+        self.aborted: list[str] = []
+
+    async def create_multipart_upload(self, key: str, bucket: str) -> str:
+        return UPLOAD_ID
+
+    async def upload_part(self, data: bytes, key: str, bucket: str, upload_id: str, part_number: int) -> str:
+        self.parts.append(data)
+        return f"etag-{part_number}"
+
+    async def complete_multipart_upload(
+            self,
+            key: str,
+            bucket: str,
+            upload_id: str,
+            parts: list[dict[str, Union[int, str]]]
+    ) -> None:
+        self.completed.append(upload_id)
+
+    async def abort_multipart_upload(self, key: str, bucket: str, upload_id: str) -> None:
+        await asyncio.sleep(self.abort_delay)
+        self.aborted.append(upload_id)
+
+
+async def stalled_stream(is_failing: bool = False) -> AsyncIterator[bytes]:
+    """Отдаёт одну полную часть и затем ждёт, как клиент, переставший отправлять данные"""
+    yield b"0" * MULTIPART_PART_SIZE
+    if is_failing:
+        raise ConnectionResetError("Connection lost")
+    await asyncio.Event().wait()
+    yield b""
+
+
+async def iter_parts(count: int) -> AsyncIterator[bytes]:
+    for _ in range(count):
+        yield b"0" * MULTIPART_PART_SIZE
+
+
+def test_completed_upload_is_not_aborted() -> None:
+    s3_client = FakeS3Client()
+    size = asyncio.run(s3_client.upload_stream(iter_parts(2), key="audio.mp3", bucket="audio"))
+    assert size == 2 * MULTIPART_PART_SIZE
+    assert (s3_client.completed, s3_client.aborted) == ([UPLOAD_ID], [])
+
+
+def test_failed_upload_is_aborted() -> None:
+    s3_client = FakeS3Client()
+    with pytest.raises(UploadingError):
+        asyncio.run(s3_client.upload_stream(stalled_stream(is_failing=True), key="audio.mp3", bucket="audio"))
+    assert s3_client.aborted == [UPLOAD_ID]
+
+
+def test_cancelled_upload_is_aborted() -> None:
+    s3_client = FakeS3Client(abort_delay=0.05)
+
+    async def scenario() -> None:
+        upload = asyncio.create_task(s3_client.upload_stream(stalled_stream(), key="audio.mp3", bucket="audio"))
+        while not s3_client.parts:
+            await asyncio.sleep(0.01)
+        upload.cancel()
+        await asyncio.sleep(0.01)
+        # Повторная отмена во время abort не оставляет загрузку незавершённой
+        upload.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await upload
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    assert (s3_client.completed, s3_client.aborted) == ([], [UPLOAD_ID])
@@ -0,0 +1,66 @@
+import json
+import asyncio
+import tracemalloc
+
+import pytest
+
+from benchmarks.salute_speech_parser import make_recognition_result, iter_chunks, parse_legacy, parse_incremental
+from src.dio_meetings.infrastructure.stt.salute_speech.parser import iter_json_array
+
+UTTERANCES = 20000
+
+
+@pytest.fixture(scope="module")
+def recognition_result() -> bytes:
+    return make_recognition_result(UTTERANCES)
+
+
+def parse_json_array(data: bytes, chunk_size: int) -> list:
+    async def collect() -> list:
+        return [item async for item in iter_json_array(iter_chunks(data, chunk_size))]
+
+    return asyncio.run(collect())
+
+
+def test_incremental_parser_matches_legacy(recognition_result: bytes) -> None:
+    expected = asyncio.run(parse_legacy(recognition_result))
+    transcriptions = asyncio.run(parse_incremental(recognition_result))
+    assert len(transcriptions) == UTTERANCES
+    assert [transcription.model_dump() for transcription in transcriptions] == [
+        transcription.model_dump() for transcription in expected
+    ]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1024, 64 * 1024])
+def test_chunk_boundaries_do_not_change_result(chunk_size: int) -> None:
+    # Кириллица в UTF-8 занимает два байта, мелкие части режут символы и элементы пополам
+    data = make_recognition_result(50)
+    assert parse_json_array(data, chunk_size) == json.loads(data)
+
+
+@pytest.mark.parametrize("data", [b"[]", b" \n[ ]\n"])
+def test_empty_array(data: bytes) -> None:
+    assert parse_json_array(data, chunk_size=1) == []
+
+
+@pytest.mark.parametrize("data", [b"", b'{"results": []}', b'[{"a": 1}, {"a": ', b'[{"a": 1}'])
+def test_malformed_result(data: bytes) -> None:
+    with pytest.raises(ValueError):
+        parse_json_array(data, chunk_size=4)
+
+
+def test_incremental_parser_keeps_no_full_copies() -> None:
+    """Прежняя схема держала в памяти строку ответа, дерево json.loads и две модели
+    на каждую фразу, инкрементальная - только окно ответа и готовые фразы
+    """
+    # tracemalloc сильно замедляет разбор, соотношение не зависит от размера ответа
+    recognition_result = make_recognition_result(UTTERANCES // 4)
+    peaks = []
+    for parse in (parse_legacy, parse_incremental):
+        tracemalloc.start()
+        asyncio.run(parse(recognition_result))
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    legacy_peak, incremental_peak = peaks
+    assert incremental_peak < legacy_peak / 3
+    assert incremental_peak < len(recognition_result) * 2
@@ -0,0 +1,61 @@
+import asyncio
+
+from benchmarks.summarization import make_transcriptions, FakeLLM
+from src.dio_meetings.core.services import SummarizationService
+from src.dio_meetings.templates import PARTIAL_SUMMARY_TEMPLATE, COMBINE_SUMMARIES_TEMPLATE
+from src.dio_meetings.utils import estimate_tokens
+
+PROMPT_TEMPLATE = "Составь протокол"
+MAX_CHUNK_TOKENS = 1000
+
+
+def summarize(llm: FakeLLM, utterances: int, max_concurrency: int = 4) -> None:
+    summarization_service = SummarizationService(
+        stt=None,
+        llm=llm,
+        max_chunk_tokens=MAX_CHUNK_TOKENS,
+        max_concurrency=max_concurrency
+    )
+    asyncio.run(summarization_service.summarize(make_transcriptions(utterances), prompt_template=PROMPT_TEMPLATE))
+
+
+def get_requests(llm: FakeLLM, prompt_template: str) -> list[str]:
+    return [messages[1].text for messages in llm.requests if messages[0].text == prompt_template]
+
+
+def test_short_transcript_is_summarized_in_one_request() -> None:
+    llm = FakeLLM(latency=0.0)
+    summarize(llm, utterances=10)
+    assert len(llm.requests) == 1
+    assert llm.requests[0][0].text == PROMPT_TEMPLATE
+
+
+def test_summaries_are_collapsed_until_they_fit() -> None:
+    llm = FakeLLM(latency=0.0, answer_tokens=300)
+    summarize(llm, utterances=400)
+    partial_requests = get_requests(llm, PARTIAL_SUMMARY_TEMPLATE)
+    combine_requests = get_requests(llm, COMBINE_SUMMARIES_TEMPLATE)
+    final_requests = get_requests(llm, PROMPT_TEMPLATE)
+    # Конспекты частей не помещаются в один запрос, их объединение занимает несколько уровней
+    assert len(partial_requests) > 10
+    assert len(combine_requests) > len(partial_requests) // 4
+    assert all(estimate_tokens(text) <= MAX_CHUNK_TOKENS for text in combine_requests)
+    assert len(final_requests) == 1
+    final_summaries = final_requests[0].split("\n\n")[1:]
+    assert 1 < len(final_summaries) <= MAX_CHUNK_TOKENS // 300
+    assert estimate_tokens("\n\n".join(final_summaries)) <= MAX_CHUNK_TOKENS
+
+
+def test_collapse_stops_when_every_summary_exceeds_limit() -> None:
+    llm = FakeLLM(latency=0.0, answer_tokens=MAX_CHUNK_TOKENS + 1)
+    summarize(llm, utterances=200)
+    partial_requests = get_requests(llm, PARTIAL_SUMMARY_TEMPLATE)
+    # Объединять нечего, все конспекты уходят в итоговый запрос без повторных вызовов
+    assert get_requests(llm, COMBINE_SUMMARIES_TEMPLATE) == []
+    assert len(get_requests(llm, PROMPT_TEMPLATE)[0].split("\n\n")) == len(partial_requests) + 1
+
+
+def test_map_respects_max_concurrency() -> None:
+    llm = FakeLLM(latency=0.01, answer_tokens=100)
+    summarize(llm, utterances=400, max_concurrency=3)
+    assert llm.max_concurrency == 3
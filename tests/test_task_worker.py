@@ -0,0 +1,155 @@
+from uuid import uuid4
+
+import asyncio
+
+import pytest
+from fakeredis import FakeAsyncRedis
+from faststream.redis.parser import RawMessage
+
+from src.dio_meetings.core.domain import Task
+from src.dio_meetings.core.enums import TaskStatus
+from src.dio_meetings.infrastructure.broker import worker as worker_module
+from src.dio_meetings.infrastructure.broker.queue import TaskQueue, DATA_KEY
+from src.dio_meetings.infrastructure.broker.worker import TaskWorker
+
+STREAM = "tasks"
+GROUP = "workers"
+VISIBILITY_TIMEOUT = 0.3
+
+
+class FakeContainer:
+    """Область запроса dishka, обработчикам в тестах зависимости не нужны"""
+    def __call__(self) -> "FakeContainer":
+        return self
+
+    async def __aenter__(self) -> "FakeContainer":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def fast_maintenance(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(worker_module, "TASK_HEARTBEAT_INTERVAL", 0.05)
+    monkeypatch.setattr(worker_module, "TASK_RECLAIM_INTERVAL", 0.1)
+
+
+async def publish(redis: FakeAsyncRedis, task: Task) -> None:
+    message = RawMessage.encode(message=task, reply_to=None, headers=None, correlation_id=str(task.id))
+    await redis.xadd(STREAM, {DATA_KEY: message})
+
+
+async def read(redis: FakeAsyncRedis, consumer: str) -> str:
+    """Читает запись так же, как подписчик FastStream в воркере consumer"""
+    [(_, [(message_id, _)])] = await redis.xreadgroup(GROUP, consumer, {STREAM: ">"}, count=1)
+    return message_id.decode()
+
+
+async def create_queue() -> tuple[FakeAsyncRedis, TaskQueue]:
+    redis = FakeAsyncRedis()
+    await redis.xgroup_create(STREAM, GROUP, id="0", mkstream=True)
+    return redis, TaskQueue(redis, STREAM, GROUP)
+
+
+def create_worker(handler, queue: TaskQueue, consumer: str, **kwargs) -> TaskWorker:
+    async def fail(task: Task, container: FakeContainer) -> None:
+        raise AssertionError(f"Task {task.id} must not fail")
+
+    kwargs.setdefault("failure_handler", fail)
+    return TaskWorker(
+        handler=handler,
+        container=FakeContainer(),
+        queue=queue,
+        consumer=consumer,
+        visibility_timeout=VISIBILITY_TIMEOUT,
+        **kwargs
+    )
+
+
+def kill(worker: TaskWorker) -> None:
+    """Останавливает воркер как при падении процесса: без подтверждения и продления записей"""
+    for task in [*worker._maintenance, *worker._jobs]:
+        task.cancel()
+
+
+def test_task_of_killed_worker_is_redelivered_and_acked() -> None:
+    async def scenario() -> None:
+        redis, queue = await create_queue()
+        task = Task(id=uuid4(), file_id=uuid4(), status=TaskStatus.NEW)
+        await publish(redis, task)
+        started = asyncio.Event()
+        processed: list[tuple[str, Task]] = []
+
+        async def hang(received_task: Task, container: FakeContainer) -> None:
+            started.set()
+            await asyncio.Event().wait()
+
+        async def process(received_task: Task, container: FakeContainer) -> None:
+            processed.append(("second", received_task))
+
+        first_worker = create_worker(hang, queue, "first")
+        second_worker = create_worker(process, queue, "second")
+        await first_worker.start()
+        await first_worker.submit(task, await read(redis, "first"))
+        await started.wait()
+        await second_worker.start()
+        # Пока первый воркер жив, запись продлевается и не перехватывается
+        await asyncio.sleep(VISIBILITY_TIMEOUT * 2)
+        assert processed == []
+        kill(first_worker)
+        await asyncio.sleep(VISIBILITY_TIMEOUT * 3)
+        await second_worker.close()
+        assert processed == [("second", task)]
+        pending = await redis.xpending(STREAM, GROUP)
+        assert pending["pending"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_task_is_failed_after_max_deliveries() -> None:
+    async def scenario() -> None:
+        redis, queue = await create_queue()
+        task = Task(id=uuid4(), file_id=uuid4(), status=TaskStatus.NEW)
+        await publish(redis, task)
+        await read(redis, "crashed")
+        attempts: list[Task] = []
+        failed: list[Task] = []
+
+        async def crash(received_task: Task, container: FakeContainer) -> None:
+            attempts.append(received_task)
+            raise RuntimeError("Handler error")
+
+        async def fail(received_task: Task, container: FakeContainer) -> None:
+            failed.append(received_task)
+
+        worker = create_worker(crash, queue, "worker", failure_handler=fail, max_deliveries=3)
+        await worker.start()
+        await asyncio.sleep(VISIBILITY_TIMEOUT * 10)
+        await worker.close()
+        # Первая доставка досталась упавшему воркеру, ещё две - этому
+        assert len(attempts) == 2
+        assert failed == [task]
+        pending = await redis.xpending(STREAM, GROUP)
+        assert pending["pending"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_unreadable_message_is_dropped() -> None:
+    async def scenario() -> None:
+        redis, queue = await create_queue()
+        await redis.xadd(STREAM, {DATA_KEY: b"not a message"})
+        await read(redis, "crashed")
+
+        async def process(received_task: Task, container: FakeContainer) -> None:
+            raise AssertionError("Unreadable message must not be processed")
+
+        worker = create_worker(process, queue, "worker")
+        await worker.start()
+        await asyncio.sleep(VISIBILITY_TIMEOUT * 3)
+        await worker.close()
+        pending = await redis.xpending(STREAM, GROUP)
+        assert pending["pending"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,144 @@
+from typing import Optional
+
+import time
+import asyncio
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from fakeredis import FakeAsyncRedis
+
+from src.dio_meetings.infrastructure.http import HTTPClient
+from src.dio_meetings.infrastructure.stt.salute_speech import api as salute_speech_api
+from src.dio_meetings.infrastructure.stt.salute_speech.api import SaluteSpeechAPI
+from src.dio_meetings.infrastructure.stt.salute_speech.auth import TokenManager
+from src.dio_meetings.infrastructure.stt.salute_speech.schemas import AccessToken
+from src.dio_meetings.infrastructure.stt.salute_speech.exceptions import AuthorizationError, UploadError
+
+REFRESH_MARGIN = 60
+CACHE_KEY = "salute_speech:access_token:test"
+
+
+class FakeAuthorization:
+    """Выдаёт новый токен на каждый запрос авторизации с задержкой сетевого запроса"""
+    def __init__(self, lifetime: float = 1800, latency: float = 0.01, is_valid: bool = True) -> None:
+        self.lifetime = lifetime
+        self.latency = latency
+        self.is_valid = is_valid
+        self.calls = 0
+
+    async def __call__(self) -> Optional[AccessToken]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if not self.is_valid:
+            return None
+        return AccessToken(
+            access_token=f"token-{self.calls}",
+            expires_at=int((time.time() + REFRESH_MARGIN + self.lifetime) * 1000)
+        )
+
+
+def test_concurrent_requests_authorize_once() -> None:
+    authorize = FakeAuthorization()
+    token_manager = TokenManager(authorize, cache_key=CACHE_KEY, refresh_margin=REFRESH_MARGIN)
+
+    async def scenario() -> list[str]:
+        return await asyncio.gather(*[token_manager.get_token() for _ in range(50)])
+
+    assert set(asyncio.run(scenario())) == {"token-1"}
+    assert authorize.calls == 1
+
+
+def test_cached_token_is_reused_until_expiry() -> None:
+    # Токен считается истёкшим за REFRESH_MARGIN секунд до expires_at, то есть через 0.2 сек
+    authorize = FakeAuthorization(lifetime=0.2)
+    token_manager = TokenManager(authorize, cache_key=CACHE_KEY, refresh_margin=REFRESH_MARGIN)
+
+    async def scenario() -> None:
+        assert await token_manager.get_token() == "token-1"
+        assert await token_manager.get_token() == "token-1"
+        assert authorize.calls == 1
+        await asyncio.sleep(0.25)
+        assert await token_manager.get_token() == "token-2"
+        assert await token_manager.get_token() == "token-2"
+        assert authorize.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_invalid_credentials_are_not_cached() -> None:
+    authorize = FakeAuthorization(is_valid=False)
+    token_manager = TokenManager(authorize, cache_key=CACHE_KEY, refresh_margin=REFRESH_MARGIN)
+
+    async def scenario() -> None:
+        with pytest.raises(AuthorizationError):
+            await token_manager.get_token()
+        authorize.is_valid = True
+        assert await token_manager.get_token() == "token-2"
+
+    asyncio.run(scenario())
+
+
+def test_token_is_shared_between_processes() -> None:
+    pytest.importorskip("lupa", reason="Redis lock in fakeredis requires Lua")
+    redis = FakeAsyncRedis()
+    authorize = FakeAuthorization()
+    token_managers = [
+        TokenManager(authorize, cache_key=CACHE_KEY, redis=redis, refresh_margin=REFRESH_MARGIN)
+        for _ in range(3)
+    ]
+
+    async def scenario() -> list[str]:
+        tokens = await asyncio.gather(*[token_manager.get_token() for token_manager in token_managers * 10])
+        await token_managers[0].invalidate()
+        assert await redis.get(CACHE_KEY) is None
+        return tokens
+
+    assert set(asyncio.run(scenario())) == {"token-1"}
+    assert authorize.calls == 1
+
+
+def create_fake_sber_devices(authorize: FakeAuthorization, revoked_tokens: set[str]) -> web.Application:
+    """Авторизация и загрузка файла, отзыв токена на стороне API приводит к ответу 401"""
+    async def oauth(request: web.Request) -> web.Response:
+        token = await authorize()
+        return web.json_response(token.model_dump())
+
+    async def upload(request: web.Request) -> web.Response:
+        await request.read()
+        if request.headers["Authorization"].removeprefix("Bearer ") in revoked_tokens:
+            return web.json_response({"status": 401, "message": "Unauthorized"}, status=401)
+        return web.json_response({"status": 200, "result": {"request_file_id": "0" * 32}})
+
+    app = web.Application()
+    app.router.add_post("/api/v2/oauth", oauth)
+    app.router.add_post("/rest/v1/data:upload", upload)
+    return app
+
+
+def test_unauthorized_response_invalidates_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    authorize = FakeAuthorization()
+    revoked_tokens: set[str] = set()
+
+    async def scenario() -> None:
+        test_server = TestServer(create_fake_sber_devices(authorize, revoked_tokens))
+        await test_server.start_server()
+        monkeypatch.setattr(salute_speech_api, "SBER_DEVICES_URL", str(test_server.make_url("/api/v2")))
+        monkeypatch.setattr(salute_speech_api, "SALUTE_SPEECH_URL", str(test_server.make_url("/rest/v1")))
+        http_client = HTTPClient()
+        try:
+            api = SaluteSpeechAPI(http_client, api_key="key")
+            await api.upload_file(b"audio", file_format="mp3")
+            await api.upload_file(b"audio", file_format="mp3")
+            assert authorize.calls == 1
+            revoked_tokens.add("token-1")
+            with pytest.raises(UploadError):
+                await api.upload_file(b"audio", file_format="mp3")
+            # Отклонённый токен сброшен, следующий запрос получает новый
+            await api.upload_file(b"audio", file_format="mp3")
+            assert authorize.calls == 2
+        finally:
+            await http_client.close()
+            await test_server.close()
+
+    asyncio.run(scenario())
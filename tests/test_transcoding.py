@@ -0,0 +1,90 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import asyncio
+import tempfile
+
+import pytest
+
+from src.dio_meetings.transcoding import TranscodingScheduler, TranscodingJob
+
+CHUNK = b"0" * 1024
+
+
+async def transcode(job: TranscodingJob, chunks: int = 10, is_failing: bool = False) -> AsyncIterator[bytes]:
+    for _ in range(chunks):
+        await asyncio.sleep(0.001)
+        yield CHUNK
+    if is_failing:
+        raise RuntimeError("ffmpeg failed")
+    job.set_cpu_time(0.5)
+
+
+class SlowUpload:
+    """Загрузка, которая продолжается после завершения транскодирования"""
+    def __init__(self, scheduler: TranscodingScheduler) -> None:
+        self._scheduler = scheduler
+        self.running_after_transcoding: list[int] = []
+
+    async def __call__(self, stream: AsyncIterator[bytes]) -> bytes:
+        data = b"".join([chunk async for chunk in stream])
+        # Последние части и завершение загрузки в S3
+        await asyncio.sleep(0.2)
+        self.running_after_transcoding.append(self._scheduler.stats.running)
+        return data
+
+
+def test_slot_is_released_before_upload_finishes() -> None:
+    scheduler = TranscodingScheduler(max_concurrency=1)
+    upload = SlowUpload(scheduler)
+    data = asyncio.run(scheduler.run(transcode, upload))
+    assert data == CHUNK * 10
+    # К концу загрузки слот уже свободен, а время задачи включает только транскодирование
+    assert upload.running_after_transcoding == [0]
+    stats = scheduler.stats
+    assert (stats.completed, stats.cpu_time_total) == (1, 0.5)
+    assert stats.wall_time_total < 0.1
+
+
+def test_next_job_does_not_wait_for_upload() -> None:
+    scheduler = TranscodingScheduler(max_concurrency=1, max_queue_size=1)
+
+    async def scenario() -> None:
+        first = asyncio.create_task(scheduler.run(transcode, SlowUpload(scheduler)))
+        await asyncio.sleep(0.05)
+        # Первая загрузка ещё идёт, но её слот уже доступен второй задаче
+        second = asyncio.create_task(scheduler.run(transcode, SlowUpload(scheduler)))
+        await asyncio.sleep(0.05)
+        assert not first.done()
+        assert scheduler.stats.completed == 2
+        await asyncio.gather(first, second)
+
+    asyncio.run(scenario())
+
+
+def test_transcoding_error_is_passed_to_consumer(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    scheduler = TranscodingScheduler(max_concurrency=1)
+
+    async def upload(stream: AsyncIterator[bytes]) -> bytes:
+        return b"".join([chunk async for chunk in stream])
+
+    with pytest.raises(RuntimeError, match="ffmpeg failed"):
+        asyncio.run(scheduler.run(lambda job: transcode(job, is_failing=True), upload))
+    assert scheduler.stats.running == 0
+    # Временный файл с результатом удалён
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cancelled_upload_stops_transcoding() -> None:
+    scheduler = TranscodingScheduler(max_concurrency=1)
+
+    async def scenario() -> None:
+        task = asyncio.create_task(scheduler.run(lambda job: transcode(job, chunks=1000), SlowUpload(scheduler)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+    assert (scheduler.stats.running, scheduler.stats.completed) == (0, 1)
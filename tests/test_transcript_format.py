@@ -0,0 +1,48 @@
+from benchmarks.summarization import make_transcriptions
+from src.dio_meetings.core.dto import Transcription
+from src.dio_meetings.templates import TRANSCRIPT_LEGEND
+from src.dio_meetings.transcript_format import format_transcript_turns, fit_token_budget, OMITTED_TURNS
+from src.dio_meetings.utils import estimate_tokens
+
+UTTERANCES = 2000
+
+
+def format_transcript_legacy(transcriptions: list[Transcription]) -> str:
+    """Прежний формат: каждая фраза отдельным абзацем с именами полей"""
+    return "\n\n".join(
+        f"speaker_id: {transcription.speaker_id}, text: {transcription.text}, emotion: {transcription.emotion}"
+        for transcription in transcriptions
+    )
+
+
+def format_transcript(transcriptions: list[Transcription]) -> str:
+    return "\n".join([TRANSCRIPT_LEGEND, *format_transcript_turns(transcriptions)])
+
+
+def test_compact_format_reduces_tokens() -> None:
+    transcriptions = make_transcriptions(UTTERANCES)
+    legacy_text, text = format_transcript_legacy(transcriptions), format_transcript(transcriptions)
+    # Оценка по символам и число слов: сокращение не зависит от токенизатора модели
+    assert estimate_tokens(text) < estimate_tokens(legacy_text) * 0.75
+    assert len(text.split()) < len(legacy_text.split()) * 0.8
+
+
+def test_compact_format_keeps_text_and_order() -> None:
+    transcriptions = make_transcriptions(200)
+    words = " ".join(transcription.text for transcription in transcriptions).split()
+    turns = format_transcript_turns(transcriptions)
+    # Из реплики убирается метка спикера с эмоцией, текст фраз остаётся целиком и по порядку
+    assert " ".join(turn.split(": ", 1)[1] for turn in turns).split() == words
+    assert len(turns) < len(transcriptions)
+
+
+def test_fit_token_budget_keeps_start_and_end() -> None:
+    turns = format_transcript_turns(make_transcriptions(UTTERANCES))
+    max_tokens = sum(estimate_tokens(turn) for turn in turns) // 10
+    fitted = fit_token_budget(turns, max_tokens)
+    assert fitted == fit_token_budget(turns, max_tokens)
+    assert sum(estimate_tokens(turn) for turn in fitted) <= max_tokens
+    omitted_index = next(index for index, turn in enumerate(fitted) if turn.startswith(OMITTED_TURNS[:5]))
+    assert fitted[:omitted_index] == turns[:omitted_index]
+    assert fitted[omitted_index + 1:] == turns[len(turns) - len(fitted) + omitted_index + 1:]
+    assert fit_token_budget(turns, max_tokens * 20) == turns
@@ -0,0 +1,136 @@
+from typing import Optional, Union
+from collections.abc import AsyncIterable, AsyncIterator
+from uuid import UUID, uuid4
+
+import asyncio
+
+from src.dio_meetings.core.domain import FileMetadata, UploadSession, UploadPart
+from src.dio_meetings.core.services import FileService, UploadService
+from src.dio_meetings.constants import MIN_UPLOAD_PART_SIZE
+
+BUCKET = "audio"
+RECORDING = bytes(range(256)) * (MIN_UPLOAD_PART_SIZE // 256 * 2 + 100)
+
+
+class FakeFileStorage:
+    """S3 в памяти: объекты и незавершённые multipart загрузки"""
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.uploads: dict[str, dict[int, bytes]] = {}
+
+    async def upload_stream(self, stream: AsyncIterable[bytes], key: str, bucket: str) -> int:
+        self.objects[key] = b"".join([chunk async for chunk in stream])
+        return len(self.objects[key])
+
+    async def create_multipart_upload(self, key: str, bucket: str) -> str:
+        upload_id = str(uuid4())
+        self.uploads[upload_id] = {}
+        return upload_id
+
+    async def upload_part(self, data: bytes, key: str, bucket: str, upload_id: str, part_number: int) -> str:
+        self.uploads[upload_id][part_number] = data
+        return f"etag-{part_number}"
+
+    async def complete_multipart_upload(
+            self,
+            key: str,
+            bucket: str,
+            upload_id: str,
+            parts: list[dict[str, Union[int, str]]]
+    ) -> None:
+        uploaded_parts = self.uploads.pop(upload_id)
+        self.objects[key] = b"".join(uploaded_parts[part["PartNumber"]] for part in parts)
+
+    async def abort_multipart_upload(self, key: str, bucket: str, upload_id: str) -> None:
+        self.uploads.pop(upload_id, None)
+
+    async def download_stream(self, key: str, bucket: str) -> AsyncIterator[bytes]:
+        data = self.objects[key]
+        for start in range(0, len(data), 1024 * 1024):
+            yield data[start:start + 1024 * 1024]
+
+    async def remove_file(self, key: str, bucket: str) -> None:
+        self.objects.pop(key, None)
+
+
+class FakeFileMetadataRepository:
+    def __init__(self) -> None:
+        self.files: dict[UUID, FileMetadata] = {}
+
+    async def create(self, file_metadata: FileMetadata) -> FileMetadata:
+        file_metadata = file_metadata.model_copy(update={"id": uuid4()})
+        self.files[file_metadata.id] = file_metadata
+        return file_metadata
+
+    async def get_by_hash(self, sha256: str) -> Optional[FileMetadata]:
+        return next((file for file in self.files.values() if file.sha256 == sha256), None)
+
+
+class FakeUploadSessionRepository:
+    def __init__(self) -> None:
+        self.sessions: dict[UUID, UploadSession] = {}
+        self.parts: dict[UUID, dict[int, UploadPart]] = {}
+
+    async def create(self, upload_session: UploadSession) -> UploadSession:
+        upload_session = upload_session.model_copy(update={"id": uuid4()})
+        self.sessions[upload_session.id] = upload_session
+        self.parts[upload_session.id] = {}
+        return upload_session
+
+    async def read(self, id: UUID) -> Optional[UploadSession]:
+        return self.sessions.get(id)
+
+    async def delete(self, id: UUID) -> bool:
+        self.parts.pop(id, None)
+        return self.sessions.pop(id, None) is not None
+
+    async def add_part(self, session_id: UUID, part: UploadPart) -> UploadPart:
+        self.parts[session_id][part.part_number] = part
+        return part
+
+    async def get_parts(self, session_id: UUID) -> list[UploadPart]:
+        return [part for _, part in sorted(self.parts[session_id].items())]
+
+
+async def iter_bytes(data: bytes) -> AsyncIterator[bytes]:
+    yield data
+
+
+async def upload_in_parts(upload_service: UploadService, data: bytes) -> FileMetadata:
+    upload_session = await upload_service.create("meeting.mp3", bucket=BUCKET)
+    parts = [data[start:start + MIN_UPLOAD_PART_SIZE] for start in range(0, len(data), MIN_UPLOAD_PART_SIZE)]
+    # Части приходят в произвольном порядке, последняя загружается повторно
+    for part_number in reversed(range(1, len(parts) + 1)):
+        await upload_service.upload_part(upload_session.id, part_number, parts[part_number - 1])
+    await upload_service.upload_part(upload_session.id, len(parts), parts[-1])
+    return await upload_service.complete(upload_session.id)
+
+
+def create_services() -> tuple[FileService, UploadService, FakeFileStorage, FakeUploadSessionRepository]:
+    file_storage = FakeFileStorage()
+    file_metadata_repository = FakeFileMetadataRepository()
+    upload_session_repository = FakeUploadSessionRepository()
+    file_service = FileService(file_metadata_repository, file_storage)
+    upload_service = UploadService(upload_session_repository, file_metadata_repository, file_storage)
+    return file_service, upload_service, file_storage, upload_session_repository
+
+
+def test_multipart_upload_is_deduplicated() -> None:
+    file_service, upload_service, file_storage, upload_session_repository = create_services()
+
+    async def scenario() -> None:
+        file_metadata = await file_service.upload(iter_bytes(RECORDING), "meeting.mp3", bucket=BUCKET)
+        # Та же запись, загруженная по частям, указывает на уже обработанный файл
+        uploaded_file_metadata = await upload_in_parts(upload_service, RECORDING)
+        assert uploaded_file_metadata.id == file_metadata.id
+        assert list(file_storage.objects) == [file_metadata.key]
+        assert upload_session_repository.sessions == {}
+        # Другая запись сохраняется как новый файл
+        other_file_metadata = await upload_in_parts(upload_service, RECORDING[::-1])
+        assert other_file_metadata.id != file_metadata.id
+        assert file_storage.objects[other_file_metadata.key] == RECORDING[::-1]
+        # Повторная загрузка по частям тоже находит файл по хэшу
+        assert (await upload_in_parts(upload_service, RECORDING[::-1])).id == other_file_metadata.id
+        assert len(file_storage.objects) == 2
+
+    asyncio.run(scenario())
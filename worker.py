@@ -0,0 +1,16 @@
+import asyncio
+import logging
+
+from src.dio_meetings.infrastructure.broker import create_faststream_app
+
+
+logging.basicConfig(level=logging.INFO)
+
+
+async def main() -> None:
+    app = await create_faststream_app()
+    await app.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())